@@ -18,7 +18,7 @@ from publicdata_ca.datasets import (
     build_dataset_catalog,
     refresh_datasets,
 )
-from publicdata_ca.http import get_default_headers, retry_request, download_file
+from publicdata_ca.http import get_default_headers, retry_request, download_file, download_files
 from publicdata_ca.http_cache import (
     clear_cache_metadata,
     load_cache_metadata,
@@ -72,6 +72,7 @@ __all__ = [
     "retry_request",
     "get_default_headers",
     "download_file",
+    "download_files",
     "clear_cache_metadata",
     "load_cache_metadata",
     "get_conditional_headers",
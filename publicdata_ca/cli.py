@@ -7,6 +7,7 @@ This module provides CLI commands for searching and fetching Canadian public dat
 import argparse
 import sys
 import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -18,6 +19,12 @@ from publicdata_ca.datasets import refresh_datasets, DEFAULT_DATASETS, export_ru
 from publicdata_ca.profiles import list_profiles, run_profile, PROFILES_DIR
 
 
+# Upper bound on concurrent fetches, whatever --parallel asks for. Parallel
+# StatCan fetches extract on one thread each, so this also caps the total
+# number of worker threads.
+_MAX_PARALLEL_FETCHES = 8
+
+
 def cmd_search(args):
     """
     Search for datasets by keyword.
@@ -55,56 +62,120 @@ def cmd_search(args):
         print("or the catalog will be populated with available datasets in future versions.")
 
 
+def _fetch_one(
+    provider: str,
+    dataset_id: str,
+    output_dir: str,
+    file_format: Optional[str],
+    extract_workers: Optional[int] = None
+) -> dict:
+    """
+    Download a single dataset from the given provider.
+    
+    Args:
+        provider: Provider name ('statcan' or 'cmhc').
+        dataset_id: Dataset identifier or landing page URL.
+        output_dir: Output directory.
+        file_format: Optional file format filter.
+        extract_workers: Threads used to extract a StatCan ZIP (default: provider default).
+    
+    Returns:
+        Result dictionary from the provider download function.
+    """
+    if provider == 'statcan':
+        return download_statcan_table(
+            table_id=dataset_id,
+            output_dir=output_dir,
+            file_format=file_format or 'csv',
+            extract_workers=extract_workers
+        )
+    return download_cmhc_asset(
+        landing_url=dataset_id,
+        output_dir=output_dir,
+        asset_filter=file_format
+    )
+
+
 def cmd_fetch(args):
     """
-    Fetch/download a dataset.
+    Fetch/download one or more datasets.
+    
+    When several StatCan table IDs are given with --parallel N (N > 1), the
+    tables are downloaded concurrently on up to N worker threads (at most
+    _MAX_PARALLEL_FETCHES). CMHC landing pages are always fetched one at a
+    time, since assets from different pages can share a file name in the
+    output directory; each page's assets are still downloaded concurrently.
+    Repeated IDs are fetched once.
     
     Args:
         args: Parsed command-line arguments.
     """
     provider = args.provider
-    dataset_id = args.dataset_id
+    dataset_ids = args.dataset_id
+    if isinstance(dataset_ids, str):
+        dataset_ids = [dataset_ids]
+    # Fetching the same dataset twice at once would race on its files
+    dataset_ids = list(dict.fromkeys(dataset_ids))
     output_dir = args.output or './data'
+    parallel = max(1, getattr(args, 'parallel', None) or 1)
     
-    print(f"Fetching dataset: {dataset_id}")
+    if len(dataset_ids) == 1:
+        print(f"Fetching dataset: {dataset_ids[0]}")
+    else:
+        print(f"Fetching {len(dataset_ids)} datasets: {', '.join(dataset_ids)}")
     print(f"Provider: {provider}")
     print(f"Output directory: {output_dir}")
     
-    try:
-        if provider == 'statcan':
-            result = download_statcan_table(
-                table_id=dataset_id,
-                output_dir=output_dir,
-                file_format=args.format or 'csv'
-            )
-        elif provider == 'cmhc':
-            result = download_cmhc_asset(
-                landing_url=dataset_id,
-                output_dir=output_dir,
-                asset_filter=args.format
-            )
-        else:
-            print(f"Error: Unknown provider '{provider}'")
-            print("Supported providers: statcan, cmhc")
-            sys.exit(1)
+    if provider not in ('statcan', 'cmhc'):
+        print(f"Error: Unknown provider '{provider}'")
+        print("Supported providers: statcan, cmhc")
+        sys.exit(1)
+    
+    workers = 1
+    if provider == 'statcan':
+        workers = min(parallel, len(dataset_ids), _MAX_PARALLEL_FETCHES)
+    extract_workers = 1 if workers > 1 else None
+    
+    def fetch(dataset_id):
+        try:
+            return _fetch_one(provider, dataset_id, output_dir, args.format, extract_workers), None
+        except Exception as e:
+            return None, e
+    
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = list(executor.map(fetch, dataset_ids))
+    else:
+        outcomes = [fetch(dataset_id) for dataset_id in dataset_ids]
+    
+    results = []
+    failed = False
+    for dataset_id, (result, error) in zip(dataset_ids, outcomes):
+        if error is not None:
+            failed = True
+            if len(dataset_ids) == 1:
+                print(f"\n✗ Error: {str(error)}")
+            else:
+                print(f"\n✗ Error fetching {dataset_id}: {str(error)}")
+            continue
         
+        results.append(result)
         print("\n✓ Download complete!")
         print(f"  Dataset ID: {result['dataset_id']}")
         print(f"  Files downloaded: {len(result['files'])}")
         for file_path in result['files']:
             print(f"    - {file_path}")
-        
-        # Create manifest if requested
-        if args.manifest:
-            manifest_path = build_manifest_file(
-                output_dir=output_dir,
-                datasets=[result],
-                manifest_name='manifest.json'
-            )
-            print(f"\n  Manifest created: {manifest_path}")
     
-    except Exception as e:
-        print(f"\n✗ Error: {str(e)}")
+    # Create manifest if requested
+    if args.manifest and results:
+        manifest_path = build_manifest_file(
+            output_dir=output_dir,
+            datasets=results,
+            manifest_name='manifest.json'
+        )
+        print(f"\n  Manifest created: {manifest_path}")
+    
+    if failed:
         sys.exit(1)
 
 
@@ -354,12 +425,19 @@ def main():
     search_parser.set_defaults(func=cmd_search)
     
     # Fetch command
-    fetch_parser = subparsers.add_parser('fetch', help='Download a dataset')
+    fetch_parser = subparsers.add_parser('fetch', help='Download one or more datasets')
     fetch_parser.add_argument('provider', choices=['statcan', 'cmhc'], help='Data provider')
-    fetch_parser.add_argument('dataset_id', help='Dataset identifier or URL')
+    fetch_parser.add_argument('dataset_id', nargs='+', help='Dataset identifier(s) or URL(s)')
     fetch_parser.add_argument('-o', '--output', help='Output directory (default: ./data)')
     fetch_parser.add_argument('-f', '--format', help='File format filter (e.g., csv, xlsx)')
     fetch_parser.add_argument('-m', '--manifest', action='store_true', help='Create manifest file')
+    fetch_parser.add_argument(
+        '-j', '--parallel',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Download up to N StatCan tables concurrently (default: 1); CMHC pages are fetched one at a time'
+    )
     fetch_parser.set_defaults(func=cmd_fetch)
     
     # Refresh command
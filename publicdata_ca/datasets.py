@@ -8,14 +8,23 @@ validated to prevent accidental writes elsewhere on disk.
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass
+import json
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, Sequence, Union
+from typing import TYPE_CHECKING, Iterable, Sequence, Union
 
-import pandas as pd
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
+if TYPE_CHECKING:
+    import pandas as pd
 
+
+@lru_cache(maxsize=None)
 def _resolve_project_root() -> Path:
     cwd = Path.cwd().resolve()
     if (cwd / "data").exists():
@@ -37,7 +46,10 @@ def ensure_raw_destination(path: str | Path) -> Path:
     dest = Path(path)
     if not dest.is_absolute():
         dest = RAW_DATA_DIR / dest
-    dest = dest.resolve()
+    # Only pay for resolve() (a readlink per component) when the lexical check
+    # can't prove the path is inside data/raw, e.g. it contains "..".
+    if ".." in dest.parts or RAW_DATA_DIR not in dest.parents:
+        dest = dest.resolve()
     if RAW_DATA_DIR not in dest.parents and dest != RAW_DATA_DIR:
         raise ValueError(f"Destination {dest} must live under {RAW_DATA_DIR}")
     dest.parent.mkdir(parents=True, exist_ok=True)
@@ -67,12 +79,16 @@ class Dataset:
 
     @property
     def table_number(self) -> str | None:
-        if not self.pid:
-            return None
-        pid = str(self.pid)
-        if len(pid) == 8:
-            return f"{pid[:2]}-{pid[2:4]}-{pid[4:]}"
-        return pid
+        return _format_table_number(self.pid)
+
+
+def _format_table_number(pid: str | None) -> str | None:
+    if not pid:
+        return None
+    pid = str(pid)
+    if len(pid) == 8:
+        return f"{pid[:2]}-{pid[2:4]}-{pid[4:]}"
+    return pid
 
 
 DEFAULT_DATASETS: Sequence[Dataset] = (
@@ -160,39 +176,89 @@ DEFAULT_DATASETS: Sequence[Dataset] = (
 
 
 def build_dataset_catalog(datasets: Iterable[Dataset] | None = None) -> pd.DataFrame:
-    """Construct the curated dataset catalog as a pandas DataFrame."""
+    """Construct the curated dataset catalog as a pandas DataFrame.
+
+    The catalog for ``DEFAULT_DATASETS`` is built once per process and a copy is
+    returned on each call, so callers are free to modify the result.
+    """
+
+    if not datasets:
+        # DataFrame.copy() shares Python objects, so copy the tag lists too
+        catalog = _default_dataset_catalog().copy()
+        catalog["tags"] = [list(tags) if tags is not None else None for tags in catalog["tags"]]
+        return catalog
+    return _build_catalog_frame(datasets)
+
+
+@lru_cache(maxsize=None)
+def _default_dataset_catalog() -> pd.DataFrame:
+    return _build_catalog_frame(DEFAULT_DATASETS)
+
 
-    source = list(datasets or DEFAULT_DATASETS)
-    catalog_records: list[dict[str, object]] = []
-    for ds in source:
-        record = asdict(ds)
-        record["table_number"] = ds.table_number
+_CATALOG_COLUMNS = (
+    "dataset",
+    "provider",
+    "metric",
+    "pid",
+    "table_number",
+    "frequency",
+    "geo_scope",
+    "delivery",
+    "automation_status",
+    "page_url",
+    "direct_url",
+    "target_file",
+    "status_note",
+    "tags",
+)
+
+
+def _build_catalog_frame(datasets: Iterable[Dataset]) -> pd.DataFrame:
+    # pandas is imported lazily so CLI commands that never build a DataFrame
+    # don't pay its import cost.
+    import pandas as pd
+
+    rows = []
+    for ds in sorted(datasets, key=lambda d: d.dataset):
         destination = ds.destination()
-        record["target_file"] = str(destination) if destination else None
-        catalog_records.append(record)
-
-    return (
-        pd.DataFrame(catalog_records)
-        .sort_values("dataset")
-        .reset_index(drop=True)
-    )[
-        [
-            "dataset",
-            "provider",
-            "metric",
-            "pid",
-            "table_number",
-            "frequency",
-            "geo_scope",
-            "delivery",
-            "automation_status",
-            "page_url",
-            "direct_url",
-            "target_file",
-            "status_note",
-            "tags",
-        ]
-    ]
+        rows.append((
+            ds.dataset,
+            ds.provider,
+            ds.metric,
+            ds.pid,
+            ds.table_number,
+            ds.frequency,
+            ds.geo_scope,
+            ds.delivery,
+            ds.automation_status,
+            ds.page_url,
+            ds.direct_url,
+            str(destination) if destination else None,
+            ds.status_note,
+            # Copy so catalog cells don't alias the Dataset's own list
+            list(ds.tags) if ds.tags is not None else None,
+        ))
+    return pd.DataFrame.from_records(rows, columns=_CATALOG_COLUMNS)
+
+
+@lru_cache(maxsize=None)
+def default_catalog_json() -> bytes:
+    """Return ``DEFAULT_DATASETS`` as UTF-8 encoded JSON, serialized once per process.
+
+    Records use the same fields and ordering as :func:`build_dataset_catalog`, but
+    no pandas import or filesystem access is needed: ``target_file`` is reported
+    as configured rather than resolved.
+    """
+
+    records = []
+    for ds in sorted(DEFAULT_DATASETS, key=lambda d: d.dataset):
+        record = {column: getattr(ds, column) for column in _CATALOG_COLUMNS}
+        if record["target_file"] is not None:
+            record["target_file"] = str(record["target_file"])
+        records.append(record)
+    if orjson is not None:
+        return orjson.dumps(records)
+    return json.dumps(records, ensure_ascii=False).encode("utf-8")
 
 
 def refresh_datasets(
@@ -241,6 +307,8 @@ def refresh_datasets(
         - Files are downloaded to their configured target_file locations
         - The function is idempotent: running it multiple times is safe
     """
+    import pandas as pd
+
     from publicdata_ca.http import download_file
     from publicdata_ca.providers.cmhc import download_cmhc_asset
     from publicdata_ca.providers.statcan import download_statcan_table
@@ -276,11 +344,13 @@ def refresh_datasets(
         # Process StatsCan datasets
         if ds.provider == "statcan" and ds.pid:
             try:
-                # Download the table (download_statcan_table handles skip_existing internally)
+                # Download the table (download_statcan_table handles skip_existing internally).
+                # A forced refresh must not settle for a 304 revalidation.
                 result = download_statcan_table(
                     ds.pid,
                     str(dest.parent),
-                    skip_existing=should_skip_existing
+                    skip_existing=should_skip_existing,
+                    use_cache=not force_download
                 )
                 if result.get("skipped"):
                     record["result"] = "exists"
@@ -420,6 +490,7 @@ __all__ = [
     "PROCESSED_DATA_DIR",
     "ensure_raw_destination",
     "build_dataset_catalog",
+    "default_catalog_json",
     "refresh_datasets",
     "export_run_report",
 ]
@@ -6,13 +6,163 @@ appropriate headers for accessing Canadian public data sources.
 """
 
 import os
-import time
-from typing import Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Any, Tuple
 import requests
 
-from requests.exceptions import RequestException, HTTPError as RequestsHTTPError
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING as _DECODABLE_ENCODINGS
+from urllib3.util.retry import Retry
 
 
+# Connection pool sizing for the shared session. pool_connections is the number
+# of per-host pools kept alive; pool_maxsize is the number of keep-alive
+# connections retained per host (relevant when downloading from threads).
+_POOL_CONNECTIONS = 16
+_POOL_MAXSIZE = 32
+
+# Default number of concurrent downloads in download_files. Kept small to stay
+# polite to StatCan/CMHC servers.
+DEFAULT_MAX_PARALLEL_DOWNLOADS = 5
+
+# Default streaming chunk size for download_file. Large chunks keep the number
+# of Python-level read/write iterations low on multi-hundred-MB StatCan tables.
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+# Default retry policy for retry_request. max_retries counts total attempts.
+_DEFAULT_MAX_RETRIES = 3
+_DEFAULT_RETRY_DELAY = 1.0
+
+# Transient statuses worth retrying: timeouts, rate limiting and gateway errors.
+_RETRY_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Longest Retry-After delay honoured, in seconds, so a server can't stall a
+# download for hours. Matches urllib3's cap on exponential backoff.
+_MAX_RETRY_AFTER = 120.0
+
+# Number of non-default retry policies that keep their own pooled session.
+_RETRY_SESSION_CACHE_SIZE = 8
+
+
+class _BackoffRetry(Retry):
+    """
+    urllib3 Retry with a delay before the first retry as well.
+    
+    urllib3 retries the first failure immediately; this keeps the documented
+    retry_request schedule of retry_delay, 2 * retry_delay, 4 * retry_delay, ...
+    Retry-After headers still take precedence when the server sends one, up
+    to _MAX_RETRY_AFTER seconds.
+    """
+    
+    def parse_retry_after(self, retry_after: str) -> float:
+        return min(super().parse_retry_after(retry_after), _MAX_RETRY_AFTER)
+    
+    def get_backoff_time(self) -> float:
+        consecutive_errors = 0
+        for entry in reversed(self.history):
+            if entry.redirect_location is not None:
+                break
+            consecutive_errors += 1
+        if consecutive_errors == 0:
+            return 0
+        backoff_max = getattr(self, 'backoff_max', self.DEFAULT_BACKOFF_MAX)
+        return min(backoff_max, self.backoff_factor * (2 ** (consecutive_errors - 1)))
+
+
+def _build_retry(max_retries: int, retry_delay: float) -> Retry:
+    """
+    Build the urllib3 retry policy used by the session adapters.
+    
+    Args:
+        max_retries: Total number of attempts, including the first request.
+        retry_delay: Backoff factor in seconds; delays grow exponentially.
+    
+    Returns:
+        A Retry that honours Retry-After and returns the final response
+        instead of raising, so callers still see requests.HTTPError.
+    """
+    return _BackoffRetry(
+        total=max(max_retries - 1, 0),
+        backoff_factor=retry_delay,
+        status_forcelist=_RETRY_STATUS_CODES,
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _create_session(
+    max_retries: int = _DEFAULT_MAX_RETRIES,
+    retry_delay: float = _DEFAULT_RETRY_DELAY
+) -> requests.Session:
+    """
+    Create a requests Session with pooled keep-alive connections.
+    
+    Args:
+        max_retries: Total number of attempts per request (default: 3).
+        retry_delay: Backoff factor in seconds between retries (default: 1.0).
+    
+    Returns:
+        A Session with HTTP and HTTPS adapters mounted.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_POOL_CONNECTIONS,
+        pool_maxsize=_POOL_MAXSIZE,
+        max_retries=_build_retry(max_retries, retry_delay),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Shared session so repeated requests to the same host (StatCan, CMHC, ...)
+# reuse TCP/TLS connections instead of performing a new handshake per URL.
+_SESSION = _create_session()
+
+
+@lru_cache(maxsize=_RETRY_SESSION_CACHE_SIZE)
+def _retry_session(max_retries: int, retry_delay: float) -> requests.Session:
+    return _create_session(max_retries, retry_delay)
+
+
+def _get_session(max_retries: int, retry_delay: float) -> requests.Session:
+    """Return the pooled session whose adapters use the given retry policy."""
+    if max_retries == _DEFAULT_MAX_RETRIES and retry_delay == _DEFAULT_RETRY_DELAY:
+        return _SESSION
+    return _retry_session(max_retries, retry_delay)
+
+
+def _accept_encoding() -> str:
+    """
+    Build the Accept-Encoding header from the encodings urllib3 can decode.
+    
+    Brotli (and zstd) are only offered when the optional decoder package is
+    installed, so servers never send a body the client cannot decompress.
+    
+    Returns:
+        Comma-separated encodings, most compact first.
+    """
+    supported = {encoding.strip() for encoding in _DECODABLE_ENCODINGS.split(',')}
+    preferred = ('br', 'zstd', 'gzip', 'deflate')
+    return ', '.join(encoding for encoding in preferred if encoding in supported)
+
+
+_ACCEPT_ENCODING = _accept_encoding()
+
+
+# Shared read-only default headers, passed as-is by the request helpers so
+# they don't copy a dict per call; get_default_headers hands out copies.
+_DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType({
+    'User-Agent': 'publicdata_ca/0.1.0 (Python; Canadian Public Data Client)',
+    'Accept': '*/*',
+    'Accept-Encoding': _ACCEPT_ENCODING,
+    'Accept-Language': 'en-CA,en;q=0.9,fr-CA;q=0.6,fr;q=0.5',
+})
+
 
 def get_default_headers() -> Dict[str, str]:
     """
@@ -21,34 +171,35 @@ def get_default_headers() -> Dict[str, str]:
     Returns:
         Dictionary of HTTP headers including User-Agent.
     """
-    return {
-        'User-Agent': 'publicdata_ca/0.1.0 (Python; Canadian Public Data Client)',
-        'Accept': '*/*',
-        'Accept-Encoding': 'gzip, deflate',
-        'Accept-Language': 'en-CA,en;q=0.9,fr-CA;q=0.6,fr;q=0.5',
-    }
+    return dict(_DEFAULT_HEADERS)
 
 
 def retry_request(
     url: str,
-    max_retries: int = 3,
-    retry_delay: float = 1.0,
+    max_retries: int = _DEFAULT_MAX_RETRIES,
+    retry_delay: float = _DEFAULT_RETRY_DELAY,
     headers: Optional[Dict[str, str]] = None,
-    timeout: int = 30
+    timeout: int = 30,
+    stream: bool = False
 ) -> requests.Response:
     """
     Make an HTTP GET request with retry logic.
     
     This function attempts to fetch a URL with exponential backoff retry logic
-    to handle transient network failures and rate limiting.
+    to handle transient network failures and rate limiting. Retries are handled
+    by urllib3 on the pooled session, so connection errors and 408/429/5xx
+    gateway responses are retried and Retry-After headers are honoured.
+    Other 4xx responses are not retried.
     
     Args:
         url: The URL to request.
-        max_retries: Maximum number of retry attempts (default: 3).
-        retry_delay: Initial delay between retries in seconds (default: 1.0).
+        max_retries: Maximum number of attempts (default: 3).
+        retry_delay: Backoff factor in seconds (default: 1.0).
             Delay doubles with each retry (exponential backoff).
         headers: Optional dictionary of HTTP headers. If None, uses default headers.
         timeout: Request timeout in seconds (default: 30).
+        stream: If True, the response body is not read up front and must be
+            consumed (or the response closed) by the caller (default: False).
     
     Returns:
         Response object from requests library.
@@ -62,36 +213,35 @@ def retry_request(
         >>> data = response.content
     """
     if headers is None:
-        headers = get_default_headers()
+        headers = _DEFAULT_HEADERS
     
-    last_error = None
-    delay = retry_delay
+    session = _get_session(max_retries, retry_delay)
+    response = session.get(url, headers=headers, timeout=timeout, stream=stream)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        # Release the connection before surfacing the error
+        response.close()
+        raise
+    return response
+
+
+# Byte prefixes that mark an HTML document (compared case-insensitively).
+_HTML_SIGNATURES = (b'<!doctype html', b'<html')
+
+
+def _looks_like_html(data: bytes) -> bool:
+    """
+    Check whether the start of a response body is an HTML document.
     
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            return response
-        
-        except requests.HTTPError as e:
-            # Don't retry on client errors (4xx), only on server errors (5xx) and specific codes
-            if 400 <= e.response.status_code < 500 and e.response.status_code not in [429, 408]:
-                raise
-            last_error = e
-            
-        except RequestException as e:
-            last_error = e
-        
-        # If this wasn't the last attempt, wait before retrying
-        if attempt < max_retries - 1:
-            time.sleep(delay)
-            delay *= 2  # Exponential backoff
+    Args:
+        data: Leading bytes of the response body.
     
-    # All retries failed
-    if last_error:
-        raise last_error
-    else:
-        raise RequestException(f"Failed to fetch {url} after {max_retries} attempts")
+    Returns:
+        True if the body starts with an HTML doctype or <html> tag.
+    """
+    head = data[:512].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    return head.startswith(_HTML_SIGNATURES)
 
 
 def download_file(
@@ -99,10 +249,12 @@ def download_file(
     output_path: str,
     max_retries: int = 3,
     headers: Optional[Dict[str, str]] = None,
-    chunk_size: int = 8192,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
     validate_content_type: bool = False,
     write_metadata: bool = True,
-    use_cache: bool = True
+    use_cache: bool = True,
+    provider_name: Optional[str] = None,
+    provider_specific: Optional[Dict[str, Any]] = None
 ) -> str:
     """
     Download a file from a URL to a local path with retry logic and streaming support.
@@ -122,13 +274,16 @@ def download_file(
         output_path: Local file path where the downloaded file will be saved.
         max_retries: Maximum number of retry attempts (default: 3).
         headers: Optional dictionary of HTTP headers.
-        chunk_size: Size of chunks to read at a time in bytes (default: 8192).
+        chunk_size: Size of chunks to read at a time in bytes (default: 1 MiB).
             Larger chunks can be faster but use more memory.
         validate_content_type: If True, validates that response is not HTML (default: False).
             Raises ValueError if HTML content is detected.
         write_metadata: If True, writes provenance metadata to a .meta.json sidecar file (default: True).
         use_cache: If True, uses HTTP caching with ETag/Last-Modified (default: True).
             Set to False to force re-download regardless of cache status.
+        provider_name: Provider name to record in the provenance metadata (optional).
+        provider_specific: Provider-specific provenance fields (optional). Passing
+            these here writes the sidecar once instead of patching it afterwards.
     
     Returns:
         Path to the downloaded file.
@@ -151,18 +306,18 @@ def download_file(
         >>> download_file('https://example.com/data.csv', './data.csv', use_cache=False)
         './data.csv'
     """
-    from publicdata_ca.http_cache import get_conditional_headers, save_cache_metadata
+    from publicdata_ca.http_cache import get_conditional_headers
     
     # Prepare headers
-    request_headers = headers if headers is not None else get_default_headers()
+    request_headers = headers if headers is not None else _DEFAULT_HEADERS
     
     # Add conditional headers if caching is enabled and file exists
     if use_cache and os.path.exists(output_path):
-        conditional_headers = get_conditional_headers(output_path)
+        conditional_headers = get_conditional_headers(output_path, url=url)
         request_headers = {**request_headers, **conditional_headers}
     
     try:
-        response = retry_request(url, max_retries=max_retries, headers=request_headers)
+        response = retry_request(url, max_retries=max_retries, headers=request_headers, stream=True)
     except requests.HTTPError as e:
         # Handle 304 Not Modified - file hasn't changed
         if e.response.status_code == 304 and use_cache and os.path.exists(output_path):
@@ -171,24 +326,119 @@ def download_file(
         # Re-raise other HTTP errors
         raise
     
-    # Get content type from response headers
-    content_type = response.headers.get('Content-Type', '')
-    
-    # Validate content type if requested
-    if validate_content_type:
-        content_type_lower = content_type.lower()
-        # Check for HTML or XHTML content (using 'in' to match variants like 'application/xhtml+xml')
-        if 'text/html' in content_type_lower or 'application/xhtml' in content_type_lower:
-            raise ValueError(
-                f"Expected data file but received HTML content (Content-Type: {content_type}). "
-                f"URL may be invalid or may have changed. Please verify the URL points to a data file."
-            )
+    # A 304 is not an error status, so it normally arrives as a regular
+    # response with an empty body. Keep the cached file instead of truncating it.
+    if response.status_code == 304 and use_cache and os.path.exists(output_path):
+        response.close()
+        return output_path
+    
+    return save_response(
+        response,
+        url,
+        output_path,
+        chunk_size=chunk_size,
+        validate_content_type=validate_content_type,
+        write_metadata=write_metadata,
+        use_cache=use_cache,
+        provider_name=provider_name,
+        provider_specific=provider_specific
+    )
+
+
+def save_response(
+    response: requests.Response,
+    url: str,
+    output_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    validate_content_type: bool = False,
+    write_metadata: bool = True,
+    use_cache: bool = True,
+    provider_name: Optional[str] = None,
+    provider_specific: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Write the body of an open streamed response to a local file.
+    
+    This is the second half of download_file, for callers that already hold
+    the response (e.g. after a conditional request that came back 200) and
+    should not request the same file again. The response is always closed.
+    
+    Args:
+        response: Response returned by retry_request(..., stream=True).
+        url: The URL the response was requested from.
+        output_path: Local file path where the body will be saved.
+        chunk_size: Size of chunks to read at a time in bytes (default: 1 MiB).
+        validate_content_type: If True, raises ValueError for HTML content (default: False).
+        write_metadata: If True, writes provenance metadata to a .meta.json sidecar file (default: True).
+        use_cache: If True, saves the response ETag/Last-Modified for later
+            conditional requests (default: True).
+        provider_name: Provider name to record in the provenance metadata (optional).
+        provider_specific: Provider-specific provenance fields (optional).
+    
+    Returns:
+        Path to the saved file.
     
-    # Download file in chunks
-    with open(output_path, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=chunk_size):
-            if chunk:  # filter out keep-alive new chunks
-                f.write(chunk)
+    Raises:
+        ValueError: If validate_content_type=True and HTML content is detected.
+    """
+    from publicdata_ca.http_cache import save_cache_metadata
+    
+    try:
+        # Get content type from response headers
+        content_type = response.headers.get('Content-Type', '')
+        
+        # Validate content type if requested
+        if validate_content_type:
+            content_type_lower = content_type.lower()
+            # Check for HTML or XHTML content (using 'in' to match variants like 'application/xhtml+xml')
+            if 'text/html' in content_type_lower or 'application/xhtml' in content_type_lower:
+                raise ValueError(
+                    f"Expected data file but received HTML content (Content-Type: {content_type}). "
+                    f"URL may be invalid or may have changed. Please verify the URL points to a data file."
+                )
+        
+        chunks = iter(response.iter_content(chunk_size=chunk_size))
+        first_chunk = b''
+        if validate_content_type:
+            # Some servers label error pages as application/octet-stream, so
+            # also sniff the start of the body before anything is written.
+            first_chunk = next((chunk for chunk in chunks if chunk), b'')
+            if _looks_like_html(first_chunk):
+                raise ValueError(
+                    f"Expected data file but received an HTML page (Content-Type: {content_type}). "
+                    f"URL may be invalid or may have changed. Please verify the URL points to a data file."
+                )
+        
+        # Hash while streaming so provenance metadata doesn't re-read the file
+        hasher = None
+        if write_metadata:
+            from publicdata_ca.provenance import new_hash_object
+            hasher = new_hash_object()
+        
+        # Download file in chunks to a temporary name, then move it into
+        # place. A failed download leaves the previous copy untouched, and a
+        # file hardlinked elsewhere (CMHC dedupe) gets a new inode instead
+        # of being rewritten under every other name it has.
+        partial = f"{output_path}.part"
+        try:
+            with open(partial, 'wb') as f:
+                if first_chunk:
+                    f.write(first_chunk)
+                    if hasher is not None:
+                        hasher.update(first_chunk)
+                for chunk in chunks:
+                    if chunk:  # filter out keep-alive new chunks
+                        f.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+            os.replace(partial, output_path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.unlink(partial)
+            raise
+    finally:
+        # Release the connection back to the pool
+        response.close()
     
     # Save HTTP cache metadata if caching is enabled
     if use_cache:
@@ -208,7 +458,10 @@ def download_file(
             write_provenance_metadata(
                 output_path,
                 url,
-                content_type=content_type if content_type else None
+                content_type=content_type if content_type else None,
+                provider_name=provider_name,
+                provider_specific=provider_specific,
+                file_hash=hasher.hexdigest()
             )
         except Exception:
             # Don't fail the download if metadata writing fails
@@ -216,3 +469,49 @@ def download_file(
             pass
     
     return output_path
+
+
+def download_files(
+    downloads: Iterable[Tuple[str, str]],
+    max_workers: int = DEFAULT_MAX_PARALLEL_DOWNLOADS,
+    **kwargs: Any
+) -> List[str]:
+    """
+    Download several files concurrently.
+    
+    Each (url, output_path) pair is downloaded with download_file on a bounded
+    thread pool. All workers share the pooled session, so concurrent downloads
+    from the same host reuse keep-alive connections.
+    
+    Args:
+        downloads: Iterable of (url, output_path) pairs.
+        max_workers: Maximum number of concurrent downloads (default: 5).
+        **kwargs: Additional keyword arguments passed to download_file
+            (max_retries, headers, validate_content_type, ...).
+    
+    Returns:
+        List of downloaded file paths, in the same order as downloads.
+    
+    Raises:
+        RequestException: If any download fails after all retries. Remaining
+            downloads are allowed to finish before the error is raised.
+        ValueError: If validate_content_type=True and HTML content is detected.
+    
+    Example:
+        >>> download_files([
+        ...     ('https://example.com/a.csv', './a.csv'),
+        ...     ('https://example.com/b.csv', './b.csv'),
+        ... ])
+        ['./a.csv', './b.csv']
+    """
+    pairs = list(downloads)
+    if not pairs:
+        return []
+    
+    workers = max(1, min(max_workers, len(pairs)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(download_file, url, output_path, **kwargs)
+            for url, output_path in pairs
+        ]
+        return [future.result() for future in futures]
@@ -113,7 +113,7 @@ def clear_cache_metadata(file_path: str) -> None:
             pass
 
 
-def get_conditional_headers(file_path: str) -> Dict[str, str]:
+def get_conditional_headers(file_path: str, url: Optional[str] = None) -> Dict[str, str]:
     """
     Get conditional request headers (If-None-Match, If-Modified-Since) for a file.
     
@@ -122,10 +122,13 @@ def get_conditional_headers(file_path: str) -> Dict[str, str]:
     
     Args:
         file_path: Path to the downloaded file.
+        url: Optional URL about to be requested. If given, headers are only
+            returned when the cache metadata was recorded for the same URL, so
+            validators from one resource are never sent to another.
     
     Returns:
         Dictionary of conditional headers to include in the request.
-        Empty dict if no cache metadata exists.
+        Empty dict if no cache metadata exists (or it belongs to another URL).
     
     Example:
         >>> headers = get_conditional_headers('/path/to/data.csv')
@@ -137,6 +140,9 @@ def get_conditional_headers(file_path: str) -> Dict[str, str]:
     if not metadata:
         return {}
     
+    if url is not None and metadata.get('url') not in (None, url):
+        return {}
+    
     headers = {}
     
     if metadata.get('etag'):
@@ -7,19 +7,33 @@ ensuring reproducibility and enabling fail-fast behavior when expected data is m
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
 
-import pandas as pd
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
 
 from publicdata_ca.datasets import ensure_raw_destination
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Manifests listing fewer files than this are checked with one stat per file;
+# scanning the manifest directory only pays off for larger manifests.
+_INDEX_MIN_FILES = 64
+
 
 def build_manifest_file(
     output_dir: str,
     datasets: List[Dict[str, Any]],
-    manifest_name: str = "manifest.json"
+    manifest_name: str = "manifest.json",
+    created_at: Optional[str] = None,
+    durable: bool = False
 ) -> str:
     """
     Build a manifest file for a data download run.
@@ -37,6 +51,10 @@ def build_manifest_file(
             - url: Source URL (optional)
             - title: Dataset title (optional)
         manifest_name: Name of the manifest file (default: 'manifest.json').
+        created_at: ISO 8601 timestamp to record (optional). Callers writing several
+            manifests in one run can pass a shared value; defaults to the current UTC time.
+        durable: If True, fsync the manifest to disk before returning (default: False).
+            Only needed when the manifest must survive a crash or power loss.
     
     Returns:
         Path to the created manifest file.
@@ -57,7 +75,8 @@ def build_manifest_file(
     
     manifest_path = output_path / manifest_name
     
-    created_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    if created_at is None:
+        created_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
     manifest = {
         "created_at": created_at,
@@ -66,16 +85,25 @@ def build_manifest_file(
         "output_directory": str(output_path.absolute())
     }
     
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        payload = orjson.dumps(manifest, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    # Single write; fsync is opt-in since it costs milliseconds even on SSDs
+    with open(manifest_path, 'wb') as f:
+        f.write(payload)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
     
     return str(manifest_path)
 
 
-def build_run_manifest(catalog: pd.DataFrame) -> pd.DataFrame:
+def build_run_manifest(catalog: "pd.DataFrame") -> "pd.DataFrame":
     """Mirror the notebook's run manifest summary for curated datasets."""
 
-    def action(row: pd.Series) -> str:
+    def action(row: "pd.Series") -> str:
         if row["provider"] == "statcan" and row["pid"]:
             return f"download_statcan_table({row['pid']}, target_file)"
         if row["provider"] == "cmhc" and row.get("direct_url"):
@@ -124,16 +152,60 @@ def load_manifest(manifest_path: str) -> Dict[str, Any]:
         FileNotFoundError: If the manifest file doesn't exist.
         json.JSONDecodeError: If the manifest file is not valid JSON.
     """
+    if orjson is not None:
+        return orjson.loads(Path(manifest_path).read_bytes())
     with open(manifest_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def validate_manifest(manifest_path: str) -> bool:
+def _index_dir(root: Path) -> Set[str]:
+    """
+    Return the normalized relative paths of every file and directory under ``root``.
+    
+    Symlinked directories are followed, but each real directory is scanned
+    only once so symlink loops terminate. Paths missed that way are still
+    found by the ``exists`` fallback in validate_manifest.
+    """
+    seen: Set[str] = set()
+    scanned: Set[Tuple[int, int]] = set()
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        try:
+            st = os.stat(dirpath)
+        except OSError:
+            dirnames[:] = []
+            continue
+        if (st.st_dev, st.st_ino) in scanned:
+            dirnames[:] = []
+            continue
+        scanned.add((st.st_dev, st.st_ino))
+        for name in dirnames + filenames:
+            seen.add(os.path.normpath(os.path.relpath(os.path.join(dirpath, name), root)))
+    return seen
+
+
+def _outside_dir(relative: str) -> bool:
+    """Return True if a normalized manifest path is absolute or escapes its directory."""
+    return os.path.isabs(relative) or relative == os.pardir or relative.startswith(os.pardir + os.sep)
+
+
+def validate_manifest(manifest_path: str, max_workers: Optional[int] = None) -> bool:
     """
     Validate that all files listed in a manifest exist.
     
+    For large manifests the manifest directory is scanned once and listed
+    files are checked against that index, rather than issuing a ``stat`` per
+    file. Paths that are absolute, point outside the manifest directory, or
+    are not in the index are checked individually, so the index only ever
+    saves work. Small manifests are checked with a ``stat`` per file.
+    
+    On network filesystems, where every ``stat`` is a round trip and walking a
+    large directory is slow, pass ``max_workers`` to instead check each listed
+    file directly from a thread pool.
+    
     Args:
         manifest_path: Path to the manifest JSON file.
+        max_workers: If set, check files concurrently with this many threads
+            instead of scanning the directory (default: None).
     
     Returns:
         True if all files exist, False otherwise.
@@ -141,12 +213,32 @@ def validate_manifest(manifest_path: str) -> bool:
     manifest = load_manifest(manifest_path)
     manifest_dir = Path(manifest_path).parent
     
-    all_exist = True
-    for dataset in manifest.get('datasets', []):
-        for file_path in dataset.get('files', []):
-            full_path = manifest_dir / file_path
-            if not full_path.exists():
-                print(f"Missing file: {full_path}")
-                all_exist = False
+    listed = [
+        file_path
+        for dataset in manifest.get('datasets', [])
+        for file_path in dataset.get('files', [])
+    ]
+    full_paths = [str(manifest_dir / file_path) for file_path in listed]
+    
+    if max_workers:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            found = list(executor.map(os.path.exists, full_paths))
+    elif len(listed) < _INDEX_MIN_FILES:
+        found = [os.path.exists(path) for path in full_paths]
+    else:
+        existing: Optional[Set[str]] = None
+        found = []
+        for file_path in listed:
+            relative = os.path.normpath(file_path)
+            if _outside_dir(relative):
+                found.append((manifest_dir / file_path).exists())
+                continue
+            if existing is None:
+                existing = _index_dir(manifest_dir)
+            found.append(relative in existing or (manifest_dir / file_path).exists())
+    
+    missing = [path for path, exists in zip(full_paths, found) if not exists]
+    if missing:
+        print("Missing files:\n" + "\n".join(missing))
     
-    return all_exist
+    return not missing
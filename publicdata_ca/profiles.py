@@ -34,9 +34,10 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 try:
     import yaml
@@ -12,6 +12,7 @@ Schema fields:
   - source_url: URL where the file was downloaded from
   - downloaded_at: ISO 8601 timestamp of download (UTC)
   - file_size_bytes: Size of the file in bytes
+  - file_mtime_ns: File modification time in nanoseconds when the hash was taken
   - content_type: HTTP Content-Type header value
   - hash: File integrity hash (algorithm and value)
   - provider: Data provider information
@@ -21,9 +22,51 @@ Schema fields:
 
 import hashlib
 import json
+import mmap
+import os
+import platform
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None  # type: ignore
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+# Read size for the chunked hashing fallback. 1 MiB keeps per-chunk Python
+# overhead negligible without holding much of the file in memory.
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Files in this size range are memory-mapped and hashed with a single update()
+# call, letting OpenSSL consume the whole buffer without returning to Python.
+# The upper bound keeps the mapping within a 32-bit address space.
+_MMAP_MIN_SIZE = 1 << 20
+_MMAP_MAX_SIZE = (2 << 30) - 1 if sys.maxsize <= 2**32 else sys.maxsize
+
+# Default algorithm for provenance hashes. BLAKE2b is in the standard library
+# and several times faster than SHA-256 on CPUs without SHA extensions, so any
+# machine can still verify sidecars written elsewhere. 'blake3' can be
+# requested explicitly when the optional blake3 package is installed.
+DEFAULT_HASH_ALGORITHM = 'blake2b'
+
+# Hashes computed by this process, keyed by (absolute path, algorithm) and
+# stored with the stat signature they were taken at. Bounded LRU so bulk
+# runs don't grow it without limit.
+_HASH_CACHE_SIZE = 1024
+_hash_cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, ...], str]]" = OrderedDict()
+_hash_cache_lock = threading.Lock()
 
 # Current metadata schema version
 METADATA_SCHEMA_VERSION = "1.0"
@@ -31,7 +74,7 @@ METADATA_SCHEMA_VERSION = "1.0"
 # Standard metadata fields (excluding provider-specific fields)
 STANDARD_METADATA_FIELDS = {
     "schema_version", "file", "source_url", "downloaded_at",
-    "file_size_bytes", "hash", "content_type", "provider"
+    "file_size_bytes", "file_mtime_ns", "hash", "content_type", "provider"
 }
 
 
@@ -49,14 +92,106 @@ def _format_utc_timestamp(dt: datetime) -> str:
     return dt.strftime('%Y-%m-%dT%H:%M:%S') + 'Z'
 
 
-def calculate_file_hash(file_path: str, algorithm: str = 'sha256') -> str:
+# SHA family algorithms that are only fast with CPU SHA extensions.
+_HW_ACCELERATED_ALGORITHMS = frozenset({'sha1', 'sha224', 'sha256'})
+
+# Set once the slow-SHA warning has been issued for this process.
+_warned_software_sha = False
+
+
+@lru_cache(maxsize=None)
+def _has_hardware_sha() -> Optional[bool]:
+    """
+    Probe whether the CPU exposes SHA instructions (x86 SHA-NI or ARMv8 SHA2).
+    
+    Returns:
+        True or False when it can be determined, None when unknown.
+    """
+    if sys.platform == 'darwin':
+        # Every Apple Silicon CPU implements the ARMv8 SHA2 extension
+        return True if platform.machine() == 'arm64' else None
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key.strip().lower() in ('flags', 'features'):
+                    flags = value.split()
+                    return 'sha_ni' in flags or 'sha2' in flags
+    except OSError:
+        return None
+    return None
+
+
+def _warn_if_software_sha(algorithm: str) -> None:
+    """Warn once per process when a SHA hash will run without CPU acceleration."""
+    global _warned_software_sha
+    if _warned_software_sha or algorithm not in _HW_ACCELERATED_ALGORITHMS:
+        return
+    if _has_hardware_sha() is False:
+        _warned_software_sha = True
+        warnings.warn(
+            f"Hashing with {algorithm} on a CPU without SHA extensions is slow; "
+            f"consider hash_algorithm='blake2b'.",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+
+def new_hash_object(algorithm: str = DEFAULT_HASH_ALGORITHM) -> Any:
+    """
+    Create an incremental hash object for the given algorithm.
+    
+    Args:
+        algorithm: Any hashlib algorithm name, or 'blake3' if the optional
+            blake3 package is installed (default: 'blake2b').
+    
+    Returns:
+        Object with update() and hexdigest() methods.
+    
+    Raises:
+        ValueError: If the algorithm is not available.
+    """
+    if algorithm == 'blake3':
+        if blake3 is None:
+            raise ValueError("hash algorithm 'blake3' requires the blake3 package (pip install blake3)")
+        return blake3.blake3(max_threads=blake3.blake3.AUTO)
+    return hashlib.new(algorithm)
+
+
+def _stat_signature(file_stat: os.stat_result) -> Tuple[int, ...]:
+    """Return the stat fields that change whenever a file's content is replaced or edited."""
+    return (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ctime_ns)
+
+
+def _remember_hash(file_path: str, algorithm: str, file_stat: os.stat_result, digest: str) -> None:
+    """Record a digest computed by this process in the bounded hash cache."""
+    key = (os.path.abspath(file_path), algorithm)
+    with _hash_cache_lock:
+        _hash_cache[key] = (_stat_signature(file_stat), digest)
+        _hash_cache.move_to_end(key)
+        if len(_hash_cache) > _HASH_CACHE_SIZE:
+            _hash_cache.popitem(last=False)
+
+
+def _cached_hash(file_path: str, algorithm: str, file_stat: os.stat_result) -> Optional[str]:
+    """Return this process's digest for a file if its stat signature is unchanged."""
+    key = (os.path.abspath(file_path), algorithm)
+    with _hash_cache_lock:
+        entry = _hash_cache.get(key)
+    if entry is not None and entry[0] == _stat_signature(file_stat):
+        return entry[1]
+    return None
+
+
+def calculate_file_hash(file_path: str, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
     """
     Calculate cryptographic hash of a file.
     
     Args:
         file_path: Path to the file to hash.
-        algorithm: Hash algorithm to use (default: 'sha256').
-            Supported: 'md5', 'sha1', 'sha256', 'sha512'.
+        algorithm: Hash algorithm to use (default: 'blake2b').
+            Supported: 'md5', 'sha1', 'sha256', 'sha512', 'blake2b', and
+            'blake3' when the blake3 package is installed.
     
     Returns:
         Hexadecimal hash digest string.
@@ -66,24 +201,86 @@ def calculate_file_hash(file_path: str, algorithm: str = 'sha256') -> str:
         >>> print(hash_value)
         'a1b2c3d4...'
     """
-    hash_obj = hashlib.new(algorithm)
+    _warn_if_software_sha(algorithm)
     
     with open(file_path, 'rb') as f:
-        # Read in chunks to handle large files efficiently
-        while chunk := f.read(8192):
-            hash_obj.update(chunk)
+        file_stat = os.fstat(f.fileno())
+        digest = _hash_open_file(f, file_stat.st_size, algorithm)
     
+    _remember_hash(file_path, algorithm, file_stat, digest)
+    return digest
+
+
+def _hash_open_file(f: Any, file_size: int, algorithm: str) -> str:
+    """Hash an open binary file, choosing mmap or chunked reads by size."""
+    if _MMAP_MIN_SIZE <= file_size <= _MMAP_MAX_SIZE:
+        hash_obj = new_hash_object(algorithm)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            hash_obj.update(mm)
+        return hash_obj.hexdigest()
+    
+    if hasattr(hashlib, 'file_digest'):
+        # Python 3.11+: the read/update loop runs in C
+        return hashlib.file_digest(f, lambda: new_hash_object(algorithm)).hexdigest()
+    
+    hash_obj = new_hash_object(algorithm)
+    # Read in chunks to handle large files efficiently
+    while chunk := f.read(_HASH_CHUNK_SIZE):
+        hash_obj.update(chunk)
     return hash_obj.hexdigest()
 
 
+def hash_files_batch(
+    file_paths: Sequence[str],
+    algorithm: str = DEFAULT_HASH_ALGORITHM,
+    max_workers: Optional[int] = None
+) -> List[str]:
+    """
+    Hash several files concurrently.
+    
+    hashlib releases the GIL while digesting large buffers, so a thread pool
+    hashes independent files on separate cores. This is useful when hashing
+    many existing files at once, e.g. re-verifying a data directory; fresh
+    downloads are already hashed while they stream.
+    
+    Args:
+        file_paths: Paths of the files to hash.
+        algorithm: Hash algorithm to use (default: 'blake2b').
+        max_workers: Maximum number of threads (default: CPU count, at most 8).
+    
+    Returns:
+        Hexadecimal digests, in the same order as file_paths.
+    
+    Example:
+        >>> hash_files_batch(['/data/a.csv', '/data/b.csv'])
+        ['a1b2c3d4...', 'e5f6a7b8...']
+    """
+    if len(file_paths) <= 1 or max_workers == 1:
+        return [calculate_file_hash(path, algorithm=algorithm) for path in file_paths]
+    
+    workers = min(max_workers or min(os.cpu_count() or 1, 8), len(file_paths))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda path: calculate_file_hash(path, algorithm=algorithm), file_paths))
+
+
+def _dump_metadata(metadata: Dict[str, Any]) -> bytes:
+    """Serialize a metadata dict as indented UTF-8 JSON, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(metadata, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(metadata, indent=2, ensure_ascii=False).encode('utf-8')
+
+
 def write_provenance_metadata(
     file_path: str,
     source_url: str,
     content_type: Optional[str] = None,
     additional_metadata: Optional[Dict[str, Any]] = None,
-    hash_algorithm: str = 'sha256',
+    hash_algorithm: str = DEFAULT_HASH_ALGORITHM,
     provider_name: Optional[str] = None,
-    provider_specific: Optional[Dict[str, Any]] = None
+    provider_specific: Optional[Dict[str, Any]] = None,
+    file_hash: Optional[str] = None
 ) -> str:
     """
     Write provenance metadata as a .meta.json sidecar file using unified schema.
@@ -109,10 +306,13 @@ def write_provenance_metadata(
         content_type: HTTP Content-Type header value (optional).
         additional_metadata: DEPRECATED. Additional metadata to include (optional).
             For backward compatibility only. Use provider_specific instead.
-        hash_algorithm: Hash algorithm to use (default: 'sha256').
+        hash_algorithm: Hash algorithm to use (default: 'blake2b').
         provider_name: Name of the data provider (e.g., 'statcan', 'cmhc').
         provider_specific: Provider-specific metadata fields (optional).
             Examples: {'pid': '18100004', 'table_number': '18-10-0004'} for StatsCan.
+        file_hash: Precomputed hex digest of the file using hash_algorithm (optional).
+            Pass this when the hash was computed while writing the file to avoid
+            reading it back from disk.
     
     Returns:
         Path to the created metadata file.
@@ -129,15 +329,17 @@ def write_provenance_metadata(
     """
     file_path_obj = Path(file_path)
     
-    # Check if file exists
-    if not file_path_obj.exists():
-        raise FileNotFoundError(f"Data file not found: {file_path}")
-    
-    # Calculate file hash
-    file_hash = calculate_file_hash(str(file_path_obj), algorithm=hash_algorithm)
+    # A single stat both checks existence and gives the size and mtime
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data file not found: {file_path}") from None
     
-    # Get file size
-    file_size = file_path_obj.stat().st_size
+    # Calculate file hash unless the caller already has it
+    if file_hash is None:
+        file_hash = calculate_file_hash(str(file_path_obj), algorithm=hash_algorithm)
+    else:
+        _remember_hash(file_path, hash_algorithm, file_stat, file_hash)
     
     # Build metadata using unified schema
     metadata = {
@@ -145,7 +347,8 @@ def write_provenance_metadata(
         "file": str(file_path_obj.name),
         "source_url": source_url,
         "downloaded_at": _format_utc_timestamp(datetime.now(timezone.utc)),
-        "file_size_bytes": file_size,
+        "file_size_bytes": file_stat.st_size,
+        "file_mtime_ns": file_stat.st_mtime_ns,
         "hash": {
             "algorithm": hash_algorithm,
             "value": file_hash
@@ -187,8 +390,8 @@ def write_provenance_metadata(
     # Write metadata file
     meta_file_path = file_path_obj.parent / f"{file_path_obj.name}.meta.json"
     
-    with open(meta_file_path, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2, ensure_ascii=False)
+    with open(meta_file_path, 'wb') as f:
+        f.write(_dump_metadata(metadata))
     
     return str(meta_file_path)
 
@@ -224,16 +427,29 @@ def read_provenance_metadata(file_path: str) -> Dict[str, Any]:
     if not meta_file_path.exists():
         raise FileNotFoundError(f"Metadata file not found: {meta_file_path}")
     
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(meta_file_path.read_bytes())
     with open(meta_file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def verify_file_integrity(file_path: str) -> bool:
+def verify_file_integrity(file_path: str, strict: bool = True, refresh_stat: bool = False) -> bool:
     """
     Verify file integrity using the hash from its metadata.
     
     Args:
         file_path: Path to the data file.
+        strict: If True (default), always re-hash the file. If False, reuse a
+            hash this process already computed for the unchanged file, or trust
+            a file whose size and modification time still match the metadata,
+            and only re-hash otherwise. Useful for write-then-verify workflows
+            and quick scans over many files; it will not catch in-place edits
+            that preserve mtime.
+        refresh_stat: With strict=False, record the file's current modification
+            time in the sidecar after a re-hash confirms the file, so later
+            non-strict checks of a touched file (or one whose sidecar predates
+            file_mtime_ns) don't hash it again (default: False).
     
     Returns:
         True if the file hash matches the metadata, False otherwise.
@@ -257,7 +473,32 @@ def verify_file_integrity(file_path: str) -> bool:
     if not expected_hash:
         raise ValueError("No hash value found in metadata")
     
+    if not strict:
+        file_stat = os.stat(file_path)
+        cached = _cached_hash(file_path, algorithm, file_stat)
+        if cached is not None:
+            return cached == expected_hash
+        if file_stat.st_size != metadata.get('file_size_bytes', file_stat.st_size):
+            return False
+        if file_stat.st_mtime_ns == metadata.get('file_mtime_ns'):
+            return True
+    
     # Calculate current file hash
     current_hash = calculate_file_hash(file_path, algorithm=algorithm)
     
-    return current_hash == expected_hash
+    matches = current_hash == expected_hash
+    if matches and refresh_stat and not strict:
+        _refresh_sidecar_stat(file_path, metadata, file_stat)
+    return matches
+
+
+def _refresh_sidecar_stat(file_path: str, metadata: Dict[str, Any], file_stat: os.stat_result) -> None:
+    """Record a verified file's current size and mtime in its sidecar, if writable."""
+    metadata['file_size_bytes'] = file_stat.st_size
+    metadata['file_mtime_ns'] = file_stat.st_mtime_ns
+    try:
+        with open(f"{file_path}.meta.json", 'wb') as f:
+            f.write(_dump_metadata(metadata))
+    except OSError:
+        # Read-only data directories just keep paying for the hash
+        pass
@@ -13,7 +13,6 @@ import json
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
-import pandas as pd
 from publicdata_ca.http import retry_request, download_file
 from publicdata_ca.provider import Provider, DatasetRef
 
@@ -205,6 +204,7 @@ def download_valet_series(
         raise RuntimeError(f"No observations returned for series {series_name}")
     
     # Create DataFrame in tidy format
+    import pandas as pd
     df = pd.DataFrame(observations)
     
     # Rename columns for clarity (d -> date, v -> value)
@@ -6,8 +6,9 @@ handling landing page resolution for datasets with changing URLs.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from publicdata_ca.http import download_file
 from publicdata_ca.resolvers.cmhc_landing import resolve_cmhc_landing_page
 from publicdata_ca.provider import Provider, DatasetRef
@@ -37,11 +38,18 @@ def resolve_cmhc_assets(landing_url: str) -> List[Dict[str, str]]:
     return resolve_cmhc_landing_page(landing_url)
 
 
+# Default number of assets downloaded concurrently from one landing page.
+# Kept small to stay polite to CMHC servers.
+DEFAULT_MAX_PARALLEL_ASSETS = 4
+
+
 def download_cmhc_asset(
     landing_url: str,
     output_dir: str,
     asset_filter: Optional[str] = None,
-    max_retries: int = 3
+    max_retries: int = 3,
+    max_parallel: int = DEFAULT_MAX_PARALLEL_ASSETS,
+    dedupe: bool = False
 ) -> Dict[str, Any]:
     """
     Download CMHC data assets from a landing page.
@@ -56,6 +64,13 @@ def download_cmhc_asset(
         asset_filter: Optional filter string to select specific assets (e.g., 'csv').
             If None, downloads all assets.
         max_retries: Maximum number of download retry attempts (default: 3).
+        max_parallel: Maximum number of assets to download (and hash) at once
+            (default: 4). Use 1 to download sequentially.
+        dedupe: If True, hardlink assets with identical content to one copy on
+            disk (default: False). Files are indexed by their provenance hash in
+            a content-addressed '.cas' directory under output_dir, so the same
+            CSV republished under several titles or landing pages is stored once.
+            Hardlinked files share data, so editing one edits all of them.
     
     Returns:
         Dictionary containing:
@@ -63,7 +78,8 @@ def download_cmhc_asset(
             - provider: 'cmhc'
             - files: List of downloaded file paths
             - landing_url: Original landing page URL
-            - assets: List of asset metadata
+            - assets: List of asset metadata (downloaded assets also carry
+              'local_path' and 'metadata_path')
     
     Example:
         >>> result = download_cmhc_asset(
@@ -77,6 +93,7 @@ def download_cmhc_asset(
         - The function uses the cmhc_landing resolver to extract current URLs
         - Files are saved with sanitized names based on asset titles
         - Supports filtering by format or title keywords
+        - Files are listed in asset order regardless of download completion order
     """
     # Create output directory
     output_path = Path(output_dir)
@@ -94,58 +111,34 @@ def download_cmhc_asset(
                filter_lower in a.get('title', '').lower()
         ]
     
-    # Download each asset
-    downloaded_files = []
-    download_errors = []
-    
-    for asset in assets:
-        # Create a safe filename
-        file_format = asset.get('format', 'dat')
-        title = asset.get('title', 'asset')
-        # Sanitize filename to prevent directory traversal
-        # Remove any path separators and only allow safe characters
-        safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_title = safe_title.replace(' ', '_')
-        # Remove any remaining path separators that might have been introduced
-        safe_title = safe_title.replace('/', '_').replace('\\', '_').replace('..', '_')
-        # Ensure the title is not empty
-        if not safe_title:
-            safe_title = 'asset'
-        
-        # Sanitize file format to only allow alphanumeric characters
-        safe_format = "".join(c for c in file_format if c.isalnum())
-        if not safe_format:
-            safe_format = 'dat'
-        
-        file_name = f"{safe_title}.{safe_format}"
-        output_file = output_path / file_name
-        
-        try:
-            # Download with content-type validation to reject HTML responses
-            download_file(
-                asset['url'],
-                str(output_file),
-                max_retries=max_retries,
-                validate_content_type=True
-            )
-            downloaded_files.append(str(output_file.relative_to(output_path.parent)))
-            asset['local_path'] = str(output_file)
-            
-            # Add CMHC-specific metadata to the provenance file
-            _add_cmhc_metadata(str(output_file), asset, landing_url)
-        except (ValueError, Exception) as e:
-            # Handle all download errors uniformly (ValueError for validation, Exception for others)
-            # Both are tracked the same way, but logged differently based on type
-            error_msg = f"Failed to download '{asset['title']}' from {asset['url']}: {str(e)}"
-            download_errors.append(error_msg)
-            
-            # Log as error for validation issues, warning for others
-            if isinstance(e, ValueError):
-                print(f"Error: {error_msg}")
-            else:
-                print(f"Warning: {error_msg}")
-            
-            asset['error'] = str(e)
+    def fetch(asset: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        return _download_asset_file(asset, output_path, landing_url, max_retries, dedupe)
+    
+    # Assets whose titles sanitize to the same file name write the same file
+    # and sidecars, so they are downloaded one after another, in asset order
+    # (the last one wins, as with a sequential download).
+    same_file: Dict[str, List[int]] = {}
+    for index, asset in enumerate(assets):
+        filename = _safe_asset_filename(asset.get('title', 'asset'), asset.get('format', 'dat'))
+        same_file.setdefault(filename, []).append(index)
+    
+    results: List[Tuple[Optional[str], Optional[str]]] = [(None, None)] * len(assets)
+    
+    def fetch_group(indexes: List[int]) -> None:
+        for index in indexes:
+            results[index] = fetch(assets[index])
+    
+    # Download each asset; download_file is I/O bound and hashing releases the
+    # GIL, so threads overlap one asset's download with another's hashing.
+    workers = max(1, min(max_parallel, len(same_file)))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fetch_group, same_file.values()))
+    else:
+        results = [fetch(asset) for asset in assets]
+    
+    downloaded_files = [path for path, _ in results if path is not None]
+    download_errors = [error for _, error in results if error is not None]
     
     # Generate dataset ID from landing URL
     dataset_id = f"cmhc_{landing_url.split('/')[-1]}"
@@ -162,58 +155,164 @@ def download_cmhc_asset(
     return result
 
 
-def _add_cmhc_metadata(file_path: str, asset: Dict[str, Any], landing_url: str) -> None:
+# str.translate tables deleting every ASCII character that is not alphanumeric
+# (titles additionally keep spaces, hyphens and underscores).
+_TITLE_DELETE_TABLE = {i: None for i in range(128) if not (chr(i).isalnum() or chr(i) in ' -_')}
+_FORMAT_DELETE_TABLE = {i: None for i in range(128) if not chr(i).isalnum()}
+
+
+def _strip_chars(value: str, ascii_table: Dict[int, None], keep: str) -> str:
+    """
+    Remove characters that are neither alphanumeric nor listed in keep.
+    
+    ASCII input (the usual case) is filtered with a single C-level
+    str.translate call; other text falls back to a per-character check so
+    accented letters such as 'é' are still kept.
+    """
+    if value.isascii():
+        return value.translate(ascii_table)
+    return "".join(c for c in value if c.isalnum() or c in keep)
+
+
+def _safe_asset_filename(title: str, file_format: str) -> str:
     """
-    Add CMHC-specific metadata to an existing provenance file using unified schema.
+    Build a filesystem-safe file name from an asset title and format.
     
-    Enhances the automatically-generated .meta.json file with CMHC-specific
-    information like asset title, format, rank, and landing page URL.
+    Only alphanumerics, spaces, hyphens and underscores survive in the title
+    (spaces become underscores), and only alphanumerics in the format, so path
+    separators and dots can never cause directory traversal.
     
     Args:
-        file_path: Path to the downloaded file.
-        asset: Asset metadata dictionary.
-        landing_url: Original CMHC landing page URL.
+        title: Asset title from the landing page.
+        file_format: Asset file format (e.g., 'csv').
+    
+    Returns:
+        File name such as 'Housing_Starts.csv'.
+    """
+    safe_title = _strip_chars(title, _TITLE_DELETE_TABLE, ' -_').strip().replace(' ', '_') or 'asset'
+    safe_format = _strip_chars(file_format, _FORMAT_DELETE_TABLE, '') or 'dat'
+    return f"{safe_title}.{safe_format}"
+
+
+def _download_asset_file(
+    asset: Dict[str, Any],
+    output_path: Path,
+    landing_url: str,
+    max_retries: int,
+    dedupe: bool = False
+) -> Tuple[Optional[str], Optional[str]]:
     """
-    import json
-    from pathlib import Path
+    Download one resolved CMHC asset and enrich its provenance metadata.
     
-    meta_file_path = Path(file_path).parent / f"{Path(file_path).name}.meta.json"
+    Records 'local_path' and 'metadata_path' on the asset on success, or
+    'error' on failure.
     
-    if not meta_file_path.exists():
-        return
+    Args:
+        asset: Asset dictionary from the landing page resolver.
+        output_path: Directory where the file will be saved.
+        landing_url: Original CMHC landing page URL.
+        max_retries: Maximum number of download retry attempts.
+        dedupe: If True, hardlink the file to an identical earlier download.
+    
+    Returns:
+        Tuple of (file path relative to the output directory's parent, error
+        message); exactly one of the two is None.
+    """
+    output_file = output_path / _safe_asset_filename(asset.get('title', 'asset'), asset.get('format', 'dat'))
+    meta_file = output_file.with_name(output_file.name + '.meta.json')
     
     try:
-        # Read existing metadata
-        with open(meta_file_path, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-        
-        # Update to use unified schema if not already using it
-        if 'schema_version' not in metadata:
-            metadata['schema_version'] = '1.0'
-        
-        # Build provider section using unified schema
-        if 'provider' not in metadata:
-            metadata['provider'] = {}
-        
-        metadata['provider']['name'] = 'cmhc'
-        
-        # Add CMHC-specific fields to provider.specific
-        if 'specific' not in metadata['provider']:
-            metadata['provider']['specific'] = {}
+        # Download with content-type validation to reject HTML responses
+        download_file(
+            asset['url'],
+            str(output_file),
+            max_retries=max_retries,
+            validate_content_type=True,
+            provider_name='cmhc',
+            provider_specific=_cmhc_provenance_fields(asset, landing_url)
+        )
+        asset['local_path'] = str(output_file)
+        asset['metadata_path'] = str(meta_file)
         
-        metadata['provider']['specific']['landing_page_url'] = landing_url
-        metadata['provider']['specific']['asset_title'] = asset.get('title', '')
-        metadata['provider']['specific']['asset_format'] = asset.get('format', '')
+        if dedupe:
+            _link_to_content_store(output_file, meta_file, output_path / '.cas')
+        return str(output_file.relative_to(output_path.parent)), None
+    except (ValueError, Exception) as e:
+        # Handle all download errors uniformly (ValueError for validation, Exception for others)
+        # Both are tracked the same way, but logged differently based on type
+        error_msg = f"Failed to download '{asset['title']}' from {asset['url']}: {str(e)}"
         
-        # Add rank if available
-        if 'rank' in asset:
-            metadata['provider']['specific']['asset_rank'] = asset['rank']
+        # Log as error for validation issues, warning for others
+        if isinstance(e, ValueError):
+            print(f"Error: {error_msg}")
+        else:
+            print(f"Warning: {error_msg}")
         
-        # Write updated metadata
-        with open(meta_file_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
-    except Exception:
-        # Don't fail if metadata enhancement fails
+        asset['error'] = str(e)
+        return None, error_msg
+
+
+def _cmhc_provenance_fields(asset: Dict[str, Any], landing_url: str) -> Dict[str, Any]:
+    """
+    Build the CMHC-specific provenance fields for a downloaded asset.
+    
+    Args:
+        asset: Asset metadata dictionary.
+        landing_url: Original CMHC landing page URL.
+    
+    Returns:
+        Dictionary stored under provider.specific in the .meta.json sidecar.
+    """
+    fields = {
+        'landing_page_url': landing_url,
+        'asset_title': asset.get('title', ''),
+        'asset_format': asset.get('format', ''),
+    }
+    # Add rank if available
+    if 'rank' in asset:
+        fields['asset_rank'] = asset['rank']
+    return fields
+
+
+def _link_to_content_store(output_file: Path, meta_file: Path, store_dir: Path) -> None:
+    """
+    Deduplicate a downloaded file against a content-addressed store.
+    
+    The store keeps one hardlink per distinct hash at store_dir/ab/abcdef...,
+    keyed by the hash already recorded in the file's provenance sidecar. If
+    the content is already stored, output_file is replaced by a link to it;
+    otherwise output_file becomes the stored copy. Failures (missing sidecar,
+    filesystems without hardlinks) leave the downloaded file as it is.
+    
+    Linked files must never be rewritten in place; download_file replaces
+    its output with a new file, so refreshing one name leaves the others
+    and the stored copy unchanged.
+    
+    Args:
+        output_file: Path to the downloaded file.
+        meta_file: Path to the file's .meta.json sidecar.
+        store_dir: Root directory of the content-addressed store.
+    """
+    from publicdata_ca.provenance import read_provenance_metadata
+    
+    try:
+        digest = read_provenance_metadata(str(meta_file))['hash']['value']
+        stored = store_dir / digest[:2] / digest
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(output_file, stored)
+            return
+        except FileExistsError:
+            pass
+        if os.path.samefile(stored, output_file):
+            return
+        # Swap in the stored copy atomically so readers never see a missing file
+        tmp_link = output_file.with_name(output_file.name + '.cas-tmp')
+        if tmp_link.exists():
+            tmp_link.unlink()
+        os.link(stored, tmp_link)
+        os.replace(tmp_link, output_file)
+    except (OSError, KeyError, TypeError, ValueError):
         pass
 
 
@@ -4,14 +4,49 @@ Statistics Canada (StatsCan) data provider.
 This module provides functionality to download tables and datasets from Statistics Canada.
 """
 
+import csv
+import errno
+import itertools
 import json
+import os
+import struct
+import tempfile
 import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, Any, List
-from publicdata_ca.http import download_file, get_default_headers, retry_request
+from typing import IO, Optional, Dict, Any, List
+import requests
+from publicdata_ca.http import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_PARALLEL_DOWNLOADS,
+    download_file,
+    get_default_headers,
+    retry_request,
+    save_response,
+)
+from publicdata_ca.http_cache import (
+    clear_cache_metadata,
+    get_conditional_headers,
+    load_cache_metadata,
+    save_cache_metadata,
+)
 from publicdata_ca.provider import Provider, DatasetRef
 
+try:
+    # ISA-L's SIMD Deflate decoder inflates several times faster than zlib
+    from isal import isal_zlib as _fast_zlib
+except ImportError:
+    _fast_zlib = None  # type: ignore
+
+# ZIP local file header: signature, versions, flags, method, time, date, CRC,
+# sizes, then the name and extra field lengths (the last two fields).
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+
+# Members at least this large are preallocated before they are written
+_PREALLOCATE_MIN_SIZE = 8 << 20
+
 
 _STATCAN_MANIFEST_READY_STATUSES = {'SUCCESS', 'DONE', 'READY'}
 _STATCAN_MANIFEST_WAIT_STATUSES = {'PENDING', 'PROGRESS', 'RUNNING'}
@@ -24,7 +59,10 @@ def download_statcan_table(
     file_format: str = "csv",
     max_retries: int = 3,
     skip_existing: bool = True,
-    language: str = "en"
+    language: str = "en",
+    stream: bool = False,
+    use_cache: bool = True,
+    extract_workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Download a Statistics Canada table from the WDS API.
@@ -40,7 +78,24 @@ def download_statcan_table(
         file_format: Output format ('csv' only for WDS API). Default is 'csv'.
         max_retries: Maximum number of download retry attempts (default: 3).
         skip_existing: If True, skip download if the main CSV file already exists (default: True).
+            A file that no longer matches its provenance sidecar (e.g. a partial
+            download) is downloaded again.
         language: Language for download ('en' or 'fr'). Default is 'en'.
+        stream: If True, don't extract anything to output_dir; instead return the
+            main {pid}.csv as a readable binary file object under 'stream'
+            (default: False). The ZIP is spooled in memory (on disk in output_dir
+            past 64 MiB) and the CSV is decompressed lazily as it is read, which
+            suits callers that pass it straight to pandas.read_csv. No
+            provenance metadata is written. The caller must close the stream.
+        use_cache: If True (default), an intact existing table that would be
+            downloaded again (skip_existing=False) is first revalidated with
+            the ETag/Last-Modified recorded from its last download. A 304 Not
+            Modified response keeps the local copy, and a changed table is
+            saved from that same response. Set to False to force a
+            re-download.
+        extract_workers: Maximum number of ZIP members extracted at once
+            (default: CPU count, capped at 8). Use 1 when several tables are
+            already being downloaded in parallel.
     
     Returns:
         Dictionary containing:
@@ -51,6 +106,8 @@ def download_statcan_table(
             - title: Table title (from manifest if available)
             - pid: Product ID
             - manifest: Parsed manifest data (if available)
+            - stream: Binary file object for the main CSV (only when stream=True)
+            - not_modified: True if the server confirmed the local copy is current
     
     Example:
         >>> result = download_statcan_table('18100004', './data')
@@ -73,17 +130,11 @@ def download_statcan_table(
     # Define the main output CSV file
     main_csv_file = output_path / f"{pid}.csv"
     
-    # Skip download if file exists and skip_existing is True
-    if skip_existing and main_csv_file.exists():
-        return {
-            'dataset_id': f'statcan_{pid}',
-            'provider': 'statcan',
-            'files': [str(main_csv_file)],
-            'url': _build_wds_url(pid, language),
-            'title': f'StatsCan Table {pid}',
-            'pid': pid,
-            'skipped': True
-        }
+    # Skip download if a complete copy exists and skip_existing is True
+    if skip_existing and main_csv_file.exists() and _cached_table_is_intact(main_csv_file):
+        return _existing_table_result(
+            pid, main_csv_file, _build_wds_url(pid, language), f'StatsCan Table {pid}', stream
+        )
     
     try:
         # Retrieve manifest metadata and download link from StatsCan WDS
@@ -103,18 +154,51 @@ def download_statcan_table(
 
         manifest_title = _extract_manifest_title(manifest_object, language, pid)
         
-        # Download ZIP file to temporary location
-        zip_path = output_path / f"{pid}_temp.zip"
-        
-        # StatsCan WDS API is sensitive to Accept headers; omit it to avoid HTTP 406 errors
+        # StatsCan WDS API is sensitive to Accept headers; omit it to avoid HTTP 406 errors.
+        # Accept-Encoding is safe and lets error pages and headers arrive compressed.
+        default_headers = get_default_headers()
         statcan_headers = {
-            'User-Agent': get_default_headers()['User-Agent'],
+            'User-Agent': default_headers['User-Agent'],
+            'Accept-Encoding': default_headers['Accept-Encoding'],
         }
         
-        download_file(download_url, str(zip_path), max_retries=max_retries, write_metadata=False, headers=statcan_headers)
+        # Revalidate an intact local copy instead of downloading it again.
+        # With skip_existing, getting this far means there is no intact copy.
+        response = None
+        if use_cache and not skip_existing and main_csv_file.exists():
+            response = _revalidate_table(download_url, main_csv_file, statcan_headers, max_retries)
+            if response is not None and response.status_code == 304:
+                response.close()
+                result = _existing_table_result(pid, main_csv_file, download_url, manifest_title, stream)
+                result['not_modified'] = True
+                return result
+        
+        if stream:
+            return {
+                'dataset_id': f'statcan_{pid}',
+                'provider': 'statcan',
+                'files': [],
+                'url': download_url,
+                'title': manifest_title,
+                'pid': pid,
+                'skipped': False,
+                'stream': _open_table_stream(
+                    download_url, pid, output_path, statcan_headers, max_retries, response
+                )
+            }
+        
+        # Download ZIP file to temporary location, reusing the revalidation
+        # response when the table changed
+        zip_path = output_path / f"{pid}_temp.zip"
+        
+        if response is not None:
+            save_response(response, download_url, str(zip_path), write_metadata=False)
+        else:
+            download_file(download_url, str(zip_path), max_retries=max_retries, write_metadata=False, headers=statcan_headers)
         
-        # Extract ZIP file
-        extracted_files = _extract_zip(zip_path, output_path, pid)
+        # Extract ZIP file, hashing members as they are written
+        file_hashes: Dict[str, str] = {}
+        extracted_files = _extract_zip(zip_path, output_path, pid, file_hashes, max_workers=extract_workers)
         
         # Parse manifest if available and merge with WDS metadata
         manifest_data = _parse_manifest(output_path, pid) or {}
@@ -130,12 +214,15 @@ def download_statcan_table(
             extracted_files,
             download_url,
             pid,
-            manifest_data
+            manifest_data,
+            file_hashes
         )
         
+        # Keep the ZIP's validators with the table for the next revalidation
+        _move_cache_metadata(zip_path, main_csv_file, download_url)
+        
         # Clean up ZIP file
-        if zip_path.exists():
-            zip_path.unlink()
+        zip_path.unlink(missing_ok=True)
         
         result = {
             'dataset_id': f'statcan_{pid}',
@@ -155,11 +242,156 @@ def download_statcan_table(
     except Exception as e:
         # Clean up temporary ZIP file on error
         zip_path = output_path / f"{pid}_temp.zip"
-        if zip_path.exists():
-            zip_path.unlink()
+        zip_path.unlink(missing_ok=True)
+        clear_cache_metadata(str(zip_path))
         raise RuntimeError(f"Failed to download StatsCan table {pid}: {str(e)}")
 
 
+def _existing_table_result(
+    pid: str,
+    main_csv_file: Path,
+    url: str,
+    title: str,
+    stream: bool
+) -> Dict[str, Any]:
+    """Build the download result for a table kept from a previous download."""
+    result = {
+        'dataset_id': f'statcan_{pid}',
+        'provider': 'statcan',
+        'files': [str(main_csv_file)],
+        'url': url,
+        'title': title,
+        'pid': pid,
+        'skipped': True
+    }
+    if stream:
+        result['stream'] = open(main_csv_file, 'rb')
+    return result
+
+
+def _revalidate_table(
+    download_url: str,
+    main_csv_file: Path,
+    headers: Dict[str, str],
+    max_retries: int
+) -> Optional[requests.Response]:
+    """
+    Ask StatsCan whether a table changed since the local copy was downloaded.
+    
+    Sends the ETag/Last-Modified recorded for main_csv_file as a conditional
+    GET, provided the file still matches its provenance sidecar (checked only
+    once validators are found). The response is returned unread: a 304 means
+    the local copy is current, while a 200 already carries the new ZIP and is
+    saved from there rather than requested again. The caller must close it.
+    
+    Returns:
+        The open streamed response, or None when no validators were
+        recorded for download_url or the local copy is not intact.
+    """
+    conditional_headers = get_conditional_headers(str(main_csv_file), url=download_url)
+    if not conditional_headers or not _cached_table_is_intact(main_csv_file):
+        return None
+    
+    return retry_request(
+        download_url,
+        max_retries=max_retries,
+        headers={**headers, **conditional_headers},
+        stream=True
+    )
+
+
+def _move_cache_metadata(zip_path: Path, main_csv_file: Path, download_url: str) -> None:
+    """
+    Re-home the HTTP cache validators download_file saved for the temporary ZIP.
+    
+    The ZIP is deleted after extraction, so its ETag/Last-Modified are stored
+    for the main CSV instead, replacing any validators from an older download.
+    """
+    cache_metadata = load_cache_metadata(str(zip_path)) or {}
+    clear_cache_metadata(str(zip_path))
+    clear_cache_metadata(str(main_csv_file))
+    if main_csv_file.exists():
+        save_cache_metadata(
+            str(main_csv_file),
+            etag=cache_metadata.get('etag'),
+            last_modified=cache_metadata.get('last_modified'),
+            url=download_url
+        )
+
+
+def _cached_table_is_intact(csv_file: Path) -> bool:
+    """
+    Check an existing table CSV against its provenance sidecar.
+    
+    Uses the non-strict integrity check: a size mismatch fails immediately
+    and an unchanged size and mtime pass without hashing. A touched file, or
+    one whose sidecar predates file_mtime_ns, is hashed once and its new
+    mtime recorded, so the next check is stat-only again. Files without a
+    readable sidecar are trusted, as before sidecars existed.
+    
+    Args:
+        csv_file: Path to the extracted main CSV.
+    
+    Returns:
+        False if the file is known not to match what was downloaded.
+    """
+    from publicdata_ca.provenance import verify_file_integrity
+    
+    try:
+        return verify_file_integrity(str(csv_file), strict=False, refresh_stat=True)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return True
+
+
+# ZIPs up to this size are kept in memory when streaming a table
+_STREAM_SPOOL_MAX_SIZE = 64 << 20
+
+
+def _open_table_stream(
+    download_url: str,
+    pid: str,
+    spool_dir: Path,
+    headers: Dict[str, str],
+    max_retries: int,
+    response: Optional[requests.Response] = None
+) -> IO[bytes]:
+    """
+    Download a table ZIP into a spooled temporary file and open its main CSV.
+    
+    Args:
+        download_url: URL of the table ZIP.
+        pid: Product ID; the member '{pid}.csv' is opened.
+        spool_dir: Directory for the spool file if the ZIP outgrows memory.
+        headers: HTTP headers for the request.
+        max_retries: Maximum number of download retry attempts.
+        response: Already open streamed response for download_url, read
+            instead of requesting the ZIP again (optional).
+    
+    Returns:
+        Readable binary file object that decompresses the CSV as it is read.
+    
+    Raises:
+        KeyError: If the ZIP has no '{pid}.csv' member.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=_STREAM_SPOOL_MAX_SIZE, dir=spool_dir)
+    try:
+        if response is None:
+            response = retry_request(download_url, max_retries=max_retries, headers=headers, stream=True)
+        try:
+            for chunk in response.iter_content(chunk_size=DEFAULT_CHUNK_SIZE):
+                if chunk:
+                    spool.write(chunk)
+        finally:
+            response.close()
+        spool.seek(0)
+        # A ZipFile over a file object never closes it, so the member keeps
+        # the spool alive until the caller closes (or drops) the stream.
+        return zipfile.ZipFile(spool).open(f"{pid}.csv")
+    except Exception:
+        spool.close()
+        raise
+
+
 def search_statcan_tables(query: str) -> list:
     """
     Search for Statistics Canada tables by keyword.
@@ -181,6 +413,11 @@ def search_statcan_tables(query: str) -> list:
     return []
 
 
+# Deletion table for the separators allowed in table IDs
+_PID_SEPARATORS = str.maketrans('', '', ' -')
+
+
+@lru_cache(maxsize=4096)
 def _normalize_pid(table_id: str) -> str:
     """
     Normalize a table ID to PID format (8 digits, no hyphens).
@@ -199,8 +436,8 @@ def _normalize_pid(table_id: str) -> str:
     Raises:
         ValueError: If the table ID format is invalid.
     """
-    # Remove spaces and hyphens
-    pid = table_id.strip().replace(' ', '').replace('-', '')
+    # Remove spaces and hyphens in a single pass
+    pid = table_id.strip().translate(_PID_SEPARATORS)
     
     # Extract first 8 digits
     if len(pid) >= 8 and pid[:8].isdigit():
@@ -209,6 +446,7 @@ def _normalize_pid(table_id: str) -> str:
     raise ValueError(f"Invalid StatsCan table ID format: {table_id}")
 
 
+@lru_cache(maxsize=4096)
 def _build_wds_url(pid: str, language: str = "en") -> str:
     """
     Build StatsCan WDS API URL for full table CSV manifest metadata.
@@ -313,10 +551,21 @@ def _extract_manifest_title(manifest_object: Dict[str, Any], language: str, pid:
     return title or f'StatsCan Table {pid}'
 
 
-def _extract_zip(zip_path: Path, output_dir: Path, pid: str) -> List[str]:
+def _extract_zip(
+    zip_path: Path,
+    output_dir: Path,
+    pid: str,
+    file_hashes: Optional[Dict[str, str]] = None,
+    max_workers: Optional[int] = None
+) -> List[str]:
     """
     Extract ZIP file contents to output directory.
     
+    Members are streamed to disk in 1 MiB chunks, so even multi-GB CSVs are
+    decompressed with bounded memory. Each Deflate stream is independent and
+    zlib releases the GIL while inflating, so members are extracted on a
+    thread pool, each worker reading through its own ZipFile handle.
+    
     StatsCan ZIP files typically contain:
         - {PID}.csv - Main data file
         - {PID}_MetaData.csv - Metadata file
@@ -326,6 +575,11 @@ def _extract_zip(zip_path: Path, output_dir: Path, pid: str) -> List[str]:
         zip_path: Path to the ZIP file.
         output_dir: Directory to extract files to.
         pid: Product ID for file naming.
+        file_hashes: Optional dict to fill with extracted path -> provenance hash.
+            Members are hashed as they are decompressed, so writing provenance
+            metadata afterwards doesn't have to re-read every file.
+        max_workers: Maximum number of members extracted at once (default: CPU
+            count, at most 8). Use 1 to extract sequentially.
     
     Returns:
         List of extracted file paths (relative to output_dir).
@@ -333,26 +587,194 @@ def _extract_zip(zip_path: Path, output_dir: Path, pid: str) -> List[str]:
     Raises:
         zipfile.BadZipFile: If the ZIP file is invalid.
     """
-    extracted_files = []
-    
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        # Get list of files in ZIP
-        zip_contents = zip_ref.namelist()
+        # Skip directories
+        members = [info for info in zip_ref.infolist() if not info.is_dir()]
+        plain = [info for info in members if _is_plain_member_name(info.filename)]
+        for info in members:
+            if not _is_plain_member_name(info.filename):
+                # Let zipfile sanitize unusual member names
+                zip_ref.extract(info, output_dir)
         
-        # Extract all files
-        for file_name in zip_contents:
-            # Skip directories
-            if file_name.endswith('/'):
-                continue
-            
-            # Extract the file
-            zip_ref.extract(file_name, output_dir)
-            extracted_path = output_dir / file_name
-            
-            # Store relative path
-            extracted_files.append(str(extracted_path))
+        hashed = file_hashes is not None
+        workers = min(max_workers or min(os.cpu_count() or 1, 8), len(plain))
+        if workers <= 1:
+            digests = [
+                _extract_member(zip_ref, info, output_dir / info.filename, hashed=hashed)
+                for info in plain
+            ]
     
-    return extracted_files
+    if workers > 1:
+        def extract_one(info: zipfile.ZipInfo) -> Optional[str]:
+            with zipfile.ZipFile(zip_path, 'r') as worker_zip:
+                return _extract_member(worker_zip, info, output_dir / info.filename, hashed=hashed)
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            digests = list(executor.map(extract_one, plain))
+    
+    if file_hashes is not None:
+        for info, digest in zip(plain, digests):
+            file_hashes[str(output_dir / info.filename)] = digest
+    
+    # Store relative paths in archive order
+    return [str(output_dir / info.filename) for info in members]
+
+
+def _is_plain_member_name(name: str) -> bool:
+    """Return True if a ZIP member name is a plain relative path safe to write as-is."""
+    parts = name.split('/')
+    return not name.startswith('/') and '..' not in parts and '\\' not in name and ':' not in name
+
+
+def _extract_member(
+    zip_ref: zipfile.ZipFile,
+    info: zipfile.ZipInfo,
+    target: Path,
+    hashed: bool = False
+) -> Optional[str]:
+    """
+    Stream one ZIP member to target in 1 MiB chunks.
+    
+    The member is written to a temporary name next to target and only moved
+    into place once it has been read in full and its CRC-32 checked, so a
+    corrupt archive never replaces an existing copy of the file.
+    
+    Args:
+        zip_ref: Open ZIP archive.
+        info: Member to extract.
+        target: Destination file path.
+        hashed: If True, also hash the member while it is written.
+    
+    Returns:
+        Provenance hash of the member if hashed is True, otherwise None.
+    """
+    hasher = None
+    if hashed:
+        from publicdata_ca.provenance import new_hash_object
+        hasher = new_hash_object()
+    
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(f'{target.name}.part')
+    try:
+        _write_member(zip_ref, info, partial, hasher)
+        os.replace(partial, target)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    return hasher.hexdigest() if hasher is not None else None
+
+
+def _write_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, dest_path: Path, hasher: Any) -> None:
+    """Write one ZIP member's contents to dest_path, checking its CRC-32."""
+    if (
+        _fast_zlib is not None
+        and info.compress_type == zipfile.ZIP_DEFLATED
+        and not info.flag_bits & 0x1  # encrypted members need zipfile
+        and zip_ref.filename
+    ):
+        _inflate_member(zip_ref.filename, info, dest_path, hasher)
+        return
+    
+    with zip_ref.open(info) as source, open(dest_path, 'wb') as dest:
+        preallocated = _preallocate(dest, info.file_size)
+        while True:
+            chunk = source.read(DEFAULT_CHUNK_SIZE)
+            if not chunk:
+                break
+            dest.write(chunk)
+            if hasher is not None:
+                hasher.update(chunk)
+        if preallocated:
+            dest.truncate()
+
+
+def _inflate_member(zip_path: str, info: zipfile.ZipInfo, target: Path, hasher: Any) -> None:
+    """
+    Inflate a Deflate member's raw bytes with the fast zlib module.
+    
+    Only used when ISA-L is installed. Reads the compressed data directly
+    after the member's local file header and verifies the CRC-32 recorded
+    in the central directory.
+    
+    Raises:
+        zipfile.BadZipFile: If the local header or CRC-32 doesn't match.
+    """
+    decompressor = _fast_zlib.decompressobj(-15)
+    crc = 0
+    with open(zip_path, 'rb') as archive, open(target, 'wb') as dest:
+        archive.seek(_member_data_offset(archive, info))
+        preallocated = _preallocate(dest, info.file_size)
+        
+        remaining = info.compress_size
+        while remaining > 0:
+            compressed = archive.read(min(DEFAULT_CHUNK_SIZE, remaining))
+            if not compressed:
+                raise zipfile.BadZipFile(f"Truncated data for {info.filename!r}")
+            remaining -= len(compressed)
+            chunk = decompressor.decompress(compressed)
+            if chunk:
+                dest.write(chunk)
+                crc = _fast_zlib.crc32(chunk, crc)
+                if hasher is not None:
+                    hasher.update(chunk)
+        chunk = decompressor.flush()
+        if chunk:
+            dest.write(chunk)
+            crc = _fast_zlib.crc32(chunk, crc)
+            if hasher is not None:
+                hasher.update(chunk)
+        if preallocated:
+            dest.truncate()
+    
+    if crc != info.CRC:
+        raise zipfile.BadZipFile(f"Bad CRC-32 for file {info.filename!r}")
+
+
+def _preallocate(dest: IO[bytes], size: int) -> bool:
+    """
+    Reserve disk space for a large member before it is written.
+    
+    Preallocating lets the filesystem lay the file out contiguously and
+    reports a full disk before extraction starts rather than midway. Callers
+    truncate the file at the final write position afterwards, so a member
+    that turns out shorter than declared doesn't keep a zero-filled tail.
+    
+    Args:
+        dest: File opened for writing, still empty.
+        size: Uncompressed member size from the ZIP headers.
+    
+    Returns:
+        True if the space was reserved, False if the member is small or the
+        platform or filesystem doesn't support preallocation.
+    
+    Raises:
+        OSError: If there isn't enough free space (ENOSPC).
+    """
+    if size < _PREALLOCATE_MIN_SIZE or not hasattr(os, 'posix_fallocate'):
+        return False
+    try:
+        os.posix_fallocate(dest.fileno(), 0, size)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+        # tmpfs, NFS and some FUSE filesystems don't support it
+        return False
+    return True
+
+
+def _member_data_offset(archive: IO[bytes], info: zipfile.ZipInfo) -> int:
+    """
+    Return the archive offset of a member's data, just past its local header.
+    
+    Raises:
+        zipfile.BadZipFile: If the local file header is missing or malformed.
+    """
+    archive.seek(info.header_offset)
+    header = archive.read(_LOCAL_HEADER.size)
+    if len(header) != _LOCAL_HEADER.size or header[:4] != b'PK\x03\x04':
+        raise zipfile.BadZipFile(f"Bad local file header for {info.filename!r}")
+    *_, name_length, extra_length = _LOCAL_HEADER.unpack(header)
+    return info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
 
 
 def _parse_manifest(output_dir: Path, pid: str) -> Optional[Dict[str, Any]]:
@@ -369,6 +791,8 @@ def _parse_manifest(output_dir: Path, pid: str) -> Optional[Dict[str, Any]]:
     
     Returns:
         Dictionary with parsed manifest data, or None if no manifest found.
+        Metadata CSVs yield the cube title, the cube fields, and the table
+        dimensions.
     """
     # Check for JSON manifest
     manifest_json = output_dir / "manifest.json"
@@ -381,22 +805,84 @@ def _parse_manifest(output_dir: Path, pid: str) -> Optional[Dict[str, Any]]:
     
     # Check for metadata CSV
     metadata_csv = output_dir / f"{pid}_MetaData.csv"
-    if metadata_csv.exists():
-        # Metadata CSV exists but parsing it into structured data
-        # would require more complex logic. For now, just note its presence.
-        return {
-            'metadata_file': str(metadata_csv),
-            'title': f'StatsCan Table {pid}'
-        }
+    try:
+        mtime_ns = metadata_csv.stat().st_mtime_ns
+    except OSError:
+        return None
+    
+    # Copy the cached result so callers can merge their own fields into it
+    manifest = dict(_read_metadata_csv(str(metadata_csv), pid, mtime_ns))
+    manifest['dimensions'] = [dict(d) for d in manifest['dimensions']]
+    if 'cube' in manifest:
+        manifest['cube'] = dict(manifest['cube'])
+    return manifest
+
+
+# The cube and dimension blocks sit at the top of {PID}_MetaData.csv; the
+# member listing that follows can run to thousands of rows and is not read.
+_METADATA_HEADER_ROWS = 40
+
+
+@lru_cache(maxsize=256)
+def _read_metadata_csv(metadata_csv: str, pid: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse the cube and dimension blocks of a StatsCan metadata CSV.
+    
+    Only the first _METADATA_HEADER_ROWS rows are read. Results are cached
+    per (path, pid, mtime), so a rewritten file is parsed again.
+    
+    Args:
+        metadata_csv: Path to the {PID}_MetaData.csv file.
+        pid: Product ID.
+        mtime_ns: Modification time of the file, used as part of the cache key.
+    
+    Returns:
+        Dictionary with the metadata file path, cube title and fields, and a
+        list of dimensions. Callers must not mutate the cached result.
+    """
+    manifest: Dict[str, Any] = {
+        'metadata_file': metadata_csv,
+        'title': f'StatsCan Table {pid}',
+        'dimensions': [],
+    }
+    
+    try:
+        with open(metadata_csv, newline='', encoding='utf-8-sig') as f:
+            rows = list(itertools.islice(csv.reader(f), _METADATA_HEADER_ROWS))
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return manifest
+    
+    for index, row in enumerate(rows):
+        if not row:
+            continue
+        if row[0] == 'Cube Title' and index + 1 < len(rows):
+            cube = dict(zip(row, rows[index + 1]))
+            if cube.get('Cube Title'):
+                manifest['title'] = cube['Cube Title']
+            manifest['cube'] = cube
+        elif row[:2] == ['Dimension ID', 'Dimension name']:
+            for dimension in rows[index + 1:]:
+                if not dimension or not dimension[0]:
+                    break
+                manifest['dimensions'].append({
+                    'id': dimension[0],
+                    'name': dimension[1] if len(dimension) > 1 else '',
+                })
+            break
     
-    return None
+    return manifest
+
+
+# Maximum number of provenance sidecars written at once
+_METADATA_WORKERS = 4
 
 
 def _write_statcan_metadata(
     extracted_files: List[str],
     source_url: str,
     pid: str,
-    manifest_data: Optional[Dict[str, Any]]
+    manifest_data: Optional[Dict[str, Any]],
+    file_hashes: Optional[Dict[str, str]] = None
 ) -> None:
     """
     Write provenance metadata for StatsCan extracted files using unified schema.
@@ -411,6 +897,8 @@ def _write_statcan_metadata(
         source_url: Original ZIP download URL.
         pid: StatsCan Product ID.
         manifest_data: Parsed manifest data (if available).
+        file_hashes: Hashes recorded during extraction, keyed by file path.
+            Files without an entry are hashed from disk.
     """
     from publicdata_ca.provenance import write_provenance_metadata
     
@@ -424,21 +912,31 @@ def _write_statcan_metadata(
     if manifest_data and 'title' in manifest_data:
         provider_specific['title'] = manifest_data['title']
     
-    # Write metadata for each extracted file using unified schema
-    for file_path in extracted_files:
+    def write_one(file_path: str) -> None:
         try:
             write_provenance_metadata(
                 file_path,
                 source_url,
                 content_type='application/zip',  # Original download was ZIP
                 provider_name='statcan',
-                provider_specific=provider_specific
+                provider_specific=provider_specific,
+                file_hash=file_hashes.get(file_path) if file_hashes else None
             )
         except Exception:
             # Don't fail the download if metadata writing fails
             pass
+    
+    # Write metadata for each extracted file using unified schema. Files
+    # without a recorded hash are hashed here, which overlaps well on threads.
+    if len(extracted_files) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(extracted_files), _METADATA_WORKERS)) as executor:
+            list(executor.map(write_one, extracted_files))
+    else:
+        for file_path in extracted_files:
+            write_one(file_path)
 
 
+@lru_cache(maxsize=4096)
 def _format_table_number(pid: str) -> str:
     """
     Format PID as table number with hyphens.
@@ -537,7 +1035,8 @@ class StatCanProvider(Provider):
         Args:
             ref: Dataset reference with StatsCan table ID
             output_dir: Directory where files will be saved
-            **kwargs: Additional download parameters (skip_existing, max_retries, etc.)
+            **kwargs: Additional download parameters (skip_existing, max_retries,
+                use_cache, extract_workers)
         
         Returns:
             Dictionary containing downloaded files and metadata
@@ -550,6 +1049,8 @@ class StatCanProvider(Provider):
         # Extract parameters
         skip_existing = kwargs.get('skip_existing', True)
         max_retries = kwargs.get('max_retries', 3)
+        use_cache = kwargs.get('use_cache', True)
+        extract_workers = kwargs.get('extract_workers')
         language = ref.params.get('language', 'en')
         
         # Use the existing download_statcan_table function
@@ -558,7 +1059,58 @@ class StatCanProvider(Provider):
             output_dir=output_dir,
             max_retries=max_retries,
             skip_existing=skip_existing,
-            language=language
+            language=language,
+            use_cache=use_cache,
+            extract_workers=extract_workers
         )
         
         return result
+    
+    def fetch_many(
+        self,
+        refs: List[DatasetRef],
+        output_dir: str,
+        max_workers: int = DEFAULT_MAX_PARALLEL_DOWNLOADS,
+        **kwargs
+    ) -> List[Dict[str, Any]]:
+        """
+        Download several StatsCan tables concurrently.
+        
+        Each reference is fetched with fetch() on a bounded thread pool. All
+        workers share the pooled HTTP session, so the WDS lookups and ZIP
+        downloads reuse keep-alive connections to www150.statcan.gc.ca. When
+        tables run in parallel, each one extracts its ZIP members serially so
+        the thread count stays at max_workers.
+        
+        Args:
+            refs: Dataset references with StatsCan table IDs
+            output_dir: Directory where files will be saved
+            max_workers: Maximum number of tables fetched at once (default: 5,
+                as for http.download_files)
+            **kwargs: Additional download parameters passed to fetch()
+        
+        Returns:
+            List of fetch results, in the same order as refs
+        
+        Raises:
+            Exception: The first error raised by any fetch. Remaining tables are
+                allowed to finish before the error is raised.
+        
+        Example:
+            >>> refs = [DatasetRef(provider='statcan', id=pid)
+            ...         for pid in ('18100004', '14100287')]
+            >>> results = provider.fetch_many(refs, './data/raw')
+        """
+        refs = list(refs)
+        if not refs:
+            return []
+        
+        workers = max(1, min(max_workers, len(refs)))
+        if workers > 1:
+            kwargs.setdefault('extract_workers', 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self.fetch, ref, output_dir, **kwargs)
+                for ref in refs
+            ]
+            return [future.result() for future in futures]
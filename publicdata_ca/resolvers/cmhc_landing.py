@@ -6,16 +6,82 @@ CMHC data files are often accessed through landing pages where direct download U
 may change, requiring dynamic resolution.
 """
 
+import codecs
+import html
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import urljoin, urlparse
+from requests.exceptions import HTTPError
 from publicdata_ca.http import retry_request
 from publicdata_ca.url_cache import load_cached_urls, save_cached_urls
 
+try:
+    # lxml finds links with its C HTML parser; the regex scan is the fallback
+    from lxml import etree as _lxml_etree
+    from lxml.etree import LxmlError as _LxmlError
+except ImportError:
+    _lxml_etree = None  # type: ignore
+
 
 # Constants for ranking
 INVALID_ASSET_PENALTY = -1000  # Penalty for assets that fail validation
 
+# Recently fetched landing pages, so resolving links and extracting metadata
+# for the same page share one request. Entries expire after a short TTL.
+# Pages that are gone (404/410) are remembered longer, so a batch run doesn't
+# request a missing page for every dataset on it. Other errors, such as a
+# transient 5xx, are never cached.
+_PAGE_CACHE_SIZE = 64
+_PAGE_CACHE_TTL_SECONDS = 60
+_FAILED_PAGE_TTL_SECONDS = 600
+_CACHED_ERROR_STATUSES = frozenset({404, 410})
+_page_cache: "OrderedDict[str, Tuple[float, Union[Tuple[bytes, str], HTTPError]]]" = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+# Common data file extensions to look for
+_DATA_EXTENSIONS = ('csv', 'xlsx', 'xls', 'zip', 'json', 'xml', 'dat', 'txt')
+
+_DATA_EXTENSION_SET = frozenset(_DATA_EXTENSIONS)
+_DATA_SUFFIXES = tuple(f'.{ext}' for ext in _DATA_EXTENSIONS)
+
+# Attributes some pages use instead of <a href> for download links
+_DATA_URL_ATTRIBUTES = ('data-url', 'data-href', 'data-download')
+
+# Pages are scanned as raw bytes; only matched substrings are decoded, with
+# the charset the server declared for the page.
+# Bytes patterns only match ASCII, which is all HTML markup needs.
+
+# <a> tags with href attributes: <a href="..." ...>text</a>
+_LINK_PATTERN = rb'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>(.*?)</a>'
+
+# Longest extensions first, so 'xlsx' is tried before 'xls' without backtracking
+_EXTENSION_ALTERNATION = '|'.join(sorted(_DATA_EXTENSIONS, key=len, reverse=True))
+
+# Direct file URLs in data-url, data-href or data-download attributes
+_DATA_URL_PATTERN = (
+    rb'(?:data-url|data-href|data-download)=["\']([^"\']+\.(?:' +
+    _EXTENSION_ALTERNATION.encode('ascii') + rb'))["\']'
+)
+
+_DATA_URL_RE = re.compile(_DATA_URL_PATTERN, re.IGNORECASE)
+
+# Both link forms in one alternation, so a page is scanned in a single pass
+_PAGE_LINK_RE = re.compile(
+    _LINK_PATTERN + b'|' + _DATA_URL_PATTERN,
+    re.IGNORECASE | re.DOTALL
+)
+
+_TAG_STRIP_RE = re.compile(rb'<[^>]+>')
+_TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_H1_RE = re.compile(rb'<h1[^>]*>(.*?)</h1>', re.IGNORECASE | re.DOTALL)
+_META_DESC_RE = re.compile(
+    rb'<meta\s+name=["\']description["\']\s+content=["\']([^"\']+)["\']',
+    re.IGNORECASE
+)
+
 
 def _check_content_type(url: str, timeout: int = 10) -> Tuple[bool, Optional[str]]:
     """
@@ -142,27 +208,235 @@ def _rank_candidate(candidate: Dict[str, str]) -> int:
     return score
 
 
-def _get_html_content(response: Any) -> str:
-    """Return decoded HTML content for either requests responses or mocks."""
-    text_attr = getattr(response, 'text', None)
-    if isinstance(text_attr, str):
-        return text_attr
-
+def _get_html_content(response: Any) -> Tuple[bytes, str]:
+    """Return raw HTML bytes and their encoding for either requests responses or mocks."""
+    # Prefer the undecoded body; response.text would decode the whole page
     content_attr = getattr(response, 'content', None)
     if isinstance(content_attr, bytes):
-        return content_attr.decode('utf-8', errors='ignore')
+        return content_attr, _response_encoding(response)
     if isinstance(content_attr, str):
-        return content_attr
+        return content_attr.encode('utf-8'), 'utf-8'
 
     read_method = getattr(response, 'read', None)
     if callable(read_method):
         read_data = read_method()
         if isinstance(read_data, bytes):
-            return read_data.decode('utf-8', errors='ignore')
+            return read_data, _response_encoding(response)
         if isinstance(read_data, str):
-            return read_data
+            return read_data.encode('utf-8'), 'utf-8'
+
+    text_attr = getattr(response, 'text', None)
+    if isinstance(text_attr, str):
+        return text_attr.encode('utf-8'), 'utf-8'
+
+    raise TypeError('Response object does not provide HTML content')
+
+
+def _response_encoding(response: Any) -> str:
+    """Return the page's declared charset (as response.text would use it), or UTF-8."""
+    encoding = getattr(response, 'encoding', None)
+    if isinstance(encoding, str):
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+def _decode(raw: bytes, encoding: str = 'utf-8') -> str:
+    """Decode a substring matched in a landing page."""
+    return raw.decode(encoding, errors='replace')
+
+
+def _clean_text(raw: bytes, encoding: str = 'utf-8') -> str:
+    """Strip tags from matched HTML, decode it and resolve entities like &amp;."""
+    return html.unescape(_decode(_TAG_STRIP_RE.sub(b'', raw), encoding)).strip()
+
+
+def _fetch_html(url: str, use_cache: bool = True) -> Tuple[bytes, str]:
+    """
+    Fetch a landing page, reusing a recent fetch of the same URL.
+    
+    Args:
+        url: Landing page URL.
+        use_cache: If False, always fetch the page; the fresh copy still
+            replaces the cached one.
+    
+    Returns:
+        Tuple of the raw HTML bytes and the encoding to decode them with.
+    
+    Raises:
+        requests.HTTPError: If the page returned an HTTP error, or was not
+            found (404/410) within the last few minutes.
+    """
+    now = time.monotonic()
+    if use_cache:
+        with _page_cache_lock:
+            entry = _page_cache.get(url)
+            if entry is not None:
+                fetched_at, cached = entry
+                failed = isinstance(cached, HTTPError)
+                ttl = _FAILED_PAGE_TTL_SECONDS if failed else _PAGE_CACHE_TTL_SECONDS
+                if now - fetched_at < ttl:
+                    _page_cache.move_to_end(url)
+                    if failed:
+                        # A fresh exception per hit, so tracebacks don't pile up
+                        raise HTTPError(str(cached), response=cached.response)
+                    return cached
+    
+    try:
+        page = _get_html_content(retry_request(url))
+    except HTTPError as e:
+        if getattr(e.response, 'status_code', None) in _CACHED_ERROR_STATUSES:
+            _cache_page(url, now, e)
+        raise
+    
+    _cache_page(url, now, page)
+    return page
+
+
+def _cache_page(url: str, fetched_at: float, result: Union[Tuple[bytes, str], HTTPError]) -> None:
+    """Store a fetched page (or its 404/410 error), evicting the least recently used."""
+    with _page_cache_lock:
+        _page_cache[url] = (fetched_at, result)
+        _page_cache.move_to_end(url)
+        if len(_page_cache) > _PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+
+
+def clear_page_cache() -> None:
+    """Forget landing pages fetched by this process."""
+    with _page_cache_lock:
+        _page_cache.clear()
+
+
+def _absolutize(href: str, scheme: str, base_url: str, landing_url: str) -> str:
+    """
+    Resolve a link found on a landing page to an absolute URL.
+    
+    Args:
+        href: Link as written on the page.
+        scheme: Scheme of the landing page, for protocol-relative links.
+        base_url: Scheme and host of the landing page, for root-relative links.
+        landing_url: Full landing page URL, for page-relative links.
+    
+    Returns:
+        Absolute URL.
+    """
+    first = href[:1]
+    if first == '/':
+        if href.startswith('//'):
+            return f"{scheme}:{href}"
+        return f"{base_url}{href}"
+    if first == 'h' and href.startswith(('http://', 'https://')):
+        return href
+    # Relative to current page
+    return urljoin(landing_url, href)
+
+
+def _has_data_extension(href: str) -> bool:
+    """Return True if a link ends in one of the data file extensions."""
+    sep, ext = href.rpartition('.')[1:]
+    return bool(sep) and ext.lower() in _DATA_EXTENSION_SET
+
+
+def _page_links(
+    html_content: bytes, data_only: bool = False, encoding: str = 'utf-8'
+) -> List[Tuple[str, Optional[str]]]:
+    """
+    List the candidate download links on a landing page.
+    
+    Uses lxml when it is installed and falls back to a regex scan otherwise
+    (or if lxml can't parse the page).
+    
+    Args:
+        html_content: Raw landing page HTML.
+        data_only: If True, skip anchors whose href has no data file extension
+            before their link text is cleaned up.
+        encoding: Charset the page was served with (default: 'utf-8').
+    
+    Returns:
+        (href, link_text) pairs for every <a href> in document order, followed
+        by (url, None) pairs for data-url/data-href/data-download attributes.
+    """
+    if _lxml_etree is not None:
+        try:
+            return _lxml_page_links(html_content, data_only, encoding)
+        except (ValueError, _LxmlError):
+            # e.g. empty documents
+            pass
+    return _regex_page_links(html_content, data_only, encoding)
+
+
+class _LinkCollector:
+    """
+    lxml parser target that records page links as the HTML is parsed.
+    
+    No element tree is built, so memory grows with the number of links
+    rather than the size of the page.
+    """
+    
+    def __init__(self, data_only: bool = False) -> None:
+        self.data_only = data_only
+        self.anchors: List[Tuple[str, Optional[str]]] = []
+        self.data_urls: List[Tuple[str, Optional[str]]] = []
+        self._href: Optional[str] = None
+        self._text: Optional[List[str]] = None
+    
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        if tag == 'a' and self._text is None and attrib.get('href'):
+            href = attrib['href']
+            if not self.data_only or _has_data_extension(href):
+                self._href = href
+                self._text = []
+        for attribute in _DATA_URL_ATTRIBUTES:
+            href = attrib.get(attribute)
+            if href and href.lower().endswith(_DATA_SUFFIXES):
+                self.data_urls.append((href, None))
+    
+    def end(self, tag: str) -> None:
+        if tag == 'a' and self._text is not None:
+            self.anchors.append((self._href, ''.join(self._text).strip()))
+            self._text = None
+    
+    def data(self, data: str) -> None:
+        if self._text is not None:
+            self._text.append(data)
+    
+    def close(self) -> List[Tuple[str, Optional[str]]]:
+        return self.anchors + self.data_urls
 
-    raise TypeError('Response object does not provide decodable HTML content')
+
+def _lxml_page_links(
+    html_content: bytes, data_only: bool = False, encoding: str = 'utf-8'
+) -> List[Tuple[str, Optional[str]]]:
+    """Collect page links with lxml's HTML parser, without building a tree."""
+    parser = _lxml_etree.HTMLParser(target=_LinkCollector(data_only), encoding=encoding)
+    parser.feed(html_content)
+    return parser.close()
+
+
+def _regex_page_links(
+    html_content: bytes, data_only: bool = False, encoding: str = 'utf-8'
+) -> List[Tuple[str, Optional[str]]]:
+    """Collect page links with a single regular expression pass over the raw HTML."""
+    anchors: List[Tuple[str, Optional[str]]] = []
+    data_urls: List[Tuple[str, Optional[str]]] = []
+    
+    for match in _PAGE_LINK_RE.finditer(html_content):
+        href, link_text, data_url = match.groups()
+        if href is None:
+            data_urls.append((_decode(data_url, encoding), None))
+            continue
+        # The anchor match consumes any data-* attributes inside it
+        data_urls.extend((_decode(m.group(1), encoding), None) for m in _DATA_URL_RE.finditer(match.group(0)))
+        href = _decode(href, encoding)
+        if data_only and not _has_data_extension(href):
+            continue
+        # Clean link text (remove HTML tags)
+        anchors.append((href, _clean_text(link_text, encoding)))
+    
+    return anchors + data_urls
 
 
 def resolve_cmhc_landing_page(
@@ -183,7 +457,8 @@ def resolve_cmhc_landing_page(
         landing_url: URL of the CMHC landing/catalog page.
         validate: If True, validates URLs to reject HTML responses (default: True).
         max_validation_attempts: Maximum number of top candidates to validate (default: 5).
-        use_cache: If True, uses cached URLs if available and valid (default: True).
+        use_cache: If True, uses cached URLs if available and valid, and reuses a
+            landing page fetched within the last minute (default: True).
     
     Returns:
         List of dictionaries, each containing:
@@ -225,102 +500,38 @@ def resolve_cmhc_landing_page(
                 # No validation requested, use cache as-is
                 return cached_assets
     # Fetch the landing page
-    response = retry_request(landing_url)
-    html_content = _get_html_content(response)
+    html_content, encoding = _fetch_html(landing_url, use_cache=use_cache)
     
     # Parse base URL for resolving relative links
     parsed_url = urlparse(landing_url)
-    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+    scheme = parsed_url.scheme
+    base_url = f"{scheme}://{parsed_url.netloc}"
     
-    # Common data file extensions to look for
-    data_extensions = {
-        'csv', 'xlsx', 'xls', 'zip', 'json', 'xml', 'dat', 'txt'
-    }
+    # (url, title, format) for each distinct data link, in page order
+    candidates: List[Tuple[str, str, str]] = []
+    seen_urls = set()
     
-    assets = []
-    
-    # Pattern 1: Match <a> tags with href attributes
-    # Looks for: <a href="..." ...>text</a>
-    link_pattern = re.compile(
-        r'<a\s+[^>]*href=["\']([^"\']+)["\'][^>]*>(.*?)</a>',
-        re.IGNORECASE | re.DOTALL
-    )
-    
-    for match in link_pattern.finditer(html_content):
-        href = match.group(1)
-        link_text = match.group(2)
-        
-        # Clean link text (remove HTML tags)
-        link_text = re.sub(r'<[^>]+>', '', link_text).strip()
-        
+    for href, link_text in _page_links(html_content, data_only=True, encoding=encoding):
         # Check if this is a data file link
-        file_ext = None
-        for ext in data_extensions:
-            if href.lower().endswith(f'.{ext}'):
-                file_ext = ext
-                break
+        file_ext = href.rpartition('.')[2].lower()
         
-        if file_ext:
-            # Resolve to absolute URL
-            if href.startswith('http://') or href.startswith('https://'):
-                absolute_url = href
-            elif href.startswith('//'):
-                absolute_url = f"{parsed_url.scheme}:{href}"
-            elif href.startswith('/'):
-                absolute_url = f"{base_url}{href}"
-            else:
-                # Relative to current page
-                absolute_url = urljoin(landing_url, href)
-            
-            # Extract filename from URL if link text is empty or generic
-            filename = href.split('/')[-1].split('?')[0]
-            title = link_text if link_text and len(link_text) > 0 else filename
+        if file_ext in _DATA_EXTENSION_SET:
+            absolute_url = _absolutize(href, scheme, base_url, landing_url)
             
             # Avoid duplicates
-            if not any(a['url'] == absolute_url for a in assets):
-                assets.append({
-                    'url': absolute_url,
-                    'title': title,
-                    'format': file_ext
-                })
-    
-    # Pattern 2: Direct file URLs in various attributes (data-url, data-href, etc.)
-    data_url_pattern = re.compile(
-        r'(?:data-url|data-href|data-download)=["\']([^"\']+\.(?:' +
-        '|'.join(data_extensions) + r'))["\']',
-        re.IGNORECASE
-    )
-    
-    for match in data_url_pattern.finditer(html_content):
-        href = match.group(1)
-        
-        # Determine file extension
-        file_ext = href.split('.')[-1].lower()
-        if file_ext in data_extensions:
-            # Resolve to absolute URL
-            if href.startswith('http://') or href.startswith('https://'):
-                absolute_url = href
-            elif href.startswith('//'):
-                absolute_url = f"{parsed_url.scheme}:{href}"
-            elif href.startswith('/'):
-                absolute_url = f"{base_url}{href}"
-            else:
-                absolute_url = urljoin(landing_url, href)
-            
-            filename = href.split('/')[-1].split('?')[0]
-            
-            # Avoid duplicates
-            if not any(a['url'] == absolute_url for a in assets):
-                assets.append({
-                    'url': absolute_url,
-                    'title': filename,
-                    'format': file_ext
-                })
-    
-    # Rank all candidates
-    for asset in assets:
+            if absolute_url not in seen_urls:
+                seen_urls.add(absolute_url)
+                # Extract filename from URL if link text is empty or generic
+                title = link_text or href.split('/')[-1].split('?')[0]
+                candidates.append((absolute_url, title, file_ext))
+    
+    # Build and rank one asset dict per candidate
+    assets = []
+    for url, title, file_format in candidates:
+        asset = {'url': url, 'title': title, 'format': file_format}
         asset['rank'] = _rank_candidate(asset)
         asset['validated'] = False
+        assets.append(asset)
     
     # Sort by rank (descending)
     assets.sort(key=lambda x: x['rank'], reverse=True)
@@ -350,40 +561,39 @@ def resolve_cmhc_landing_page(
     return assets
 
 
-def extract_metadata_from_page(landing_url: str) -> Dict[str, str]:
+def extract_metadata_from_page(landing_url: str, use_cache: bool = True) -> Dict[str, str]:
     """
     Extract metadata (title, description) from a CMHC landing page.
     
+    A page fetched by resolve_cmhc_landing_page within the last minute is
+    reused instead of being requested again.
+    
     Args:
         landing_url: URL of the CMHC landing page.
+        use_cache: If True, reuses a recently fetched copy of the page (default: True).
     
     Returns:
         Dictionary containing page metadata:
             - title: Page title from <title> tag or <h1>
             - description: Meta description or first paragraph
     """
-    response = retry_request(landing_url)
-    html_content = _get_html_content(response)
+    html_content, encoding = _fetch_html(landing_url, use_cache=use_cache)
     
     metadata = {}
     
     # Extract title
-    title_match = re.search(r'<title[^>]*>(.*?)</title>', html_content, re.IGNORECASE | re.DOTALL)
+    title_match = _TITLE_RE.search(html_content)
     if title_match:
-        metadata['title'] = re.sub(r'<[^>]+>', '', title_match.group(1)).strip()
+        metadata['title'] = _clean_text(title_match.group(1), encoding)
     else:
         # Fallback to h1
-        h1_match = re.search(r'<h1[^>]*>(.*?)</h1>', html_content, re.IGNORECASE | re.DOTALL)
+        h1_match = _H1_RE.search(html_content)
         if h1_match:
-            metadata['title'] = re.sub(r'<[^>]+>', '', h1_match.group(1)).strip()
+            metadata['title'] = _clean_text(h1_match.group(1), encoding)
     
     # Extract description from meta tag
-    desc_match = re.search(
-        r'<meta\s+name=["\']description["\']\s+content=["\']([^"\']+)["\']',
-        html_content,
-        re.IGNORECASE
-    )
+    desc_match = _META_DESC_RE.search(html_content)
     if desc_match:
-        metadata['description'] = desc_match.group(1).strip()
+        metadata['description'] = _clean_text(desc_match.group(1), encoding)
     
     return metadata
@@ -0,0 +1,24 @@
+"""
+Shared pytest fixtures.
+"""
+
+import pytest
+
+from publicdata_ca import url_cache
+from publicdata_ca.resolvers.cmhc_landing import clear_page_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_landing_page_cache():
+    """Keep landing pages fetched (or mocked) in one test out of the next."""
+    clear_page_cache()
+    yield
+    clear_page_cache()
+
+
+@pytest.fixture(autouse=True)
+def _isolated_url_cache(tmp_path, monkeypatch):
+    """Keep resolved CMHC URLs under the test's tmp_path instead of the package tree."""
+    cache_dir = tmp_path / 'url_cache' / '.cache'
+    cache_dir.mkdir(parents=True)
+    monkeypatch.setattr(url_cache, '_get_cache_dir', lambda: cache_dir)
@@ -1,6 +1,8 @@
 """Tests for the CLI commands."""
 
 import json
+import subprocess
+import sys
 from io import StringIO
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -8,7 +10,7 @@ from unittest.mock import MagicMock, patch
 import pandas as pd
 import pytest
 
-from publicdata_ca.cli import cmd_refresh, main
+from publicdata_ca.cli import cmd_fetch, cmd_refresh, main
 
 
 @pytest.fixture
@@ -239,6 +241,122 @@ def test_main_refresh_command():
         assert mock_refresh.called
 
 
+def _fetch_args(dataset_ids, parallel=1, manifest=False, output=None, provider='statcan'):
+    """Create command line arguments for fetch."""
+    class Args:
+        dataset_id = dataset_ids
+        format = None
+    
+    args = Args()
+    args.provider = provider
+    args.parallel = parallel
+    args.manifest = manifest
+    args.output = output
+    return args
+
+
+def _fake_statcan_download(table_id, output_dir, file_format='csv', extract_workers=None):
+    return {
+        'dataset_id': f'statcan_{table_id}',
+        'provider': 'statcan',
+        'files': [f'{output_dir}/{table_id}.csv'],
+    }
+
+
+def test_cmd_fetch_multiple_datasets_in_parallel(tmp_path, capsys):
+    """Test that cmd_fetch downloads several datasets concurrently."""
+    args = _fetch_args(['18100004', '14100459', '17100148'], parallel=3,
+                       manifest=True, output=str(tmp_path))
+    
+    with patch('publicdata_ca.cli.download_statcan_table', side_effect=_fake_statcan_download) as mock_download:
+        cmd_fetch(args)
+    
+    assert mock_download.call_count == 3
+    captured = capsys.readouterr()
+    assert 'Fetching 3 datasets' in captured.out
+    assert captured.out.count('Download complete!') == 3
+    
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    # Results are reported in the order the datasets were requested
+    assert [d['dataset_id'] for d in manifest['datasets']] == [
+        'statcan_18100004', 'statcan_14100459', 'statcan_17100148'
+    ]
+
+
+def test_cmd_fetch_parallel_dedupes_ids_and_caps_workers(capsys):
+    """Test that repeated IDs are fetched once and parallel fetches extract on one thread."""
+    from publicdata_ca import cli
+    
+    args = _fetch_args(['18100004', '14100459', '18100004'], parallel=64)
+    
+    with patch('publicdata_ca.cli.download_statcan_table', side_effect=_fake_statcan_download) as mock_download, \
+         patch('publicdata_ca.cli.ThreadPoolExecutor', wraps=cli.ThreadPoolExecutor) as mock_executor:
+        cmd_fetch(args)
+    
+    assert sorted(c.kwargs['table_id'] for c in mock_download.call_args_list) == ['14100459', '18100004']
+    assert all(c.kwargs['extract_workers'] == 1 for c in mock_download.call_args_list)
+    assert mock_executor.call_args.kwargs['max_workers'] == 2
+    assert 'Fetching 2 datasets' in capsys.readouterr().out
+
+
+def test_cmd_fetch_parallel_fetches_cmhc_pages_one_at_a_time(capsys):
+    """Test that CMHC landing pages are not fetched concurrently into one directory."""
+    pages = ['https://www.cmhc-schl.gc.ca/a', 'https://www.cmhc-schl.gc.ca/b']
+    args = _fetch_args(pages, parallel=4, provider='cmhc')
+    
+    def fake_cmhc_download(landing_url, output_dir, asset_filter=None):
+        return {'dataset_id': landing_url, 'provider': 'cmhc', 'files': []}
+    
+    with patch('publicdata_ca.cli.download_cmhc_asset', side_effect=fake_cmhc_download) as mock_download, \
+         patch('publicdata_ca.cli.ThreadPoolExecutor') as mock_executor:
+        cmd_fetch(args)
+    
+    mock_executor.assert_not_called()
+    assert [c.kwargs['landing_url'] for c in mock_download.call_args_list] == pages
+
+
+def test_cmd_fetch_single_dataset_as_string(capsys):
+    """Test that cmd_fetch still accepts a single dataset ID string."""
+    args = _fetch_args('18100004')
+    
+    with patch('publicdata_ca.cli.download_statcan_table', side_effect=_fake_statcan_download):
+        cmd_fetch(args)
+    
+    captured = capsys.readouterr()
+    assert 'Fetching dataset: 18100004' in captured.out
+    assert 'statcan_18100004' in captured.out
+
+
+def test_cmd_fetch_continues_after_failure(capsys):
+    """Test that one failed dataset does not stop the others but exits non-zero."""
+    def fake_download(table_id, output_dir, file_format='csv', extract_workers=None):
+        if table_id == 'bad':
+            raise RuntimeError('Failed to download StatsCan table bad')
+        return _fake_statcan_download(table_id, output_dir, file_format)
+    
+    args = _fetch_args(['18100004', 'bad'], parallel=2)
+    
+    with patch('publicdata_ca.cli.download_statcan_table', side_effect=fake_download):
+        with pytest.raises(SystemExit) as exc_info:
+            cmd_fetch(args)
+    
+    assert exc_info.value.code == 1
+    captured = capsys.readouterr()
+    assert 'statcan_18100004' in captured.out
+    assert 'Error fetching bad' in captured.out
+
+
+def test_main_fetch_command_accepts_parallel_flag():
+    """Test that the fetch subcommand parses multiple IDs and --parallel."""
+    with patch('sys.argv', ['publicdata', 'fetch', 'statcan', '18100004', '14100459', '--parallel', '2']), \
+         patch('publicdata_ca.cli.cmd_fetch') as mock_fetch:
+        main()
+    
+    args = mock_fetch.call_args[0][0]
+    assert args.dataset_id == ['18100004', '14100459']
+    assert args.parallel == 2
+
+
 def test_cmd_profile_list(capsys):
     """Test that cmd_profile lists available profiles."""
     from publicdata_ca.cli import cmd_profile
@@ -488,3 +606,10 @@ def test_main_profile_run_command():
         # Should call run_profile
         assert mock_run.called
 
+
+def test_importing_cli_does_not_import_pandas():
+    """Test that CLI startup does not pay the pandas import cost."""
+    code = "import sys, publicdata_ca.cli; sys.exit('pandas' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code])
+    
+    assert result.returncode == 0
@@ -3,14 +3,18 @@ Tests for CMHC landing page resolver module.
 """
 
 from unittest.mock import Mock, patch
-from requests.exceptions import RequestException
+from requests.exceptions import HTTPError, RequestException
 
 import pytest
 
+from publicdata_ca.resolvers import cmhc_landing
 from publicdata_ca.resolvers.cmhc_landing import (
     resolve_cmhc_landing_page,
+    _absolutize,
     _check_content_type,
     _rank_candidate,
+    _page_links,
+    _regex_page_links,
     extract_metadata_from_page
 )
 
@@ -339,6 +343,41 @@ def test_resolve_cmhc_landing_page_resolves_absolute_urls():
         assert urls['Full URL'] == 'https://other.com/file.csv'
 
 
+@pytest.mark.parametrize('href, expected', [
+    ('https://other.com/file.csv', 'https://other.com/file.csv'),
+    ('http://other.com/file.csv', 'http://other.com/file.csv'),
+    ('//cdn.example.com/file.csv', 'https://cdn.example.com/file.csv'),
+    ('/data/file.csv', 'https://example.com/data/file.csv'),
+    ('file.csv', 'https://example.com/housing/file.csv'),
+    ('helpers/file.csv', 'https://example.com/housing/helpers/file.csv'),
+])
+def test_absolutize(href, expected):
+    """Test resolution of each link form against the landing page URL."""
+    landing_url = 'https://example.com/housing/page'
+    assert _absolutize(href, 'https', 'https://example.com', landing_url) == expected
+
+
+def test_resolve_cmhc_landing_page_detects_extensions():
+    """Test extension detection on the final path segment of each link."""
+    html_content = '''
+    <a href="/files/Rents.XLSX">Upper case</a>
+    <a href="/files.v2/readme">No extension</a>
+    <a href="/files/data.csv?download=1">Query string</a>
+    <a href="/files/archive.tar.zip">Double extension</a>
+    <a href="/files/page.html">Web page</a>
+    '''
+    
+    mock_response = make_mock_html_response(html_content)
+    
+    with patch('publicdata_ca.resolvers.cmhc_landing.retry_request', return_value=mock_response):
+        assets = resolve_cmhc_landing_page('https://example.com/page', validate=False, use_cache=False)
+    
+    assert {a['title']: a['format'] for a in assets} == {
+        'Upper case': 'xlsx',
+        'Double extension': 'zip',
+    }
+
+
 def test_resolve_cmhc_landing_page_avoids_duplicates():
     """Test that duplicate URLs are filtered out."""
     html_content = '''
@@ -386,6 +425,141 @@ def test_resolve_cmhc_landing_page_extracts_data_attributes():
         assert formats == {'csv', 'xlsx', 'zip'}
 
 
+LINKS_PAGE = b'''
+<html>
+    <body>
+        <a class="btn" href="/data/rents.xlsx"><span>Rental</span> Market</a>
+        <a href="notes.html">Notes</a>
+        <a href="starts.csv">Starts</a>
+        <div data-url="dataset1.csv">Dataset 1</div>
+        <div data-download="dataset3.zip">Dataset 3</div>
+    </body>
+</html>
+'''
+
+
+def test_page_links_lxml_matches_regex_scan():
+    """Test that the lxml link scan finds the same links as the regex fallback."""
+    pytest.importorskip('lxml')
+    
+    assert cmhc_landing._lxml_page_links(LINKS_PAGE) == [
+        ('/data/rents.xlsx', 'Rental Market'),
+        ('notes.html', 'Notes'),
+        ('starts.csv', 'Starts'),
+        ('dataset1.csv', None),
+        ('dataset3.zip', None),
+    ]
+    assert cmhc_landing._lxml_page_links(LINKS_PAGE) == _regex_page_links(LINKS_PAGE)
+
+
+def test_link_collector_records_parser_events():
+    """Test the lxml parser target against the events lxml would send it."""
+    collector = cmhc_landing._LinkCollector()
+    collector.start('div', {'data-href': 'first.xlsx'})
+    collector.end('div')
+    collector.start('a', {'href': '/data/rents.xlsx', 'class': 'btn'})
+    collector.start('span', {})
+    collector.data('Rental')
+    collector.end('span')
+    collector.data(' Market ')
+    collector.end('a')
+    collector.start('a', {'name': 'anchor'})
+    collector.data('Not a link')
+    collector.end('a')
+    collector.start('div', {'data-url': 'page.html'})
+    collector.end('div')
+    
+    assert collector.close() == [
+        ('/data/rents.xlsx', 'Rental Market'),
+        ('first.xlsx', None),
+    ]
+
+
+def test_page_links_falls_back_to_regex(monkeypatch):
+    """Test that pages lxml can't parse are scanned with the regex fallback."""
+    failing_etree = Mock()
+    failing_etree.HTMLParser.return_value.close.side_effect = ValueError('no element found')
+    monkeypatch.setattr(cmhc_landing, '_lxml_etree', failing_etree)
+    monkeypatch.setattr(cmhc_landing, '_LxmlError', ValueError, raising=False)
+    
+    assert _page_links(LINKS_PAGE) == _regex_page_links(LINKS_PAGE)
+    assert failing_etree.HTMLParser.called
+
+
+def test_regex_page_links_single_pass_keeps_nested_data_attributes():
+    """Test that the combined scan lists anchors first and keeps data-* inside anchors."""
+    html_content = b'''
+    <div data-href="first.xlsx"></div>
+    <a href="table.csv" data-download="table.zip"><span data-url="inner.json">Table</span></a>
+    <A HREF='upper.XLS'>Upper</A>
+    '''
+    
+    assert _regex_page_links(html_content) == [
+        ('table.csv', 'Table'),
+        ('upper.XLS', 'Upper'),
+        ('first.xlsx', None),
+        ('table.zip', None),
+        ('inner.json', None),
+    ]
+
+
+def test_regex_page_links_decodes_only_matched_text():
+    """Test that links are found in raw bytes and matched text is decoded as UTF-8."""
+    html_content = (
+        '<p>Données</p><a href="/fr/mises-à-jour.csv">Mises en chantier — été</a>'.encode('utf-8')
+        + b'<a href="legacy.csv">Caf\xe9</a>'
+    )
+    
+    assert _regex_page_links(html_content) == [
+        ('/fr/mises-à-jour.csv', 'Mises en chantier — été'),
+        ('legacy.csv', 'Caf\ufffd'),
+    ]
+
+
+def test_page_links_data_only_skips_other_anchors():
+    """Test that data_only drops non-data anchors before their text is cleaned up."""
+    expected = [
+        ('/data/rents.xlsx', 'Rental Market'),
+        ('starts.csv', 'Starts'),
+        ('dataset1.csv', None),
+        ('dataset3.zip', None),
+    ]
+    
+    with patch.object(cmhc_landing, '_TAG_STRIP_RE', wraps=cmhc_landing._TAG_STRIP_RE) as tag_strip:
+        assert _regex_page_links(LINKS_PAGE, data_only=True) == expected
+    assert tag_strip.sub.call_count == 2
+    
+    collector = cmhc_landing._LinkCollector(data_only=True)
+    collector.start('a', {'href': 'notes.html'})
+    collector.data('Notes')
+    collector.end('a')
+    collector.start('a', {'href': 'starts.CSV'})
+    collector.data('Starts')
+    collector.end('a')
+    assert collector.close() == [('starts.CSV', 'Starts')]
+
+
+@pytest.mark.parametrize('href,expected', [
+    ('csv', False),
+    ('/data/zip', False),
+    ('rents.xlsx', True),
+    ('archive.ZIP', True),
+])
+def test_has_data_extension_requires_a_dot(href, expected):
+    """Test that a link with no dot is not mistaken for a data file extension."""
+    assert cmhc_landing._has_data_extension(href) is expected
+
+
+@pytest.mark.parametrize('filename', ['table.xlsx', 'table.xls', 'table.JSON', 'table.csv'])
+def test_data_url_pattern_matches_whole_extension(filename):
+    """Test that the extension alternation keeps the full extension (xlsx, not xls)."""
+    extensions = cmhc_landing._EXTENSION_ALTERNATION.split('|')
+    assert extensions.index('xlsx') < extensions.index('xls')
+    
+    match = cmhc_landing._DATA_URL_RE.search(f'<div data-url="/files/{filename}"></div>'.encode())
+    assert match.group(1) == f'/files/{filename}'.encode()
+
+
 def test_resolve_cmhc_landing_page_limits_validation_attempts():
     """Test that validation is limited to top candidates."""
     html_content = '''
@@ -450,6 +624,117 @@ def test_extract_metadata_from_page():
         assert metadata['description'] == 'Access housing market statistics and data'
 
 
+def test_extract_metadata_unescapes_entities():
+    """Test that titles, descriptions and link text have HTML entities resolved."""
+    html_content = '''
+    <html>
+        <head>
+            <title>Rental Market &amp; Housing Starts</title>
+            <meta name="description" content="Starts &#8211; completions&nbsp;data">
+        </head>
+        <body><a href="rents.csv"><b>Rents</b> &lt;2024&gt;</a></body>
+    </html>
+    '''
+    
+    with patch('publicdata_ca.resolvers.cmhc_landing.retry_request', return_value=make_mock_html_response(html_content)):
+        metadata = extract_metadata_from_page('https://example.com/page')
+    
+    assert metadata == {
+        'title': 'Rental Market & Housing Starts',
+        'description': 'Starts \u2013 completions\xa0data',
+    }
+    assert _regex_page_links(html_content.encode('utf-8')) == [('rents.csv', 'Rents <2024>')]
+
+
+def test_landing_page_text_is_decoded_with_declared_charset():
+    """Test that matched text is decoded with the page's charset, including from the cache."""
+    html_content = (
+        '<html><head><title>Donn\xe9es sur le march\xe9 locatif</title></head>'
+        '<body><a href="loyers.csv">Loyers \xe9t\xe9 2024</a></body></html>'
+    ).encode('cp1252')
+    mock_response = Mock()
+    mock_response.content = html_content
+    mock_response.encoding = 'windows-1252'
+    
+    with patch('publicdata_ca.resolvers.cmhc_landing.retry_request', return_value=mock_response) as mock_request:
+        assets = resolve_cmhc_landing_page('https://example.com/fr', validate=False, use_cache=False)
+        metadata = extract_metadata_from_page('https://example.com/fr')
+    
+    assert mock_request.call_count == 1
+    assert assets[0]['title'] == 'Loyers \xe9t\xe9 2024'
+    assert metadata['title'] == 'Donn\xe9es sur le march\xe9 locatif'
+    assert _regex_page_links(html_content, encoding='cp1252') == [('loyers.csv', 'Loyers \xe9t\xe9 2024')]
+
+
+def test_resolve_and_extract_metadata_share_one_fetch(monkeypatch):
+    """Test that a landing page is fetched once for links and metadata, until it expires."""
+    html_content = '''
+    <html>
+        <head><title>Rental Market Data</title></head>
+        <body><a href="rents.csv">Rents</a></body>
+    </html>
+    '''
+    mock_response = make_mock_html_response(html_content)
+    
+    with patch('publicdata_ca.resolvers.cmhc_landing.retry_request', return_value=mock_response) as mock_request:
+        assets = resolve_cmhc_landing_page('https://example.com/page', validate=False, use_cache=False)
+        metadata = extract_metadata_from_page('https://example.com/page')
+        assert mock_request.call_count == 1
+        
+        # use_cache=False always asks the server again
+        extract_metadata_from_page('https://example.com/page', use_cache=False)
+        assert mock_request.call_count == 2
+        
+        # Expired pages are fetched again
+        monkeypatch.setattr(cmhc_landing, '_PAGE_CACHE_TTL_SECONDS', 0)
+        extract_metadata_from_page('https://example.com/page')
+        assert mock_request.call_count == 3
+    
+    assert assets[0]['title'] == 'Rents'
+    assert metadata['title'] == 'Rental Market Data'
+
+
+def test_failed_landing_page_is_not_refetched(monkeypatch):
+    """Test that a 404 for a landing page is cached and raised again without a request."""
+    error = HTTPError('404 Client Error: Not Found', response=Mock(status_code=404))
+    
+    with patch('publicdata_ca.resolvers.cmhc_landing.retry_request', side_effect=error) as mock_request:
+        raised = []
+        for _ in range(2):
+            with pytest.raises(HTTPError) as exc_info:
+                extract_metadata_from_page('https://example.com/missing')
+            raised.append(exc_info.value)
+        assert mock_request.call_count == 1
+        
+        # Each cache hit raises a new exception carrying the original response
+        assert raised[1] is not error
+        assert raised[1].response is error.response
+        
+        # use_cache=False always asks the server again
+        with pytest.raises(HTTPError):
+            extract_metadata_from_page('https://example.com/missing', use_cache=False)
+        assert mock_request.call_count == 2
+        
+        # Failures expire too, after their own (longer) TTL
+        monkeypatch.setattr(cmhc_landing, '_FAILED_PAGE_TTL_SECONDS', 0)
+        with pytest.raises(HTTPError):
+            extract_metadata_from_page('https://example.com/missing')
+        assert mock_request.call_count == 3
+
+
+@pytest.mark.parametrize('status', [500, 503, 429])
+def test_transient_landing_page_errors_are_not_cached(status):
+    """Test that server errors other than 404/410 are retried on the next call."""
+    error = HTTPError(f'{status} Server Error', response=Mock(status_code=status))
+    
+    with patch('publicdata_ca.resolvers.cmhc_landing.retry_request', side_effect=error) as mock_request:
+        for _ in range(2):
+            with pytest.raises(HTTPError):
+                extract_metadata_from_page('https://example.com/flaky')
+    
+    assert mock_request.call_count == 2
+
+
 def test_extract_metadata_fallback_to_h1():
     """Test that metadata extraction falls back to h1 if no title tag."""
     html_content = '''
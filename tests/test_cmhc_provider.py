@@ -237,3 +237,225 @@ def test_resolve_cmhc_assets_returns_list():
         assert 'url' in assets[0]
         assert 'title' in assets[0]
         assert 'format' in assets[0]
+
+
+def test_download_cmhc_asset_downloads_assets_in_parallel():
+    """Test that assets are downloaded concurrently and reported in asset order."""
+    import threading
+    
+    assets = [
+        {'url': f'https://example.com/file{i}.csv', 'title': f'File {i}', 'format': 'csv'}
+        for i in range(4)
+    ]
+    barrier = threading.Barrier(4, timeout=5)
+    
+    def fake_download(url, output_path, **kwargs):
+        # Every download must be in flight at once for the barrier to release
+        barrier.wait()
+        if url.endswith('file2.csv'):
+            raise RuntimeError('connection reset')
+        with open(output_path, 'wb') as f:
+            f.write(b'a,b\n')
+        return output_path
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch('publicdata_ca.providers.cmhc.resolve_cmhc_assets', return_value=assets), \
+             patch('publicdata_ca.providers.cmhc.download_file', side_effect=fake_download):
+            result = download_cmhc_asset('https://example.com/landing', tmpdir, max_parallel=4)
+        
+        assert [os.path.basename(f) for f in result['files']] == ['File_0.csv', 'File_1.csv', 'File_3.csv']
+        assert len(result['errors']) == 1
+        assert 'connection reset' in result['errors'][0]
+        assert result['assets'][2]['error'] == 'connection reset'
+
+
+
+def test_download_cmhc_asset_serializes_assets_with_the_same_file_name():
+    """Test that assets sanitized to one file name never download at the same time."""
+    import threading
+    import time
+    
+    assets = [
+        {'url': 'https://example.com/a.csv', 'title': 'Starts (2024)', 'format': 'csv'},
+        {'url': 'https://example.com/b.csv', 'title': 'Other', 'format': 'csv'},
+        {'url': 'https://example.com/c.csv', 'title': 'Starts 2024', 'format': 'csv'},
+    ]
+    lock = threading.Lock()
+    active = set()
+    overlaps = []
+    
+    def fake_download(url, output_path, **kwargs):
+        with lock:
+            if output_path in active:
+                overlaps.append(output_path)
+            active.add(output_path)
+        time.sleep(0.05)
+        with open(output_path, 'w') as f:
+            f.write(url)
+        with lock:
+            active.discard(output_path)
+        return output_path
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch('publicdata_ca.providers.cmhc.resolve_cmhc_assets', return_value=assets), \
+             patch('publicdata_ca.providers.cmhc.download_file', side_effect=fake_download):
+            result = download_cmhc_asset('https://example.com/landing', tmpdir, max_parallel=4)
+        
+        assert overlaps == []
+        assert [os.path.basename(f) for f in result['files']] == [
+            'Starts_2024.csv', 'Other.csv', 'Starts_2024.csv'
+        ]
+        # The later asset overwrites the earlier one, as in a sequential run
+        with open(os.path.join(tmpdir, 'Starts_2024.csv')) as f:
+            assert f.read() == 'https://example.com/c.csv'
+
+
+def test_download_cmhc_asset_sequential_when_max_parallel_is_one():
+    """Test that max_parallel=1 downloads assets one at a time."""
+    assets = [
+        {'url': f'https://example.com/file{i}.csv', 'title': f'File {i}', 'format': 'csv'}
+        for i in range(3)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch('publicdata_ca.providers.cmhc.resolve_cmhc_assets', return_value=assets), \
+             patch('publicdata_ca.providers.cmhc.ThreadPoolExecutor') as mock_executor, \
+             patch('publicdata_ca.providers.cmhc.download_file', side_effect=lambda url, path, **kw: path):
+            result = download_cmhc_asset('https://example.com/landing', tmpdir, max_parallel=1)
+        
+        mock_executor.assert_not_called()
+        assert len(result['files']) == 3
+
+
+@pytest.mark.parametrize('title', [
+    'Rental Market Report - Data Tables (2024)',
+    '../../etc/passwd',
+    'C:\\Windows\\system32',
+    'Logements mis en chantier – Québec',
+    '  spaced   out  ',
+    '...',
+])
+def test_strip_chars_matches_character_filter(title):
+    """Test that the translate-based sanitizer keeps the original filename rules."""
+    from publicdata_ca.providers.cmhc import _FORMAT_DELETE_TABLE, _TITLE_DELETE_TABLE, _strip_chars
+    
+    expected_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_'))
+    expected_format = "".join(c for c in title if c.isalnum())
+    
+    assert _strip_chars(title, _TITLE_DELETE_TABLE, ' -_') == expected_title
+    assert _strip_chars(title, _FORMAT_DELETE_TABLE, '') == expected_format
+    assert '/' not in expected_title and '.' not in expected_title
+
+
+def test_download_cmhc_asset_dedupe_hardlinks_identical_assets():
+    """Test that dedupe=True stores identical asset content once."""
+    from publicdata_ca.provenance import write_provenance_metadata
+    
+    assets = [
+        {'url': 'https://example.com/a.csv', 'title': 'Starts 2024', 'format': 'csv'},
+        {'url': 'https://example.com/b.csv', 'title': 'Housing Starts', 'format': 'csv'},
+        {'url': 'https://example.com/c.csv', 'title': 'Completions', 'format': 'csv'},
+    ]
+    bodies = {
+        'https://example.com/a.csv': b'year,starts\n2024,100\n',
+        'https://example.com/b.csv': b'year,starts\n2024,100\n',
+        'https://example.com/c.csv': b'year,completions\n2024,90\n',
+    }
+    
+    def fake_download(url, output_path, **kwargs):
+        with open(output_path, 'wb') as f:
+            f.write(bodies[url])
+        write_provenance_metadata(output_path, url)
+        return output_path
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch('publicdata_ca.providers.cmhc.resolve_cmhc_assets', return_value=assets), \
+             patch('publicdata_ca.providers.cmhc.download_file', side_effect=fake_download):
+            result = download_cmhc_asset('https://example.com/landing', tmpdir, dedupe=True)
+        
+        paths = [asset['local_path'] for asset in result['assets']]
+        assert all(
+            asset['metadata_path'] == asset['local_path'] + '.meta.json' for asset in result['assets']
+        )
+        inodes = [os.stat(path).st_ino for path in paths]
+        assert inodes[0] == inodes[1]
+        assert inodes[2] != inodes[0]
+        with open(paths[1], 'rb') as f:
+            assert f.read() == bodies['https://example.com/b.csv']
+        
+        stored = [
+            name for _, _, names in os.walk(os.path.join(tmpdir, '.cas')) for name in names
+        ]
+        assert len(stored) == 2
+
+
+def test_download_cmhc_asset_refresh_does_not_rewrite_deduped_copies():
+    """Test that refreshing one of two hardlinked assets leaves the other and the store intact."""
+    from publicdata_ca.provenance import calculate_file_hash, read_provenance_metadata
+    
+    assets = [
+        {'url': 'https://example.com/a.csv', 'title': 'Starts', 'format': 'csv'},
+        {'url': 'https://example.com/b.csv', 'title': 'Completions', 'format': 'csv'},
+    ]
+    old_body = b'year,value\n2024,100\n'
+    new_body = b'year,value\n2024,100\n2025,110\n'
+    bodies = {'https://example.com/a.csv': old_body, 'https://example.com/b.csv': old_body}
+    
+    def fake_request(url, **kwargs):
+        response = Mock(status_code=200, headers={'Content-Type': 'text/csv'})
+        response.iter_content.return_value = [bodies[url]]
+        return response
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch('publicdata_ca.providers.cmhc.resolve_cmhc_assets', return_value=assets), \
+             patch('publicdata_ca.http.retry_request', side_effect=fake_request):
+            first = download_cmhc_asset('https://example.com/landing', tmpdir, dedupe=True)
+            path_a, path_b = (asset['local_path'] for asset in first['assets'])
+            assert os.path.samefile(path_a, path_b)
+            
+            bodies['https://example.com/a.csv'] = new_body
+            download_cmhc_asset('https://example.com/landing', tmpdir, dedupe=True)
+        
+        with open(path_a, 'rb') as f:
+            assert f.read() == new_body
+        with open(path_b, 'rb') as f:
+            assert f.read() == old_body
+        assert read_provenance_metadata(path_a)['hash']['value'] == calculate_file_hash(path_a)
+        
+        old_digest = read_provenance_metadata(path_b)['hash']['value']
+        with open(os.path.join(tmpdir, '.cas', old_digest[:2], old_digest), 'rb') as f:
+            assert f.read() == old_body
+
+
+@pytest.mark.parametrize('title,file_format,expected', [
+    ('Housing Starts (2024)', 'CSV', 'Housing_Starts_2024.CSV'),
+    ('../../etc/passwd', 'csv', 'etcpasswd.csv'),
+    ('...', '.x/y', 'asset.xy'),
+    ('', '', 'asset.dat'),
+])
+def test_safe_asset_filename(title, file_format, expected):
+    """Test that asset titles and formats become traversal-safe file names."""
+    from publicdata_ca.providers.cmhc import _safe_asset_filename
+    
+    assert _safe_asset_filename(title, file_format) == expected
+
+
+def test_download_cmhc_asset_writes_cmhc_fields_with_provenance():
+    """Test that CMHC fields are passed to download_file rather than patched in later."""
+    assets = [
+        {'url': 'https://example.com/data.csv', 'title': 'Data', 'format': 'csv', 'rank': 2}
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with patch('publicdata_ca.providers.cmhc.resolve_cmhc_assets', return_value=assets), \
+             patch('publicdata_ca.providers.cmhc.download_file', side_effect=lambda url, path, **kw: path) as mock_download:
+            download_cmhc_asset('https://example.com/landing', tmpdir)
+        
+        kwargs = mock_download.call_args.kwargs
+        assert kwargs['provider_name'] == 'cmhc'
+        assert kwargs['provider_specific'] == {
+            'landing_page_url': 'https://example.com/landing',
+            'asset_title': 'Data',
+            'asset_format': 'csv',
+            'asset_rank': 2,
+        }
@@ -165,6 +165,37 @@ def test_build_dataset_catalog_with_custom_datasets():
     assert row3["tags"] is None
 
 
+def test_build_dataset_catalog_default_is_memoized():
+    """Test that the default catalog is built once and returned as independent copies."""
+    from unittest.mock import patch
+    from publicdata_ca import datasets as ds_module
+    
+    ds_module._default_dataset_catalog.cache_clear()
+    with patch.object(ds_module, "_build_catalog_frame", wraps=ds_module._build_catalog_frame) as mock_build:
+        first = build_dataset_catalog()
+        first.loc[0, "metric"] = "modified"
+        second = build_dataset_catalog()
+    
+    assert mock_build.call_count == 1
+    assert first is not second
+    assert second.loc[0, "metric"] != "modified"
+    assert len(second) == len(DEFAULT_DATASETS)
+
+
+def test_build_dataset_catalog_tags_are_independent_lists():
+    """Test that mutating catalog tags leaves DEFAULT_DATASETS and later catalogs alone."""
+    original_tags = {ds.dataset: list(ds.tags) for ds in DEFAULT_DATASETS if ds.tags is not None}
+    
+    for catalog in (build_dataset_catalog(), build_dataset_catalog(datasets=list(DEFAULT_DATASETS))):
+        for tags in catalog["tags"]:
+            if tags is not None:
+                tags.append("mutated")
+    
+    assert {ds.dataset: ds.tags for ds in DEFAULT_DATASETS if ds.tags is not None} == original_tags
+    for tags in build_dataset_catalog()["tags"]:
+        assert tags is None or "mutated" not in tags
+
+
 def test_filter_datasets_by_tags():
     """Test filtering datasets by tags using pandas."""
     catalog_df = build_dataset_catalog()
@@ -221,3 +252,69 @@ def test_datasets_tag_consistency():
     # Check that tags don't have spaces (use hyphens instead)
     for tag in all_tags:
         assert " " not in tag, f"Tag '{tag}' should not contain spaces"
+
+
+def test_dataset_table_number_follows_pid_and_stays_mutable():
+    """Test that table_number reflects the current pid and Dataset instances stay mutable."""
+    dataset = Dataset(
+        dataset="cpi",
+        provider="statcan",
+        metric="CPI",
+        pid="18100004",
+        frequency="Monthly",
+        geo_scope="Canada",
+        delivery="download_statcan_table",
+        target_file=None,
+        automation_status="automatic",
+        status_note="",
+        tags=["economics"],
+    )
+    
+    assert dataset.table_number == "18-10-0004"
+    
+    dataset.pid = "14100287"
+    assert dataset.table_number == "14-10-0287"
+    dataset.pid = None
+    assert dataset.table_number is None
+    
+    dataset.status_note = "Updated"
+    dataset.tags.append("inflation")
+    assert dataset.status_note == "Updated"
+    assert dataset.tags == ["economics", "inflation"]
+
+
+def test_default_catalog_json_matches_catalog():
+    """Test that the pre-serialized catalog mirrors build_dataset_catalog."""
+    import json
+    from publicdata_ca.datasets import default_catalog_json
+    
+    payload = default_catalog_json()
+    records = json.loads(payload)
+    catalog = build_dataset_catalog()
+    
+    assert default_catalog_json() is payload
+    assert [r["dataset"] for r in records] == catalog["dataset"].tolist()
+    assert list(records[0]) == list(catalog.columns)
+    assert records[0]["tags"] == catalog.loc[0, "tags"]
+
+
+def test_ensure_raw_destination_skips_resolve_for_paths_under_raw(tmp_path, monkeypatch):
+    """Test that resolve() only runs when a path could escape data/raw."""
+    from unittest.mock import patch
+    from publicdata_ca import datasets as ds_module
+    
+    raw_dir = tmp_path / "raw"
+    raw_dir.mkdir()
+    monkeypatch.setattr(ds_module, "RAW_DATA_DIR", raw_dir)
+    
+    with patch.object(ds_module.Path, "resolve", autospec=True, side_effect=ds_module.Path.resolve) as mock_resolve:
+        assert ds_module.ensure_raw_destination(raw_dir / "cpi.csv") == raw_dir / "cpi.csv"
+        assert ds_module.ensure_raw_destination("sub/cpi.csv") == raw_dir / "sub" / "cpi.csv"
+        assert mock_resolve.call_count == 0
+        
+        assert ds_module.ensure_raw_destination("sub/../cpi.csv") == raw_dir / "cpi.csv"
+        with pytest.raises(ValueError):
+            ds_module.ensure_raw_destination(raw_dir / ".." / "escape.csv")
+        with pytest.raises(ValueError):
+            ds_module.ensure_raw_destination(tmp_path / "elsewhere.csv")
+        assert mock_resolve.call_count == 3
@@ -2,8 +2,10 @@
 Tests for HTTP utilities module.
 """
 
+import http.server
 import os
 import tempfile
+import threading
 from unittest.mock import Mock, patch, MagicMock
 from requests.exceptions import RequestException, HTTPError as RequestsHTTPError
 import requests
@@ -13,7 +15,8 @@ import pytest
 from publicdata_ca.http import (
     get_default_headers,
     retry_request,
-    download_file
+    download_file,
+    download_files
 )
 
 
@@ -27,13 +30,85 @@ def test_get_default_headers():
     assert 'Accept-Encoding' in headers
 
 
+def test_get_default_headers_returns_independent_dicts():
+    """Test that callers can modify the returned headers without affecting later calls."""
+    headers = get_default_headers()
+    
+    assert isinstance(headers, dict)
+    headers['Accept'] = 'application/json'
+    
+    assert get_default_headers()['Accept'] == '*/*'
+    assert get_default_headers() is not get_default_headers()
+
+
+def test_accept_encoding_only_offers_decodable_encodings():
+    """Test that Brotli is only advertised when urllib3 can decode it."""
+    from publicdata_ca import http as http_module
+    
+    with patch.object(http_module, '_DECODABLE_ENCODINGS', 'gzip,deflate'):
+        assert http_module._accept_encoding() == 'gzip, deflate'
+    with patch.object(http_module, '_DECODABLE_ENCODINGS', 'gzip,deflate,br'):
+        assert http_module._accept_encoding() == 'br, gzip, deflate'
+
+
+def test_download_file_writes_decompressed_gzip_body():
+    """Test that gzip Content-Encoding is decoded before writing to disk."""
+    import gzip
+    import io
+    
+    import requests
+    from urllib3.response import HTTPResponse
+    
+    body = b'REF_DATE,VALUE\n2024-01,158.3\n' * 100
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['Content-Type'] = 'text/csv'
+    response.raw = HTTPResponse(
+        body=io.BytesIO(gzip.compress(body)),
+        headers={'Content-Encoding': 'gzip'},
+        status=200,
+        preload_content=False,
+    )
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'table.csv')
+        with patch('publicdata_ca.http.retry_request', return_value=response):
+            download_file('https://example.com/table.csv', output_path, write_metadata=False, use_cache=False)
+        
+        with open(output_path, 'rb') as f:
+            assert f.read() == body
+
+
+def test_shared_session_uses_pooled_adapters():
+    """Test that the shared session mounts pooled adapters for HTTP and HTTPS."""
+    from publicdata_ca.http import _SESSION, _POOL_CONNECTIONS, _POOL_MAXSIZE
+    
+    for prefix in ('https://', 'http://'):
+        adapter = _SESSION.get_adapter(prefix + 'www150.statcan.gc.ca')
+        assert adapter._pool_connections == _POOL_CONNECTIONS
+        assert adapter._pool_maxsize == _POOL_MAXSIZE
+
+
+def test_retry_request_reuses_shared_session():
+    """Test that consecutive requests go through the same session."""
+    mock_response = Mock()
+    mock_response.status_code = 200
+    
+    with patch('publicdata_ca.http._SESSION.get', return_value=mock_response) as mock_get:
+        retry_request('https://example.com/a.csv')
+        retry_request('https://example.com/b.csv')
+        
+        assert mock_get.call_count == 2
+        assert mock_get.call_args[1]['stream'] is False
+
+
 def test_retry_request_success_on_first_try():
     """Test successful request on first attempt."""
     mock_response = Mock()
     mock_response.content = b'test data'
     mock_response.status_code = 200
     
-    with patch('publicdata_ca.http.requests.get', return_value=mock_response) as mock_get:
+    with patch('publicdata_ca.http._SESSION.get', return_value=mock_response) as mock_get:
         response = retry_request('https://example.com/data.csv')
         
         assert response == mock_response
@@ -46,7 +121,7 @@ def test_retry_request_with_custom_headers():
     mock_response.status_code = 200
     custom_headers = {'Authorization': 'Bearer token123'}
     
-    with patch('publicdata_ca.http.requests.get', return_value=mock_response) as mock_get:
+    with patch('publicdata_ca.http._SESSION.get', return_value=mock_response) as mock_get:
         retry_request('https://example.com/data.csv', headers=custom_headers)
         
         # Verify get was called with custom headers
@@ -55,99 +130,163 @@ def test_retry_request_with_custom_headers():
         assert call_args[1]['headers'] == custom_headers
 
 
-def test_retry_request_succeeds_after_retries():
+class _FlakyHandler(http.server.BaseHTTPRequestHandler):
+    """Serve a sequence of canned (status, headers) replies, then 200 OK."""
+    
+    replies = []
+    hits = 0
+    
+    def do_GET(self):
+        type(self).hits += 1
+        status, headers = self.replies.pop(0) if self.replies else (200, {})
+        body = b'ok' if status == 200 else b''
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    """Run a local HTTP server and yield (base_url, handler class)."""
+    handler = type('Handler', (_FlakyHandler,), {'replies': [], 'hits': 0})
+    server = http.server.HTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}', handler
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_sequential_requests_reuse_keepalive_connection():
+    """Test that back-to-back requests to one host share a pooled TCP connection."""
+    ports = []
+    
+    class KeepAliveHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            ports.append(self.client_address[1])
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+        
+        def log_message(self, *args):
+            pass
+    
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    try:
+        base_url = f'http://127.0.0.1:{server.server_port}'
+        for path in ('/manifest', '/table.zip', '/metadata'):
+            retry_request(base_url + path).close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    assert len(ports) == 3
+    assert len(set(ports)) == 1
+
+
+def test_retry_request_configures_urllib3_retry():
+    """Test that retries are delegated to urllib3 on the pooled adapters."""
+    from publicdata_ca.http import _MAX_RETRY_AFTER, _SESSION
+    
+    retry = _SESSION.get_adapter('https://www150.statcan.gc.ca').max_retries
+    assert retry.total == 2
+    assert retry.backoff_factor == 1.0
+    assert retry.respect_retry_after_header is True
+    # Retry-After is honoured, but not for longer than _MAX_RETRY_AFTER
+    assert retry.parse_retry_after('5') == 5
+    assert retry.parse_retry_after('86400') == _MAX_RETRY_AFTER
+    assert retry.raise_on_status is False
+    assert {429, 500, 502, 503, 504} <= set(retry.status_forcelist)
+
+
+def test_retry_request_custom_settings_use_cached_session():
+    """Test that non-default retry settings get their own reusable session."""
+    from publicdata_ca.http import _SESSION, _get_session, _retry_session
+    
+    session = _get_session(5, 0.5)
+    retry = session.get_adapter('https://example.com').max_retries
+    
+    assert session is not _SESSION
+    assert session is _get_session(5, 0.5)
+    assert retry.total == 4
+    assert retry.backoff_factor == 0.5
+    # Arbitrary retry settings must not grow the session cache without bound
+    assert _retry_session.cache_info().maxsize is not None
+
+
+def test_retry_request_succeeds_after_retries(flaky_server):
     """Test that request succeeds after transient failures."""
-    mock_response = Mock()
-    mock_response.content = b'test data'
-    mock_response.status_code = 200
+    base_url, handler = flaky_server
+    handler.replies = [(503, {}), (502, {})]
     
-    # Fail twice, then succeed
-    with patch('publicdata_ca.http.requests.get') as mock_get, \
-         patch('publicdata_ca.http.time.sleep'):  # Mock sleep to speed up test
-        
-        mock_get.side_effect = [
-            RequestException('Connection failed'),
-            RequestException('Connection failed'),
-            mock_response
-        ]
-        
-        response = retry_request('https://example.com/data.csv', max_retries=3, retry_delay=0.1)
-        
-        assert response == mock_response
-        assert mock_get.call_count == 3
+    response = retry_request(f'{base_url}/data.csv', max_retries=3, retry_delay=0)
+    
+    assert response.status_code == 200
+    assert response.content == b'ok'
+    assert handler.hits == 3
 
 
-def test_retry_request_fails_after_max_retries():
-    """Test that request fails after exceeding max retries."""
-    with patch('publicdata_ca.http.requests.get') as mock_get, \
-         patch('publicdata_ca.http.time.sleep'):
-        
-        mock_get.side_effect = RequestException('Connection failed')
-        
-        with pytest.raises(RequestException):
-            retry_request('https://example.com/data.csv', max_retries=3, retry_delay=0.1)
-        
-        assert mock_get.call_count == 3
+def test_retry_request_fails_after_max_retries(flaky_server):
+    """Test that the final error response is raised once retries are exhausted."""
+    base_url, handler = flaky_server
+    handler.replies = [(500, {}), (500, {}), (500, {})]
+    
+    with pytest.raises(requests.HTTPError) as exc_info:
+        retry_request(f'{base_url}/data.csv', max_retries=3, retry_delay=0)
+    
+    assert exc_info.value.response.status_code == 500
+    assert handler.hits == 3
 
 
-def test_retry_request_does_not_retry_4xx_errors():
+def test_retry_request_does_not_retry_4xx_errors(flaky_server):
     """Test that 4xx client errors are not retried (except 429 and 408)."""
-    with patch('publicdata_ca.http.requests.get') as mock_get:
-        
-        # 404 should not be retried
-        mock_response = Mock()
-        mock_response.status_code = 404
-        error = requests.HTTPError("404 Client Error")
-        error.response = mock_response
-        mock_get.side_effect = error
-        
-        with pytest.raises(requests.HTTPError):
-            retry_request('https://example.com/data.csv', max_retries=3)
-        
-        # Should only try once, no retries
-        assert mock_get.call_count == 1
+    base_url, handler = flaky_server
+    handler.replies = [(404, {})]
+    
+    with pytest.raises(requests.HTTPError):
+        retry_request(f'{base_url}/data.csv', max_retries=3, retry_delay=0)
+    
+    # Should only try once, no retries
+    assert handler.hits == 1
 
 
-def test_retry_request_retries_5xx_errors():
-    """Test that 5xx server errors are retried."""
-    mock_success = Mock()
-    mock_success.status_code = 200
+def test_retry_request_retries_429_rate_limit_honouring_retry_after(flaky_server):
+    """Test that 429 rate limit errors are retried after the Retry-After delay."""
+    base_url, handler = flaky_server
+    handler.replies = [(429, {'Retry-After': '1'})]
     
-    with patch('publicdata_ca.http.requests.get') as mock_get, \
-         patch('publicdata_ca.http.time.sleep'):
-        
-        # Fail with 500, then succeed
-        mock_error = Mock()
-        mock_error.status_code = 500
-        error = requests.HTTPError("500 Server Error")
-        error.response = mock_error
-        mock_get.side_effect = [error, mock_success]
-        
-        response = retry_request('https://example.com/data.csv', max_retries=3, retry_delay=0.1)
-        
-        assert response == mock_success
-        assert mock_get.call_count == 2
+    with patch('urllib3.util.retry.time.sleep') as mock_sleep:
+        response = retry_request(f'{base_url}/data.csv', max_retries=3, retry_delay=0)
+    
+    assert response.status_code == 200
+    assert handler.hits == 2
+    mock_sleep.assert_called_with(1.0)
 
 
-def test_retry_request_retries_429_rate_limit():
-    """Test that 429 rate limit errors are retried."""
-    mock_success = Mock()
-    mock_success.status_code = 200
+def test_retry_request_closes_error_response():
+    """Test that the connection is released when an HTTP error is raised."""
+    mock_response = Mock()
+    mock_response.raise_for_status.side_effect = requests.HTTPError("404 Client Error")
     
-    with patch('publicdata_ca.http.requests.get') as mock_get, \
-         patch('publicdata_ca.http.time.sleep'):
-        
-        # Fail with 429, then succeed
-        mock_error = Mock()
-        mock_error.status_code = 429
-        error = requests.HTTPError("429 Too Many Requests")
-        error.response = mock_error
-        mock_get.side_effect = [error, mock_success]
-        
-        response = retry_request('https://example.com/data.csv', max_retries=3, retry_delay=0.1)
-        
-        assert response == mock_success
-        assert mock_get.call_count == 2
+    with patch('publicdata_ca.http._SESSION.get', return_value=mock_response):
+        with pytest.raises(requests.HTTPError):
+            retry_request('https://example.com/data.csv')
+    
+    mock_response.close.assert_called_once()
 
 
 def test_download_file_creates_file():
@@ -200,6 +339,23 @@ def test_download_file_streaming_with_chunks():
             mock_response.iter_content.assert_called_once_with(chunk_size=chunk_size)
 
 
+def test_download_file_uses_large_default_chunk_size():
+    """Test that download_file streams in 1 MiB chunks by default."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'table.csv')
+        
+        mock_response = Mock()
+        mock_response.headers = {'Content-Type': 'text/csv'}
+        mock_response.iter_content = Mock(return_value=[b'a,b\n', b'1,2\n'])
+        
+        with patch('publicdata_ca.http.retry_request', return_value=mock_response):
+            download_file('https://example.com/table.csv', output_path, write_metadata=False)
+        
+        mock_response.iter_content.assert_called_once_with(chunk_size=1024 * 1024)
+        with open(output_path, 'rb') as f:
+            assert f.read() == b'a,b\n1,2\n'
+
+
 def test_download_file_with_custom_chunk_size():
     """Test download_file with custom chunk size."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -223,6 +379,22 @@ def test_download_file_with_custom_chunk_size():
             mock_response.iter_content.assert_called_with(chunk_size=custom_chunk_size)
 
 
+def test_download_file_streams_and_closes_response():
+    """Test that download_file requests a streamed response and releases it."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'test.csv')
+        
+        mock_response = Mock()
+        mock_response.headers = {'Content-Type': 'text/csv'}
+        mock_response.iter_content = Mock(return_value=[b'a,b\n'])
+        
+        with patch('publicdata_ca.http.retry_request', return_value=mock_response) as mock_retry:
+            download_file('https://example.com/data.csv', output_path, write_metadata=False)
+            
+            assert mock_retry.call_args[1]['stream'] is True
+            mock_response.close.assert_called_once()
+
+
 def test_download_file_respects_max_retries():
     """Test that download_file passes max_retries to retry_request."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -264,7 +436,7 @@ def test_retry_request_timeout_parameter():
     mock_response = Mock()
     mock_response.status_code = 200
     
-    with patch('publicdata_ca.http.requests.get', return_value=mock_response) as mock_get:
+    with patch('publicdata_ca.http._SESSION.get', return_value=mock_response) as mock_get:
         retry_request('https://example.com/data.csv', timeout=60)
         
         # Verify get was called with timeout
@@ -274,25 +446,17 @@ def test_retry_request_timeout_parameter():
 
 def test_exponential_backoff_timing():
     """Test that retry delays follow exponential backoff."""
-    with patch('publicdata_ca.http.requests.get') as mock_get, \
-         patch('publicdata_ca.http.time.sleep') as mock_sleep:
-        
-        mock_get.side_effect = [
-            RequestException('Failed'),
-            RequestException('Failed'),
-            RequestException('Failed')
-        ]
-        
-        with pytest.raises(RequestException):
-            retry_request('https://example.com/data.csv', max_retries=3, retry_delay=1.0)
-        
-        # Should sleep twice (after first and second attempts)
-        assert mock_sleep.call_count == 2
-        
-        # Verify exponential backoff: 1.0, 2.0
-        sleep_calls = [call[0][0] for call in mock_sleep.call_args_list]
-        assert sleep_calls[0] == 1.0  # First retry delay
-        assert sleep_calls[1] == 2.0  # Second retry delay (doubled)
+    from urllib3.util.retry import RequestHistory
+    from publicdata_ca.http import _build_retry
+    
+    retry = _build_retry(max_retries=4, retry_delay=1.0)
+    delays = []
+    for _ in range(3):
+        retry = retry.new(history=retry.history + (RequestHistory('GET', '/data.csv', None, 503, None),))
+        delays.append(retry.get_backoff_time())
+    
+    # Verify exponential backoff: 1.0, 2.0, 4.0
+    assert delays == [1.0, 2.0, 4.0]
 
 
 def test_download_file_with_content_validation_accepts_csv():
@@ -365,6 +529,51 @@ def test_download_file_with_content_validation_rejects_xhtml():
             assert not os.path.exists(output_path)
 
 
+def test_download_file_with_content_validation_sniffs_mislabelled_html():
+    """Test that an HTML error page sent as octet-stream is rejected."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'data.xlsx')
+        
+        mock_response = Mock()
+        mock_response.headers = {'Content-Type': 'application/octet-stream'}
+        mock_response.iter_content = Mock(return_value=[
+            b'', b'\n  <!DOCTYPE HTML><html><body>Page not found</body></html>'
+        ])
+        
+        with patch('publicdata_ca.http.retry_request', return_value=mock_response):
+            with pytest.raises(ValueError) as exc_info:
+                download_file(
+                    'https://example.com/data.xlsx',
+                    output_path,
+                    validate_content_type=True
+                )
+        
+        assert 'HTML page' in str(exc_info.value)
+        assert not os.path.exists(output_path)
+        mock_response.close.assert_called_once()
+
+
+def test_download_file_with_content_validation_keeps_sniffed_chunk():
+    """Test that the sniffed first chunk is still written for data files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'data.csv')
+        
+        mock_response = Mock()
+        mock_response.headers = {'Content-Type': 'application/octet-stream'}
+        mock_response.iter_content = Mock(return_value=[b'REF_DATE,VALUE\n', b'2024-01,1\n'])
+        
+        with patch('publicdata_ca.http.retry_request', return_value=mock_response):
+            download_file(
+                'https://example.com/data.csv',
+                output_path,
+                validate_content_type=True,
+                write_metadata=False
+            )
+        
+        with open(output_path, 'rb') as f:
+            assert f.read() == b'REF_DATE,VALUE\n2024-01,1\n'
+
+
 def test_download_file_without_validation_accepts_html():
     """Test that download_file without validation accepts HTML (backward compatibility)."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -420,6 +629,56 @@ def test_download_file_writes_metadata():
             assert 'downloaded_at' in metadata
 
 
+def test_download_file_hashes_while_streaming():
+    """Test that the provenance hash is computed during the download, not by re-reading."""
+    import hashlib
+    import json
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'data.csv')
+        chunks = [b'REF_DATE,VALUE\n', b'2024-01,158.3\n']
+        
+        mock_response = Mock()
+        mock_response.headers = {'Content-Type': 'text/csv'}
+        mock_response.iter_content = Mock(return_value=chunks)
+        
+        with patch('publicdata_ca.http.retry_request', return_value=mock_response), \
+             patch('publicdata_ca.provenance.calculate_file_hash') as mock_hash:
+            download_file('https://example.com/data.csv', output_path, validate_content_type=True)
+        
+        mock_hash.assert_not_called()
+        with open(output_path + '.meta.json', 'r') as f:
+            metadata = json.load(f)
+        assert metadata['hash'] == {
+            'algorithm': 'blake2b',
+            'value': hashlib.blake2b(b''.join(chunks)).hexdigest(),
+        }
+
+
+def test_download_file_records_provider_metadata():
+    """Test that provider fields are written into the sidecar with the download."""
+    import json
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'data.csv')
+        
+        mock_response = Mock()
+        mock_response.headers = {'Content-Type': 'text/csv'}
+        mock_response.iter_content = Mock(return_value=[b'a,b\n'])
+        
+        with patch('publicdata_ca.http.retry_request', return_value=mock_response):
+            download_file(
+                'https://example.com/data.csv',
+                output_path,
+                provider_name='cmhc',
+                provider_specific={'asset_title': 'Data'}
+            )
+        
+        with open(output_path + '.meta.json', 'r') as f:
+            metadata = json.load(f)
+        assert metadata['provider'] == {'name': 'cmhc', 'specific': {'asset_title': 'Data'}}
+
+
 def test_download_file_metadata_disabled():
     """Test that metadata writing can be disabled."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -518,7 +777,7 @@ def test_download_file_revalidation_304_not_modified():
         )
         
         # Mock 304 Not Modified response
-        def mock_retry_with_304(url, max_retries=3, headers=None):
+        def mock_retry_with_304(url, max_retries=3, headers=None, **kwargs):
             # Check that conditional headers were sent
             assert headers is not None
             assert 'If-None-Match' in headers
@@ -543,6 +802,36 @@ def test_download_file_revalidation_304_not_modified():
                 assert f.read() == original_data
 
 
+def test_download_file_revalidation_304_response_keeps_file():
+    """Test that a plain 304 response (not raised as an error) keeps the cached file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, 'data.csv')
+        original_data = b'original,data\n1,2\n'
+        
+        with open(output_path, 'wb') as f:
+            f.write(original_data)
+        
+        from publicdata_ca.http_cache import save_cache_metadata
+        save_cache_metadata(output_path, etag='"abc123"', url='https://example.com/data.csv')
+        
+        # requests does not raise for 304, so retry_request returns the response
+        mock_response = Mock()
+        mock_response.status_code = 304
+        mock_response.headers = {}
+        mock_response.iter_content = Mock(return_value=[])
+        
+        with patch('publicdata_ca.http.retry_request', return_value=mock_response) as mock_retry:
+            result = download_file('https://example.com/data.csv', output_path, write_metadata=False)
+        
+        assert result == output_path
+        assert mock_retry.call_args[1]['headers']['If-None-Match'] == '"abc123"'
+        mock_response.iter_content.assert_not_called()
+        mock_response.close.assert_called_once()
+        
+        with open(output_path, 'rb') as f:
+            assert f.read() == original_data
+
+
 def test_download_file_revalidation_200_file_changed():
     """Test that download_file downloads when server returns 200 (file changed)."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -569,7 +858,7 @@ def test_download_file_revalidation_200_file_changed():
         }
         mock_response.iter_content = Mock(return_value=[new_data])
         
-        def mock_retry_with_conditional(url, max_retries=3, headers=None):
+        def mock_retry_with_conditional(url, max_retries=3, headers=None, **kwargs):
             # Verify conditional headers were sent
             assert 'If-None-Match' in headers
             return mock_response
@@ -602,7 +891,7 @@ def test_download_file_first_download_with_cache():
         }
         mock_response.iter_content = Mock(return_value=[test_data])
         
-        def mock_retry_first_download(url, max_retries=3, headers=None):
+        def mock_retry_first_download(url, max_retries=3, headers=None, **kwargs):
             # Should not have conditional headers on first download
             assert 'If-None-Match' not in headers
             assert 'If-Modified-Since' not in headers
@@ -695,3 +984,41 @@ def test_download_file_no_cache_headers_no_metadata():
             # Verify no cache metadata was created (no headers to cache)
             cache_file = output_path + '.http_cache.json'
             assert not os.path.exists(cache_file)
+
+
+def test_download_files_downloads_all_pairs_in_order():
+    """Test that download_files downloads every pair and preserves input order."""
+    pairs = [(f'https://example.com/{i}.csv', f'/tmp/out_{i}.csv') for i in range(6)]
+    
+    with patch('publicdata_ca.http.download_file', side_effect=lambda url, path, **kw: path) as mock_download:
+        result = download_files(pairs, max_workers=3, max_retries=2, write_metadata=False)
+    
+    assert result == [path for _, path in pairs]
+    assert mock_download.call_count == 6
+    for call in mock_download.call_args_list:
+        assert call[1] == {'max_retries': 2, 'write_metadata': False}
+
+
+def test_download_files_empty():
+    """Test that download_files with no pairs does nothing."""
+    with patch('publicdata_ca.http.download_file') as mock_download:
+        assert download_files([]) == []
+        mock_download.assert_not_called()
+
+
+def test_download_files_raises_after_all_complete():
+    """Test that a failed download is raised once the other downloads finish."""
+    pairs = [('https://example.com/ok.csv', 'ok.csv'), ('https://example.com/bad.csv', 'bad.csv')]
+    completed = []
+    
+    def fake_download(url, path, **kwargs):
+        if 'bad' in url:
+            raise RequestException('Connection failed')
+        completed.append(path)
+        return path
+    
+    with patch('publicdata_ca.http.download_file', side_effect=fake_download):
+        with pytest.raises(RequestException):
+            download_files(pairs, max_workers=2)
+    
+    assert completed == ['ok.csv']
@@ -244,6 +244,28 @@ def test_get_conditional_headers_with_both():
         assert headers['If-Modified-Since'] == 'Wed, 21 Oct 2015 07:28:00 GMT'
 
 
+def test_get_conditional_headers_for_different_url():
+    """Test that validators cached for one URL are not sent to another URL."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        file_path = os.path.join(tmpdir, 'test_file.csv')
+        
+        with open(file_path, 'w') as f:
+            f.write('test data')
+        
+        save_cache_metadata(
+            file_path,
+            etag='"abc123"',
+            last_modified='Wed, 21 Oct 2015 07:28:00 GMT',
+            url='https://example.com/data.csv'
+        )
+        
+        assert get_conditional_headers(file_path, url='https://example.com/other.csv') == {}
+        assert get_conditional_headers(file_path, url='https://example.com/data.csv') == {
+            'If-None-Match': '"abc123"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        }
+
+
 def test_get_conditional_headers_no_cache():
     """Test getting conditional headers when no cache exists."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -1,6 +1,6 @@
 import pandas as pd
 
-from publicdata_ca.manifest import build_manifest_file, build_run_manifest, load_manifest, validate_manifest
+from publicdata_ca.manifest import _index_dir, build_manifest_file, build_run_manifest, load_manifest, validate_manifest
 
 
 def test_build_and_validate_manifest(tmp_path):
@@ -76,3 +76,151 @@ def test_build_run_manifest_dataframe(monkeypatch, tmp_path):
     assert manifest_df.loc[manifest_df["dataset"] == "cmhc_asset", "action"].item().startswith(
         "Attempt scrape_cmhc_direct_url"
     )
+
+
+def test_build_manifest_file_matches_stdlib_json(monkeypatch, tmp_path):
+    import json
+
+    from publicdata_ca import manifest as manifest_module
+
+    datasets = [
+        {
+            "dataset_id": "cmhc_loyers",
+            "provider": "cmhc",
+            "files": ["données.xlsx"],
+            "title": "Marché locatif",
+        }
+    ]
+
+    fast_path = build_manifest_file(str(tmp_path / "fast"), datasets)
+    monkeypatch.setattr(manifest_module, "orjson", None)
+    slow_path = build_manifest_file(str(tmp_path / "slow"), datasets)
+
+    fast = load_manifest(fast_path)
+    slow = load_manifest(slow_path)
+    assert fast["datasets"] == slow["datasets"] == datasets
+    with open(fast_path, encoding="utf-8") as f:
+        assert json.load(f)["datasets"][0]["title"] == "Marché locatif"
+
+
+def test_validate_manifest_reports_missing_files(tmp_path, capsys):
+    output_dir = tmp_path / "artifacts"
+    (output_dir / "nested").mkdir(parents=True)
+    (output_dir / "nested" / "present.csv").write_text("value\n1\n", encoding="utf-8")
+    outside = tmp_path / "outside.csv"
+    outside.write_text("value\n2\n", encoding="utf-8")
+
+    datasets = [
+        {
+            "dataset_id": "statcan_table",
+            "provider": "statcan",
+            "files": ["nested/present.csv", "./nested/../nested/present.csv", str(outside)],
+        },
+        {
+            "dataset_id": "cmhc_asset",
+            "provider": "cmhc",
+            "files": ["nested/absent.csv", "gone.xlsx"],
+        },
+    ]
+
+    manifest_path = build_manifest_file(str(output_dir), datasets)
+    assert validate_manifest(manifest_path) is False
+
+    output = capsys.readouterr().out
+    assert "absent.csv" in output
+    assert "gone.xlsx" in output
+    assert "present.csv" not in output
+    assert "outside.csv" not in output
+
+
+def test_build_manifest_file_uses_supplied_timestamp(tmp_path):
+    created_at = "2024-01-15T12:00:00Z"
+
+    first = build_manifest_file(str(tmp_path / "a"), [], created_at=created_at)
+    second = build_manifest_file(str(tmp_path / "b"), [], created_at=created_at)
+
+    assert load_manifest(first)["created_at"] == created_at
+    assert load_manifest(second)["created_at"] == created_at
+
+
+def test_build_manifest_file_default_timestamp_is_utc(tmp_path):
+    manifest = load_manifest(build_manifest_file(str(tmp_path), []))
+
+    assert manifest["created_at"].endswith("Z")
+    assert "T" in manifest["created_at"]
+
+
+def test_validate_manifest_with_thread_pool(tmp_path, capsys):
+    output_dir = tmp_path / "artifacts"
+    output_dir.mkdir()
+    (output_dir / "present.csv").write_text("value\n1\n", encoding="utf-8")
+
+    datasets = [
+        {"dataset_id": "a", "provider": "statcan", "files": ["present.csv"]},
+        {"dataset_id": "b", "provider": "statcan", "files": ["absent.csv"]},
+    ]
+    manifest_path = build_manifest_file(str(output_dir), datasets)
+
+    assert validate_manifest(manifest_path, max_workers=4) is False
+    assert "absent.csv" in capsys.readouterr().out
+
+    datasets.pop()
+    manifest_path = build_manifest_file(str(output_dir), datasets)
+    assert validate_manifest(manifest_path, max_workers=4) is True
+
+
+def test_build_manifest_file_fsyncs_only_when_durable(tmp_path):
+    from unittest.mock import patch
+
+    with patch("publicdata_ca.manifest.os.fsync") as mock_fsync:
+        build_manifest_file(str(tmp_path / "fast"), [])
+        mock_fsync.assert_not_called()
+
+        manifest_path = build_manifest_file(str(tmp_path / "durable"), [], durable=True)
+        mock_fsync.assert_called_once()
+
+    assert load_manifest(manifest_path)["total_datasets"] == 0
+
+
+def test_validate_manifest_index_follows_symlinks_and_lists_directories(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr("publicdata_ca.manifest._INDEX_MIN_FILES", 0)
+    output_dir = tmp_path / "artifacts"
+    (output_dir / "tables").mkdir(parents=True)
+    (output_dir / "tables" / "present.csv").write_text("value\n1\n", encoding="utf-8")
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    (shared / "linked.csv").write_text("value\n2\n", encoding="utf-8")
+    (output_dir / "shared").symlink_to(shared, target_is_directory=True)
+    # A symlink loop must not hang the scan
+    (output_dir / "tables" / "loop").symlink_to(output_dir, target_is_directory=True)
+
+    datasets = [
+        {
+            "dataset_id": "statcan_table",
+            "provider": "statcan",
+            "files": ["tables/present.csv", "tables", "shared/linked.csv", "tables/loop/tables/present.csv"],
+        },
+    ]
+    manifest_path = build_manifest_file(str(output_dir), datasets)
+    assert {"tables", "shared/linked.csv"} <= _index_dir(output_dir)
+    assert validate_manifest(manifest_path) is True
+
+    datasets[0]["files"].append("shared/absent.csv")
+    manifest_path = build_manifest_file(str(output_dir), datasets)
+    assert validate_manifest(manifest_path) is False
+    assert capsys.readouterr().out.strip().splitlines()[1:] == [str(output_dir / "shared/absent.csv")]
+
+
+def test_validate_manifest_small_manifest_skips_directory_scan(tmp_path, monkeypatch):
+    output_dir = tmp_path / "artifacts"
+    output_dir.mkdir()
+    (output_dir / "present.csv").write_text("value\n1\n", encoding="utf-8")
+    manifest_path = build_manifest_file(
+        str(output_dir), [{"dataset_id": "a", "provider": "statcan", "files": ["present.csv"]}]
+    )
+
+    def fail_walk(*args, **kwargs):
+        raise AssertionError("small manifests should not scan the directory")
+
+    monkeypatch.setattr("publicdata_ca.manifest.os.walk", fail_walk)
+    assert validate_manifest(manifest_path) is True
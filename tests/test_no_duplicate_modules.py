@@ -0,0 +1,20 @@
+"""Guard against two source files resolving to the same module name."""
+
+from collections import defaultdict
+from pathlib import Path
+
+import publicdata_ca
+
+
+def test_package_has_no_duplicate_modules():
+    """A foo.py next to a foo/ package would silently shadow one of them."""
+    package_root = Path(publicdata_ca.__file__).parent
+    modules = defaultdict(list)
+
+    for path in package_root.rglob("*.py"):
+        relative = path.relative_to(package_root.parent).with_suffix("")
+        parts = relative.parts[:-1] if relative.name == "__init__" else relative.parts
+        modules[".".join(parts)].append(path)
+
+    duplicates = {name: paths for name, paths in modules.items() if len(paths) > 1}
+    assert duplicates == {}
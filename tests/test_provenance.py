@@ -11,6 +11,7 @@ import pytest
 
 from publicdata_ca.provenance import (
     calculate_file_hash,
+    hash_files_batch,
     write_provenance_metadata,
     read_provenance_metadata,
     verify_file_integrity
@@ -35,6 +36,137 @@ def test_calculate_file_hash():
         assert all(c in '0123456789abcdef' for c in hash_value)
 
 
+@pytest.mark.parametrize('has_file_digest', [True, False])
+def test_calculate_file_hash_matches_hashlib(monkeypatch, has_file_digest):
+    """Test that both the file_digest and chunked fallback paths agree with hashlib."""
+    import hashlib
+    
+    if not has_file_digest:
+        monkeypatch.delattr(hashlib, 'file_digest', raising=False)
+    elif not hasattr(hashlib, 'file_digest'):
+        pytest.skip('hashlib.file_digest requires Python 3.11+')
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.bin')
+        content = os.urandom(50000)
+        
+        with open(test_file, 'wb') as f:
+            f.write(content)
+        
+        for algorithm in ('sha256', 'md5'):
+            expected = hashlib.new(algorithm, content).hexdigest()
+            assert calculate_file_hash(test_file, algorithm=algorithm) == expected
+
+
+def test_calculate_file_hash_memory_maps_large_files():
+    """Test that files above the mmap threshold hash identically via mmap."""
+    import hashlib
+    from unittest.mock import patch
+    
+    from publicdata_ca import provenance
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'large.bin')
+        content = os.urandom(provenance._MMAP_MIN_SIZE + 12345)
+        
+        with open(test_file, 'wb') as f:
+            f.write(content)
+        
+        with patch('publicdata_ca.provenance.mmap.mmap', wraps=provenance.mmap.mmap) as mock_mmap:
+            hash_value = calculate_file_hash(test_file, algorithm='sha256')
+        
+        mock_mmap.assert_called_once()
+        assert hash_value == hashlib.sha256(content).hexdigest()
+
+
+def test_calculate_file_hash_blake3_requires_package(monkeypatch):
+    """Test that blake3 gives a clear error when the package is missing."""
+    from publicdata_ca import provenance
+    
+    monkeypatch.setattr(provenance, 'blake3', None)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'test data')
+        
+        with pytest.raises(ValueError, match='blake3'):
+            calculate_file_hash(test_file, algorithm='blake3')
+
+
+def test_verify_file_integrity_legacy_sha256_sidecar():
+    """Test that sidecars written with SHA-256 still verify after the default change."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'test data')
+        
+        write_provenance_metadata(test_file, 'https://example.com/data.csv', hash_algorithm='sha256')
+        
+        assert read_provenance_metadata(test_file)['hash']['algorithm'] == 'sha256'
+        assert verify_file_integrity(test_file) is True
+
+
+def test_calculate_file_hash_warns_once_without_hardware_sha(monkeypatch):
+    """Test that SHA-256 on a CPU without SHA extensions warns once per process."""
+    import warnings
+    
+    from publicdata_ca import provenance
+    
+    monkeypatch.setattr(provenance, '_has_hardware_sha', lambda: False)
+    monkeypatch.setattr(provenance, '_warned_software_sha', False)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'test data')
+        
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            calculate_file_hash(test_file, algorithm='blake2b')
+            calculate_file_hash(test_file, algorithm='sha256')
+            calculate_file_hash(test_file, algorithm='sha256')
+        
+        assert len(caught) == 1
+        assert issubclass(caught[0].category, RuntimeWarning)
+        assert 'blake2b' in str(caught[0].message)
+
+
+def test_calculate_file_hash_no_warning_with_hardware_sha(monkeypatch):
+    """Test that no warning is issued when SHA extensions are present or unknown."""
+    import warnings
+    
+    from publicdata_ca import provenance
+    
+    monkeypatch.setattr(provenance, '_warned_software_sha', False)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'test data')
+        
+        for probe in (True, None):
+            monkeypatch.setattr(provenance, '_has_hardware_sha', lambda probe=probe: probe)
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                calculate_file_hash(test_file, algorithm='sha256')
+
+
+@pytest.mark.parametrize('max_workers', [None, 1])
+def test_hash_files_batch_matches_individual_hashes(max_workers):
+    """Test that batch hashing returns per-file digests in input order."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i, size in enumerate([0, 10, 2 * 1024 * 1024]):
+            path = os.path.join(tmpdir, f'file{i}.bin')
+            with open(path, 'wb') as f:
+                f.write(bytes([i]) * size)
+            paths.append(path)
+        
+        digests = hash_files_batch(paths, algorithm='sha256', max_workers=max_workers)
+        
+        assert digests == [calculate_file_hash(path, algorithm='sha256') for path in paths]
+        assert hash_files_batch([]) == []
+
+
 def test_calculate_file_hash_md5():
     """Test hash calculation with MD5 algorithm."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -82,7 +214,7 @@ def test_write_provenance_metadata_basic():
         assert 'file_size_bytes' in metadata
         assert metadata['file_size_bytes'] == len(test_content)
         assert 'hash' in metadata
-        assert metadata['hash']['algorithm'] == 'sha256'
+        assert metadata['hash']['algorithm'] == 'blake2b'
         assert 'value' in metadata['hash']
 
 
@@ -118,6 +250,58 @@ def test_write_provenance_metadata_with_additional_metadata():
         assert metadata['provider']['specific']['table_number'] == '18-10-0004'
 
 
+def test_write_provenance_metadata_uses_precomputed_hash():
+    """Test that a precomputed hash is recorded without re-reading the file."""
+    from unittest.mock import patch
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        
+        with open(test_file, 'wb') as f:
+            f.write(b'test data')
+        
+        expected = calculate_file_hash(test_file)
+        with patch('publicdata_ca.provenance.calculate_file_hash') as mock_hash:
+            meta_file = write_provenance_metadata(
+                test_file,
+                'https://example.com/data.csv',
+                file_hash=expected
+            )
+        
+        mock_hash.assert_not_called()
+        with open(meta_file, 'r') as f:
+            metadata = json.load(f)
+        assert metadata['hash'] == {'algorithm': 'blake2b', 'value': expected}
+        assert verify_file_integrity(test_file) is True
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_write_provenance_metadata_serializers_agree(monkeypatch, use_orjson):
+    """Test that orjson and stdlib json write the same indented UTF-8 sidecar."""
+    import publicdata_ca.provenance as provenance_module
+    
+    if use_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(provenance_module, 'orjson', None)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'test data')
+        
+        meta_file = write_provenance_metadata(
+            test_file,
+            'https://example.com/data.csv',
+            additional_metadata={'title': 'Marché locatif'}
+        )
+        
+        text = Path(meta_file).read_text(encoding='utf-8')
+        assert '\n  "schema_version": "1.0"' in text
+        assert 'Marché locatif' in text
+        assert json.loads(text)['provider']['specific']['title'] == 'Marché locatif'
+
+
 def test_write_provenance_metadata_file_not_found():
     """Test that writing metadata for non-existent file raises error."""
     with pytest.raises(FileNotFoundError):
@@ -163,6 +347,25 @@ def test_read_provenance_metadata_direct():
         assert metadata['file'] == 'data.csv'
 
 
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_read_provenance_metadata_invalid_json(monkeypatch, use_orjson):
+    """Test that both parsers raise json.JSONDecodeError for a corrupt sidecar."""
+    import publicdata_ca.provenance as provenance_module
+    
+    if use_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(provenance_module, 'orjson', None)
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        meta_file = os.path.join(tmpdir, 'data.csv.meta.json')
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+        
+        with pytest.raises(json.JSONDecodeError):
+            read_provenance_metadata(meta_file)
+
+
 def test_read_provenance_metadata_not_found():
     """Test that reading missing metadata raises error."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -210,6 +413,90 @@ def test_verify_file_integrity_failure():
         assert verify_file_integrity(test_file) is False
 
 
+def test_verify_file_integrity_non_strict_uses_stat():
+    """Test that strict=False skips hashing when size and mtime are unchanged."""
+    from unittest.mock import patch
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'original content')
+        write_provenance_metadata(test_file, 'https://example.com/data.csv')
+        
+        with patch('publicdata_ca.provenance.calculate_file_hash') as mock_hash:
+            assert verify_file_integrity(test_file, strict=False) is True
+        mock_hash.assert_not_called()
+        
+        # Same size, new mtime: falls back to hashing
+        with open(test_file, 'wb') as f:
+            f.write(b'modified content')
+        os.utime(test_file, ns=(0, 0))
+        assert verify_file_integrity(test_file, strict=False) is False
+        
+        # Different size is rejected without hashing
+        with open(test_file, 'wb') as f:
+            f.write(b'short')
+        with patch('publicdata_ca.provenance.calculate_file_hash') as mock_hash:
+            assert verify_file_integrity(test_file, strict=False) is False
+        mock_hash.assert_not_called()
+
+
+def test_verify_file_integrity_non_strict_reuses_process_hash():
+    """Test that strict=False reuses a hash this process computed for the same file."""
+    from unittest.mock import patch
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'content')
+        meta_file = write_provenance_metadata(test_file, 'https://example.com/data.csv')
+        
+        # Legacy sidecar without mtime: only the in-process cache can skip hashing
+        metadata = read_provenance_metadata(meta_file)
+        del metadata['file_mtime_ns']
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        
+        with patch('publicdata_ca.provenance._hash_open_file') as mock_hash:
+            assert verify_file_integrity(test_file, strict=False) is True
+        mock_hash.assert_not_called()
+        
+        # Strict verification always re-hashes
+        with patch('publicdata_ca.provenance._hash_open_file', return_value='0') as mock_hash:
+            assert verify_file_integrity(test_file) is False
+        mock_hash.assert_called_once()
+
+
+def test_verify_file_integrity_refresh_stat_hashes_once():
+    """Test that refresh_stat records the mtime so a touched file is hashed only once."""
+    from unittest.mock import patch
+    from publicdata_ca import provenance
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_file = os.path.join(tmpdir, 'data.csv')
+        with open(test_file, 'wb') as f:
+            f.write(b'content')
+        meta_file = write_provenance_metadata(test_file, 'https://example.com/data.csv')
+
+        # Legacy sidecar and a touched file: the first check has to hash
+        metadata = read_provenance_metadata(meta_file)
+        del metadata['file_mtime_ns']
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(metadata, f)
+        os.utime(test_file, ns=(10**18, 10**18))
+        with provenance._hash_cache_lock:
+            provenance._hash_cache.clear()
+
+        assert verify_file_integrity(test_file, strict=False, refresh_stat=True) is True
+        assert read_provenance_metadata(meta_file)['file_mtime_ns'] == 10**18
+
+        with provenance._hash_cache_lock:
+            provenance._hash_cache.clear()
+        with patch('publicdata_ca.provenance.calculate_file_hash') as mock_hash:
+            assert verify_file_integrity(test_file, strict=False, refresh_stat=True) is True
+        mock_hash.assert_not_called()
+
+
 def test_verify_file_integrity_no_hash():
     """Test integrity verification raises error when hash is missing."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -267,9 +554,9 @@ def test_large_file_hash():
         # Calculate hash
         hash_value = calculate_file_hash(test_file)
         
-        # Verify it's a valid hash
+        # Verify it's a valid hash (BLAKE2b produces 128 hex chars)
         assert isinstance(hash_value, str)
-        assert len(hash_value) == 64
+        assert len(hash_value) == 128
 
 
 def test_metadata_timestamp_format():
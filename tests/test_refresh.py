@@ -136,8 +136,10 @@ def test_refresh_datasets_force_download_statcan(mock_datasets, tmp_path):
         
         result = refresh_datasets(datasets=[statcan_dataset], force_download=True)
         
-        # Should download even though file exists
+        # Should download even though file exists, without revalidating
         mock_download.assert_called_once()
+        assert mock_download.call_args.kwargs["skip_existing"] is False
+        assert mock_download.call_args.kwargs["use_cache"] is False
         assert result.iloc[0]["result"] == "downloaded"
 
 
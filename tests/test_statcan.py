@@ -3,10 +3,14 @@ Tests for Statistics Canada (StatsCan) provider module.
 """
 
 import copy
+import errno
+import io
 import json
 import os
 import tempfile
 import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock, ANY
 
@@ -46,6 +50,24 @@ def mock_wds_manifest():
         yield mock_manifest
 
 
+@pytest.fixture(scope='session')
+def mock_zip_bytes():
+    """Provide a StatsCan-style table ZIP (data and metadata CSVs), built once per session."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('18100004.csv', 'data,values\n1,2\n')
+        zf.writestr('18100004_MetaData.csv', 'meta,data\na,b\n')
+    return buffer.getvalue()
+
+
+def _mock_download(zip_content):
+    """Return a download_file stand-in that writes zip_content to the requested path."""
+    def download(url, path, max_retries, write_metadata=True, headers=None):
+        Path(path).write_bytes(zip_content)
+        return path
+    return download
+
+
 def test_normalize_pid_already_normalized():
     """Test normalizing a PID that's already in correct format."""
     assert _normalize_pid('18100004') == '18100004'
@@ -80,6 +102,17 @@ def test_normalize_pid_invalid_format():
         _normalize_pid('abc12345')  # Contains letters
 
 
+def test_normalize_pid_is_memoized():
+    """Test that repeated PID normalization is served from the cache."""
+    _normalize_pid.cache_clear()
+    
+    assert _normalize_pid('14-10-0287-01') == '14100287'
+    assert _normalize_pid('14-10-0287-01') == '14100287'
+    
+    info = _normalize_pid.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+
+
 def test_build_wds_url_english():
     """Test building WDS URL for English."""
     url = _build_wds_url('18100004', 'en')
@@ -92,413 +125,726 @@ def test_build_wds_url_french():
     assert url == 'https://www150.statcan.gc.ca/t1/wds/rest/getFullTableDownloadCSV/18100004/fr'
 
 
-def test_extract_zip():
+def test_extract_zip(tmp_path):
     """Test extracting a ZIP file with CSV and metadata."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create a test ZIP file
-        zip_path = tmpdir / 'test.zip'
-        with zipfile.ZipFile(zip_path, 'w') as zf:
-            zf.writestr('18100004.csv', 'col1,col2\nval1,val2\n')
-            zf.writestr('18100004_MetaData.csv', 'metadata_col\nmetadata_val\n')
-        
-        # Extract the ZIP
-        output_dir = tmpdir / 'output'
-        output_dir.mkdir()
-        
-        extracted_files = _extract_zip(zip_path, output_dir, '18100004')
-        
-        # Verify files were extracted
-        assert len(extracted_files) == 2
-        assert (output_dir / '18100004.csv').exists()
-        assert (output_dir / '18100004_MetaData.csv').exists()
-        
-        # Verify content
-        with open(output_dir / '18100004.csv', 'r') as f:
-            content = f.read()
-            assert 'col1,col2' in content
-
-
-def test_extract_zip_skips_directories():
+    # Create a test ZIP file
+    zip_path = tmp_path / 'test.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        zf.writestr('18100004.csv', 'col1,col2\nval1,val2\n')
+        zf.writestr('18100004_MetaData.csv', 'metadata_col\nmetadata_val\n')
+    
+    # Extract the ZIP
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    extracted_files = _extract_zip(zip_path, output_dir, '18100004')
+    
+    # Verify files were extracted
+    assert len(extracted_files) == 2
+    assert (output_dir / '18100004.csv').exists()
+    assert (output_dir / '18100004_MetaData.csv').exists()
+    
+    # Verify content
+    assert 'col1,col2' in (output_dir / '18100004.csv').read_text()
+
+
+def test_extract_zip_skips_directories(tmp_path):
     """Test that directory entries in ZIP are skipped."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create a test ZIP file with directory entries
-        zip_path = tmpdir / 'test.zip'
-        with zipfile.ZipFile(zip_path, 'w') as zf:
-            zf.writestr('data/', '')  # Directory entry
-            zf.writestr('data/file.csv', 'content')
-        
-        output_dir = tmpdir / 'output'
-        output_dir.mkdir()
-        
-        extracted_files = _extract_zip(zip_path, output_dir, '18100004')
-        
-        # Should only have the file, not the directory entry
-        assert len(extracted_files) == 1
-        assert (output_dir / 'data' / 'file.csv').exists()
-
-
-def test_parse_manifest_with_json():
+    # Create a test ZIP file with directory entries
+    zip_path = tmp_path / 'test.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        zf.writestr('data/', '')  # Directory entry
+        zf.writestr('data/file.csv', 'content')
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    extracted_files = _extract_zip(zip_path, output_dir, '18100004')
+    
+    # Should only have the file, not the directory entry
+    assert len(extracted_files) == 1
+    assert (output_dir / 'data' / 'file.csv').exists()
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_extract_zip_records_hashes_while_extracting(max_workers, tmp_path):
+    """Test that members are hashed during extraction for provenance metadata."""
+    from publicdata_ca.provenance import calculate_file_hash
+    
+    zip_path = tmp_path / 'test.zip'
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('18100004.csv', 'col1,col2\n' + 'val1,val2\n' * 1000)
+        zf.writestr('data/', '')
+        zf.writestr('data/notes.txt', 'notes')
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    file_hashes = {}
+    with patch('publicdata_ca.providers.statcan.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_pool:
+        extracted_files = _extract_zip(zip_path, output_dir, '18100004', file_hashes, max_workers=max_workers)
+    
+    assert mock_pool.called is (max_workers > 1)
+    assert extracted_files == [str(output_dir / '18100004.csv'), str(output_dir / 'data' / 'notes.txt')]
+    
+    assert sorted(file_hashes) == sorted(extracted_files)
+    for path in extracted_files:
+        assert file_hashes[path] == calculate_file_hash(path)
+    assert (output_dir / 'data' / 'notes.txt').read_text() == 'notes'
+
+
+def test_extract_zip_streams_plain_members_and_sanitizes_others(tmp_path):
+    """Test that plain members are streamed and unusual names go through zipfile."""
+    zip_path = tmp_path / 'test.zip'
+    with zipfile.ZipFile(zip_path, 'w') as zf:
+        zf.writestr('18100004.csv', 'a,b\n1,2\n')
+        zf.writestr('../escape.csv', 'x')
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    with patch.object(zipfile.ZipFile, 'extract', autospec=True, side_effect=zipfile.ZipFile.extract) as mock_extract:
+        _extract_zip(zip_path, output_dir, '18100004')
+    
+    assert mock_extract.call_count == 1
+    assert mock_extract.call_args[0][1].filename == '../escape.csv'
+    assert (output_dir / '18100004.csv').read_text() == 'a,b\n1,2\n'
+    assert (output_dir / 'escape.csv').exists()
+    assert not (tmp_path / 'escape.csv').exists()
+
+
+@pytest.mark.parametrize('corrupt', [False, True])
+def test_extract_zip_isal_inflate_path(monkeypatch, corrupt, tmp_path):
+    """Test the ISA-L Deflate path and its CRC-32 check against the central directory."""
+    from publicdata_ca.providers import statcan
+    
+    # zlib has the same API as isal_zlib, so it stands in for the optional package
+    monkeypatch.setattr(statcan, '_fast_zlib', zlib)
+    content = os.urandom(1024) + b'REF_DATE,VALUE\n' * 50000
+    
+    zip_path = tmp_path / 'test.zip'
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('18100004.csv', content)
+        zf.writestr('stored.txt', 'plain', compress_type=zipfile.ZIP_STORED)
+    
+    if corrupt:
+        # Flip the CRC-32 recorded for the first member in the central directory
+        data = bytearray(zip_path.read_bytes())
+        crc_offset = data.index(b'PK\x01\x02') + 16
+        data[crc_offset] ^= 0xFF
+        zip_path.write_bytes(bytes(data))
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    if corrupt:
+        with pytest.raises(zipfile.BadZipFile):
+            _extract_zip(zip_path, output_dir, '18100004', max_workers=1)
+    else:
+        file_hashes = {}
+        with patch.object(zipfile.ZipFile, 'open', autospec=True,
+                          side_effect=zipfile.ZipFile.open) as zip_open:
+            _extract_zip(zip_path, output_dir, '18100004', file_hashes, max_workers=1)
+        # The deflated member doesn't go through zipfile's own reader
+        opened = [c.args[1] for c in zip_open.call_args_list]
+        assert not any(getattr(m, 'filename', m) == '18100004.csv' for m in opened)
+        assert (output_dir / '18100004.csv').read_bytes() == content
+        assert (output_dir / 'stored.txt').read_text() == 'plain'
+        assert len(file_hashes) == 2
+
+
+def test_extract_zip_uses_zipfile_reader_without_isal(monkeypatch, tmp_path):
+    """Test that without ISA-L every member is read through ZipFile.open."""
+    from publicdata_ca.providers import statcan
+    
+    monkeypatch.setattr(statcan, '_fast_zlib', None)
+    zip_path = tmp_path / 'test.zip'
+    with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('18100004.csv', 'a,b\n1,2\n')
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    with patch.object(statcan, '_inflate_member') as inflate:
+        _extract_zip(zip_path, output_dir, '18100004', max_workers=1)
+    
+    inflate.assert_not_called()
+    assert (output_dir / '18100004.csv').read_text() == 'a,b\n1,2\n'
+
+
+@pytest.mark.skipif(not hasattr(os, 'posix_fallocate'), reason='posix_fallocate is unavailable')
+@pytest.mark.parametrize('compression', [zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2])
+def test_extract_zip_preallocates_large_members(monkeypatch, compression, tmp_path):
+    """Test that large members are preallocated and end at their real size."""
+    from publicdata_ca.providers import statcan
+    
+    monkeypatch.setattr(statcan, '_PREALLOCATE_MIN_SIZE', 1024)
+    
+    content = b'REF_DATE,VALUE\n' * 10000
+    zip_path = tmp_path / 'test.zip'
+    with zipfile.ZipFile(zip_path, 'w', compression=compression) as zf:
+        zf.writestr('18100004.csv', content)
+        zf.writestr('small.txt', 'x')
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    with patch.object(statcan.os, 'posix_fallocate', wraps=os.posix_fallocate) as fallocate:
+        _extract_zip(zip_path, output_dir, '18100004', max_workers=1)
+    
+    assert [c.args[2] for c in fallocate.call_args_list] == [len(content)]
+    assert (output_dir / '18100004.csv').read_bytes() == content
+
+
+@pytest.mark.parametrize('error, raised', [(errno.EINVAL, False), (errno.ENOSPC, True)])
+def test_preallocate_errors(monkeypatch, error, raised):
+    """Test that unsupported filesystems are ignored but a full disk is reported."""
+    from publicdata_ca.providers import statcan
+    
+    def failing(*args):
+        raise OSError(error, os.strerror(error))
+    
+    monkeypatch.setattr(statcan.os, 'posix_fallocate', failing, raising=False)
+    
+    with tempfile.TemporaryFile() as dest:
+        if raised:
+            with pytest.raises(OSError):
+                statcan._preallocate(dest, 64 << 20)
+        else:
+            assert statcan._preallocate(dest, 64 << 20) is False
+        assert statcan._preallocate(dest, 10) is False
+
+
+def _zip_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members:
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_extract_zip_keeps_existing_file_when_member_is_corrupt(tmp_path):
+    """Test that a member failing its CRC check doesn't replace the existing file."""
+    data = b'REF_DATE,VALUE\n' + b'2024-01,1\n' * 1000
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr('18100004.csv', data)
+    archive = bytearray(buffer.getvalue())
+    archive[archive.index(data) + 20] ^= 0xFF
+    zip_path = tmp_path / 'corrupt.zip'
+    zip_path.write_bytes(bytes(archive))
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    (output_dir / '18100004.csv').write_text('old,data\n')
+    
+    with pytest.raises(zipfile.BadZipFile):
+        _extract_zip(zip_path, output_dir, '18100004')
+    
+    assert (output_dir / '18100004.csv').read_text() == 'old,data\n'
+    assert sorted(os.listdir(output_dir)) == ['18100004.csv']
+
+
+def test_write_statcan_metadata_writes_every_sidecar_despite_failures(tmp_path):
+    """Test that sidecars are written concurrently and one failure doesn't stop the rest."""
+    from publicdata_ca.providers.statcan import _write_statcan_metadata
+    
+    paths = []
+    for i in range(5):
+        path = os.path.join(tmp_path, f'file{i}.csv')
+        Path(path).write_text(f'value\n{i}\n')
+        paths.append(path)
+    missing = os.path.join(tmp_path, 'missing.csv')
+    
+    with patch('publicdata_ca.providers.statcan.ThreadPoolExecutor', wraps=ThreadPoolExecutor) as mock_pool:
+        _write_statcan_metadata(paths + [missing], 'https://example.com/t.zip', '18100004', {'title': 'CPI'})
+    
+    mock_pool.assert_called_once()
+    for path in paths:
+        with open(path + '.meta.json') as f:
+            metadata = json.load(f)
+        assert metadata['provider']['specific']['title'] == 'CPI'
+    assert not os.path.exists(missing + '.meta.json')
+
+
+def test_parse_manifest_with_json(tmp_path):
     """Test parsing a JSON manifest file."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create a manifest JSON file
-        manifest_data = {
-            'title': 'Consumer Price Index',
-            'pid': '18100004',
-            'version': '1.0'
-        }
-        manifest_path = tmpdir / 'manifest.json'
-        with open(manifest_path, 'w') as f:
-            json.dump(manifest_data, f)
-        
-        result = _parse_manifest(tmpdir, '18100004')
-        
-        assert result is not None
-        assert result['title'] == 'Consumer Price Index'
-        assert result['pid'] == '18100004'
+    # Create a manifest JSON file
+    manifest_data = {
+        'title': 'Consumer Price Index',
+        'pid': '18100004',
+        'version': '1.0'
+    }
+    manifest_path = tmp_path / 'manifest.json'
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest_data, f)
+    
+    result = _parse_manifest(tmp_path, '18100004')
+    
+    assert result is not None
+    assert result['title'] == 'Consumer Price Index'
+    assert result['pid'] == '18100004'
 
 
-def test_parse_manifest_with_metadata_csv():
+def test_parse_manifest_with_metadata_csv(tmp_path):
     """Test parsing with metadata CSV file."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create a metadata CSV file
-        metadata_path = tmpdir / '18100004_MetaData.csv'
-        metadata_path.write_text('column\nvalue\n')
-        
-        result = _parse_manifest(tmpdir, '18100004')
-        
-        assert result is not None
-        assert 'metadata_file' in result
-        assert '18100004_MetaData.csv' in result['metadata_file']
-
-
-def test_parse_manifest_no_manifest():
+    # Create a metadata CSV file
+    metadata_path = tmp_path / '18100004_MetaData.csv'
+    metadata_path.write_text('column\nvalue\n')
+    
+    result = _parse_manifest(tmp_path, '18100004')
+    
+    assert result is not None
+    assert 'metadata_file' in result
+    assert '18100004_MetaData.csv' in result['metadata_file']
+
+
+def test_parse_manifest_no_manifest(tmp_path):
     """Test parsing when no manifest exists."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        result = _parse_manifest(tmpdir, '18100004')
-        
-        assert result is None
+    result = _parse_manifest(tmp_path, '18100004')
+    
+    assert result is None
 
 
-def test_parse_manifest_invalid_json():
+def test_parse_manifest_invalid_json(tmp_path):
     """Test parsing with invalid JSON manifest."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create an invalid JSON file
-        manifest_path = tmpdir / 'manifest.json'
-        manifest_path.write_text('{ invalid json')
-        
-        result = _parse_manifest(tmpdir, '18100004')
-        
-        # Should return None on invalid JSON
-        assert result is None
-
-
-def test_download_statcan_table_success(mock_wds_manifest):
+    # Create an invalid JSON file
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text('{ invalid json')
+    
+    result = _parse_manifest(tmp_path, '18100004')
+    
+    # Should return None on invalid JSON
+    assert result is None
+
+
+def test_download_statcan_table_success(mock_wds_manifest, mock_zip_bytes, tmp_path):
     """Test successful download and extraction of a StatsCan table."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create a mock ZIP file
-        test_zip_data = b'PK\x03\x04'  # ZIP file signature
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'data,values\n1,2\n')
-            zf.writestr('18100004_MetaData.csv', 'meta,data\na,b\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        # Mock the download_file function
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            # Write the test ZIP to the specified path
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            return path
-        
-        output_dir = tmpdir / 'output'
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
-        
-        # Verify result
-        assert result['provider'] == 'statcan'
-        assert result['pid'] == '18100004'
-        assert result['dataset_id'] == 'statcan_18100004'
-        assert result['skipped'] is False
-        assert len(result['files']) == 2
-        
-        # Verify files were extracted
-        assert (output_dir / '18100004.csv').exists()
-        assert (output_dir / '18100004_MetaData.csv').exists()
-        
-        # Verify ZIP was cleaned up
-        assert not (output_dir / '18100004_temp.zip').exists()
+    output_dir = tmp_path / 'output'
+    
+    # Mock the download_file function
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=_mock_download(mock_zip_bytes)):
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    # Verify result
+    assert result['provider'] == 'statcan'
+    assert result['pid'] == '18100004'
+    assert result['dataset_id'] == 'statcan_18100004'
+    assert result['skipped'] is False
+    assert len(result['files']) == 2
+    
+    # Verify files were extracted
+    assert (output_dir / '18100004.csv').exists()
+    assert (output_dir / '18100004_MetaData.csv').exists()
+    
+    # Verify ZIP was cleaned up
+    assert not (output_dir / '18100004_temp.zip').exists()
 
 
-def test_download_statcan_table_skip_existing(mock_wds_manifest):
+def test_download_statcan_table_stream_returns_csv_without_extracting(mock_wds_manifest, mock_zip_bytes, tmp_path):
+    """Test that stream=True returns the main CSV as a file object and writes nothing."""
+    mock_response = Mock()
+    mock_response.iter_content = Mock(return_value=[mock_zip_bytes[:10], mock_zip_bytes[10:]])
+    
+    output_dir = tmp_path / 'output'
+    
+    with patch('publicdata_ca.providers.statcan.retry_request', return_value=mock_response), \
+         patch('publicdata_ca.providers.statcan.download_file') as mock_download:
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False, stream=True)
+    
+    mock_download.assert_not_called()
+    mock_response.close.assert_called_once()
+    assert result['files'] == []
+    assert result['title'] == 'Consumer Price Index'
+    with result['stream'] as csv_stream:
+        assert csv_stream.read() == b'data,values\n1,2\n'
+    assert list(output_dir.iterdir()) == []
+
+
+def test_download_statcan_table_stream_reuses_revalidation_response(mock_wds_manifest, mock_zip_bytes, tmp_path):
+    """Test that a changed table is streamed from the conditional request itself."""
+    from publicdata_ca.http_cache import save_cache_metadata
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    existing_file = output_dir / '18100004.csv'
+    existing_file.write_text('old,data\n')
+    save_cache_metadata(
+        str(existing_file), etag='"v1"', url='https://proxy-appli.statscan.gc.ca/wds/csv/18100004-en.zip'
+    )
+    
+    mock_response = Mock(status_code=200)
+    mock_response.iter_content = Mock(return_value=[mock_zip_bytes])
+    
+    with patch('publicdata_ca.providers.statcan.retry_request', return_value=mock_response) as mock_request:
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False, stream=True)
+    
+    assert mock_request.call_count == 1
+    assert mock_request.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+    mock_response.close.assert_called_once()
+    with result['stream'] as csv_stream:
+        assert csv_stream.read() == b'data,values\n1,2\n'
+
+
+def test_download_statcan_table_skip_existing(mock_wds_manifest, tmp_path):
     """Test skip-if-exists logic."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        output_dir = tmpdir / 'output'
-        output_dir.mkdir()
-        
-        # Create an existing CSV file
-        existing_file = output_dir / '18100004.csv'
-        existing_file.write_text('existing,data\n1,2\n')
-        
-        # Should skip download
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    # Create an existing CSV file
+    existing_file = output_dir / '18100004.csv'
+    existing_file.write_text('existing,data\n1,2\n')
+    
+    # Should skip download
+    result = download_statcan_table('18100004', str(output_dir), skip_existing=True)
+    
+    assert result['skipped'] is True
+    assert result['pid'] == '18100004'
+    assert len(result['files']) == 1
+    
+    # File should still exist with original content
+    assert existing_file.exists()
+    content = existing_file.read_text()
+    assert content == 'existing,data\n1,2\n'
+
+
+def test_download_statcan_table_redownloads_truncated_file(mock_wds_manifest, mock_zip_bytes, tmp_path):
+    """Test that skip_existing re-downloads a CSV that no longer matches its sidecar."""
+    from publicdata_ca.provenance import write_provenance_metadata
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    existing_file = output_dir / '18100004.csv'
+    existing_file.write_text('data,values\n1,2\n')
+    write_provenance_metadata(str(existing_file), 'https://example.com/t.zip')
+    
+    # Intact copy is skipped without any network access
+    result = download_statcan_table('18100004', str(output_dir), skip_existing=True)
+    assert result['skipped'] is True
+    mock_wds_manifest.assert_not_called()
+    
+    # Truncated copy is fetched again
+    existing_file.write_text('data,val')
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=_mock_download(mock_zip_bytes)):
         result = download_statcan_table('18100004', str(output_dir), skip_existing=True)
-        
+    
+    assert result['skipped'] is False
+    assert existing_file.read_text() == 'data,values\n1,2\n'
+
+
+def test_download_statcan_table_skip_existing_hashes_touched_file_once(mock_wds_manifest, tmp_path):
+    """Test that a touched cached CSV is re-hashed once, not on every skip_existing call."""
+    from publicdata_ca import provenance
+    from publicdata_ca.provenance import write_provenance_metadata
+
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+
+    existing_file = output_dir / '18100004.csv'
+    existing_file.write_text('data,values\n1,2\n')
+    write_provenance_metadata(str(existing_file), 'https://example.com/t.zip')
+    os.utime(existing_file, ns=(10**18, 10**18))
+
+    with patch('publicdata_ca.provenance._hash_open_file', wraps=provenance._hash_open_file) as mock_hash:
+        for _ in range(3):
+            with provenance._hash_cache_lock:
+                provenance._hash_cache.clear()
+            result = download_statcan_table('18100004', str(output_dir), skip_existing=True)
+            assert result['skipped'] is True
+
+    assert mock_hash.call_count == 1
+    mock_wds_manifest.assert_not_called()
+
+
+@pytest.mark.parametrize('status', [304, 200])
+def test_download_statcan_table_revalidates_with_etag(mock_wds_manifest, mock_zip_bytes, status, tmp_path):
+    """Test that a refresh sends the stored ETag and keeps the table on 304."""
+    from publicdata_ca.http_cache import load_cache_metadata, save_cache_metadata
+    
+    output_dir = tmp_path / 'output'
+    
+    def mock_download(url, path, max_retries, write_metadata=True, headers=None):
+        Path(path).write_bytes(mock_zip_bytes)
+        # download_file records the response validators next to the ZIP
+        save_cache_metadata(path, etag='"v1"', url=url)
+        return path
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
+        download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    csv_file = output_dir / '18100004.csv'
+    assert load_cache_metadata(str(csv_file))['etag'] == '"v1"'
+    assert not (output_dir / '18100004_temp.zip.http_cache.json').exists()
+    
+    response = Mock(status_code=status, headers={'ETag': '"v2"'})
+    response.iter_content.return_value = [mock_zip_bytes]
+    with patch('publicdata_ca.providers.statcan.retry_request', return_value=response) as mock_request, \
+         patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download) as mock_dl:
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    assert mock_request.call_count == 1
+    assert mock_request.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+    response.close.assert_called_once()
+    # A changed table is saved from the revalidation response, not fetched twice
+    mock_dl.assert_not_called()
+    if status == 304:
         assert result['skipped'] is True
-        assert result['pid'] == '18100004'
-        assert len(result['files']) == 1
-        
-        # File should still exist with original content
-        assert existing_file.exists()
-        content = existing_file.read_text()
-        assert content == 'existing,data\n1,2\n'
+        assert result['not_modified'] is True
+        assert result['title'] == 'Consumer Price Index'
+        assert load_cache_metadata(str(csv_file))['etag'] == '"v1"'
+    else:
+        assert result['skipped'] is False
+        assert 'not_modified' not in result
+        assert str(csv_file) in result['files']
+        assert load_cache_metadata(str(csv_file))['etag'] == '"v2"'
+    
+    # use_cache=False always downloads without asking first
+    with patch('publicdata_ca.providers.statcan.retry_request') as mock_request, \
+         patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download) as mock_dl:
+        download_statcan_table('18100004', str(output_dir), skip_existing=False, use_cache=False)
+    mock_request.assert_not_called()
+    mock_dl.assert_called_once()
 
 
-def test_download_statcan_table_force_redownload(mock_wds_manifest):
+def test_download_statcan_table_force_redownload(mock_wds_manifest, tmp_path):
     """Test that skip_existing=False forces redownload."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        output_dir = tmpdir / 'output'
-        output_dir.mkdir()
-        
-        # Create an existing CSV file
-        existing_file = output_dir / '18100004.csv'
-        existing_file.write_text('old,data\n')
-        
-        # Create mock ZIP with new data
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'new,data\n3,4\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            return path
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
-        
-        # Should have downloaded
-        assert result['skipped'] is False
-        
-        # File should have new content
-        content = existing_file.read_text()
-        assert content == 'new,data\n3,4\n'
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    # Create an existing CSV file
+    existing_file = output_dir / '18100004.csv'
+    existing_file.write_text('old,data\n')
+    
+    # Create mock ZIP with new data
+    zip_content = _zip_bytes([('18100004.csv', 'new,data\n3,4\n')])
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=_mock_download(zip_content)):
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    # Should have downloaded
+    assert result['skipped'] is False
+    
+    # File should have new content
+    content = existing_file.read_text()
+    assert content == 'new,data\n3,4\n'
+
+
+@pytest.mark.parametrize('use_cache', [True, False])
+def test_download_statcan_table_forced_download_skips_integrity_check(mock_wds_manifest, mock_zip_bytes, use_cache, tmp_path):
+    """Test that a forced download doesn't hash a copy it will overwrite anyway."""
+    from publicdata_ca.provenance import write_provenance_metadata
+    
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    existing_file = output_dir / '18100004.csv'
+    existing_file.write_text('old,data\n')
+    # A sidecar but no recorded validators: nothing to revalidate against
+    write_provenance_metadata(str(existing_file), 'https://example.com/t.zip')
+    
+    with patch('publicdata_ca.providers.statcan._cached_table_is_intact') as mock_intact, \
+         patch('publicdata_ca.providers.statcan.download_file', side_effect=_mock_download(mock_zip_bytes)):
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False, use_cache=use_cache)
+    
+    mock_intact.assert_not_called()
+    assert result['skipped'] is False
 
 
-def test_download_statcan_table_with_hyphenated_id(mock_wds_manifest):
+def test_download_statcan_table_with_hyphenated_id(mock_wds_manifest, mock_zip_bytes, tmp_path):
     """Test download with hyphenated table ID."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create mock ZIP
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'data\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            # Verify URL uses normalized PID
-            assert '18100004' in url
-            return path
-        
-        output_dir = tmpdir / 'output'
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            result = download_statcan_table('18-10-0004', str(output_dir), skip_existing=False)
-        
-        # Should normalize to 18100004
-        assert result['pid'] == '18100004'
-
-
-def test_download_statcan_table_french_language(mock_wds_manifest):
+    def mock_download(url, path, max_retries, write_metadata=True, headers=None):
+        Path(path).write_bytes(mock_zip_bytes)
+        # Verify URL uses normalized PID
+        assert '18100004' in url
+        return path
+    
+    output_dir = tmp_path / 'output'
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
+        result = download_statcan_table('18-10-0004', str(output_dir), skip_existing=False)
+    
+    # Should normalize to 18100004
+    assert result['pid'] == '18100004'
+
+
+def test_download_statcan_table_french_language(mock_wds_manifest, tmp_path):
     """Test download with French language parameter."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create mock ZIP
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'données\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        french_payload = copy.deepcopy(mock_wds_manifest.payload_template)
-        french_payload['download_link'] = 'https://proxy-appli.statscan.gc.ca/wds/csv/18100004-fra.zip'
-        french_payload['object']['titleFr'] = 'Indice des prix'
-        mock_wds_manifest.set_payload(french_payload)
-        
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            # Verify the download link from the manifest is used
-            assert url == french_payload['download_link']
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            return path
-        
-        output_dir = tmpdir / 'output'
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            result = download_statcan_table('18100004', str(output_dir), language='fr', skip_existing=False)
-        
-        assert result['url'] == french_payload['download_link']
-        assert result['title'] == 'Indice des prix'
-        mock_wds_manifest.assert_called_with('18100004', 'fr', 3)
-
-
-def test_download_statcan_table_with_manifest(mock_wds_manifest):
+    # Create mock ZIP
+    zip_content = _zip_bytes([('18100004.csv', 'données\n')])
+    
+    french_payload = copy.deepcopy(mock_wds_manifest.payload_template)
+    french_payload['download_link'] = 'https://proxy-appli.statscan.gc.ca/wds/csv/18100004-fra.zip'
+    french_payload['object']['titleFr'] = 'Indice des prix'
+    mock_wds_manifest.set_payload(french_payload)
+    
+    def mock_download(url, path, max_retries, write_metadata=True, headers=None):
+        # Verify the download link from the manifest is used
+        assert url == french_payload['download_link']
+        Path(path).write_bytes(zip_content)
+        return path
+    
+    output_dir = tmp_path / 'output'
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
+        result = download_statcan_table('18100004', str(output_dir), language='fr', skip_existing=False)
+    
+    assert result['url'] == french_payload['download_link']
+    assert result['title'] == 'Indice des prix'
+    mock_wds_manifest.assert_called_with('18100004', 'fr', 3)
+
+
+def test_download_statcan_table_with_manifest(mock_wds_manifest, mock_zip_bytes, tmp_path):
     """Test download with manifest parsing."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create mock ZIP with manifest
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'data\n')
-            zf.writestr('18100004_MetaData.csv', 'metadata\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            return path
-        
-        output_dir = tmpdir / 'output'
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
-        
-        # Should have manifest data
-        assert 'manifest' in result
-        assert result['manifest'] is not None
-
-
-def test_download_statcan_table_with_string_manifest(mock_wds_manifest):
+    output_dir = tmp_path / 'output'
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=_mock_download(mock_zip_bytes)):
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    # Should have manifest data
+    assert 'manifest' in result
+    assert result['manifest'] is not None
+
+
+def test_download_statcan_table_with_string_manifest(mock_wds_manifest, mock_zip_bytes, tmp_path):
     """Test download when WDS manifest returns a direct link string."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'data\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        payload = copy.deepcopy(mock_wds_manifest.payload_template)
-        payload['object'] = 'https://www150.statcan.gc.ca/n1/tbl/csv/18100004-eng.zip'
-        payload['download_link'] = payload['object']
-        mock_wds_manifest.set_payload(payload)
-        
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            assert url == payload['object']
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            return path
-        
-        output_dir = tmpdir / 'output'
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
-        
-        assert result['url'] == payload['object']
-        assert (output_dir / '18100004.csv').exists()
-
-
-def test_download_statcan_table_cleanup_on_error(mock_wds_manifest):
+    payload = copy.deepcopy(mock_wds_manifest.payload_template)
+    payload['object'] = 'https://www150.statcan.gc.ca/n1/tbl/csv/18100004-eng.zip'
+    payload['download_link'] = payload['object']
+    mock_wds_manifest.set_payload(payload)
+    
+    def mock_download(url, path, max_retries, write_metadata=True, headers=None):
+        assert url == payload['object']
+        Path(path).write_bytes(mock_zip_bytes)
+        return path
+    
+    output_dir = tmp_path / 'output'
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
+        result = download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    assert result['url'] == payload['object']
+    assert (output_dir / '18100004.csv').exists()
+
+
+def test_download_statcan_table_cleanup_on_error(mock_wds_manifest, tmp_path):
     """Test that ZIP file is cleaned up on error."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        output_dir = tmpdir / 'output'
-        output_dir.mkdir()
-        
-        # Create an invalid ZIP file
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            with open(path, 'wb') as f:
-                f.write(b'not a zip file')
-            return path
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            with pytest.raises(RuntimeError):
-                download_statcan_table('18100004', str(output_dir), skip_existing=False)
-        
-        # Verify ZIP was cleaned up
-        assert not (output_dir / '18100004_temp.zip').exists()
-
-
-def test_download_statcan_table_respects_max_retries(mock_wds_manifest):
+    output_dir = tmp_path / 'output'
+    output_dir.mkdir()
+    
+    # Create an invalid ZIP file
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=_mock_download(b'not a zip file')):
+        with pytest.raises(RuntimeError):
+            download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    # Verify ZIP was cleaned up
+    assert not (output_dir / '18100004_temp.zip').exists()
+
+
+def test_download_statcan_table_respects_max_retries(mock_wds_manifest, mock_zip_bytes, tmp_path):
     """Test that max_retries parameter is passed to download_file."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create mock ZIP
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'data\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            assert max_retries == 5
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            return path
-        
-        output_dir = tmpdir / 'output'
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            download_statcan_table('18100004', str(output_dir), max_retries=5, skip_existing=False)
-
-
-def test_download_statcan_table_sets_correct_accept_header(mock_wds_manifest):
+    def mock_download(url, path, max_retries, write_metadata=True, headers=None):
+        assert max_retries == 5
+        Path(path).write_bytes(mock_zip_bytes)
+        return path
+    
+    output_dir = tmp_path / 'output'
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
+        download_statcan_table('18100004', str(output_dir), max_retries=5, skip_existing=False)
+
+
+def test_download_statcan_table_sets_correct_accept_header(mock_wds_manifest, mock_zip_bytes, tmp_path):
     """Test that download passes correct Accept header for ZIP files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir = Path(tmpdir)
-        
-        # Create mock ZIP
-        with zipfile.ZipFile(tmpdir / 'mock.zip', 'w') as zf:
-            zf.writestr('18100004.csv', 'data\n')
-        
-        with open(tmpdir / 'mock.zip', 'rb') as f:
-            zip_content = f.read()
-        
-        received_headers = {}
-        
-        def mock_download(url, path, max_retries, write_metadata=True, headers=None):
-            # Capture the headers that were passed
-            nonlocal received_headers
-            received_headers = headers
-            with open(path, 'wb') as f:
-                f.write(zip_content)
-            return path
-        
-        output_dir = tmpdir / 'output'
-        
-        with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
-            download_statcan_table('18100004', str(output_dir), skip_existing=False)
-        
-        # Verify that headers were passed without Accept header
-        # StatsCan API is sensitive to Accept headers and works best without one
-        assert received_headers is not None, "Headers should be passed to download_file"
-        assert 'Accept' not in received_headers, \
-            "Accept header should NOT be present to avoid HTTP 406 error with StatCan API"
-        assert 'User-Agent' in received_headers, "User-Agent header should be present"
+    received_headers = {}
+    
+    def mock_download(url, path, max_retries, write_metadata=True, headers=None):
+        # Capture the headers that were passed
+        nonlocal received_headers
+        received_headers = headers
+        Path(path).write_bytes(mock_zip_bytes)
+        return path
+    
+    output_dir = tmp_path / 'output'
+    
+    with patch('publicdata_ca.providers.statcan.download_file', side_effect=mock_download):
+        download_statcan_table('18100004', str(output_dir), skip_existing=False)
+    
+    # Verify that headers were passed without Accept header
+    # StatsCan API is sensitive to Accept headers and works best without one
+    assert received_headers is not None, "Headers should be passed to download_file"
+    assert 'Accept' not in received_headers, \
+        "Accept header should NOT be present to avoid HTTP 406 error with StatCan API"
+    assert 'User-Agent' in received_headers, "User-Agent header should be present"
+    assert 'gzip' in received_headers.get('Accept-Encoding', ''), \
+        "Compressed transfer encodings should be offered"
+
+
+def test_fetch_many_runs_concurrently_and_preserves_order(tmp_path):
+    """Test that fetch_many fetches tables in parallel, keeps ref order and extracts serially."""
+    import threading
+    from publicdata_ca.provider import DatasetRef
+    from publicdata_ca.providers.statcan import StatCanProvider
+    
+    barrier = threading.Barrier(3, timeout=5)
+    
+    def fake_download(table_id, output_dir, **kwargs):
+        # Every worker must be running at once for the barrier to release
+        barrier.wait()
+        return {
+            'dataset_id': f'statcan_{table_id}',
+            'skip_existing': kwargs['skip_existing'],
+            'extract_workers': kwargs['extract_workers'],
+        }
+    
+    refs = [DatasetRef(provider='statcan', id=pid) for pid in ('18100004', '14100287', '36100434')]
+    
+    with patch('publicdata_ca.providers.statcan.download_statcan_table', side_effect=fake_download):
+        results = StatCanProvider().fetch_many(refs, str(tmp_path), max_workers=3, skip_existing=False)
+    
+    assert [r['dataset_id'] for r in results] == [
+        'statcan_18100004', 'statcan_14100287', 'statcan_36100434'
+    ]
+    assert all(r['skip_existing'] is False for r in results)
+    assert all(r['extract_workers'] == 1 for r in results)
+    assert StatCanProvider().fetch_many([], str(tmp_path)) == []
+
+
+def test_parse_manifest_reads_cube_title_and_dimensions(tmp_path):
+    """Test that the metadata CSV header block is parsed and cached by mtime."""
+    from publicdata_ca.providers.statcan import _read_metadata_csv
+    
+    metadata_path = tmp_path / '18100004_MetaData.csv'
+    metadata_path.write_text(
+        '﻿"Cube Title","Product Id","Frequency"\n'
+        '"Consumer Price Index, monthly, not seasonally adjusted","18100004","Monthly"\n'
+        '\n'
+        '"Dimension ID","Dimension name","Dimension Notes"\n'
+        '"1","Geography",""\n'
+        '"2","Products and product groups",""\n'
+        '\n'
+        '"Dimension ID","Member Name","Classification Code"\n'
+        '"1","Canada","[11124]"\n',
+        encoding='utf-8'
+    )
+    _read_metadata_csv.cache_clear()
+    
+    result = _parse_manifest(tmp_path, '18100004')
+    
+    assert result['title'] == 'Consumer Price Index, monthly, not seasonally adjusted'
+    assert result['cube']['Frequency'] == 'Monthly'
+    assert result['dimensions'] == [
+        {'id': '1', 'name': 'Geography'},
+        {'id': '2', 'name': 'Products and product groups'},
+    ]
+    
+    # Mutating a result must not leak into the cache
+    result['title'] = 'changed'
+    result['dimensions'].clear()
+    again = _parse_manifest(tmp_path, '18100004')
+    assert again['title'] == 'Consumer Price Index, monthly, not seasonally adjusted'
+    assert len(again['dimensions']) == 2
+    assert _read_metadata_csv.cache_info().hits == 1
+    
+    # A rewritten file has a new mtime and is parsed again
+    metadata_path.write_text('"Cube Title"\n"New title"\n', encoding='utf-8')
+    os.utime(metadata_path, ns=(0, metadata_path.stat().st_mtime_ns + 10**9))
+    assert _parse_manifest(tmp_path, '18100004')['title'] == 'New title'